@@ -0,0 +1,265 @@
+'''
+primes.py
+Prime engine behind task3.first_n_primes: a segmented Sieve of Eratosthenes
+over odd numbers whose results are cached and extended across calls.
+
+Batch primality queries go through is_prime_array, which uses NumPy when it
+is installed and falls back to pure Python otherwise.
+'''
+
+import math
+import threading
+from bisect import bisect_left
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python backend is used instead
+    np = None
+
+
+# Numbers covered by each sieve segment; even, so segments stay aligned to odd numbers
+SEGMENT_SPAN = 1 << 19
+
+# Values below this are answered from a boolean sieve table, larger ones by Miller-Rabin
+SIEVE_LIMIT = 1 << 24
+
+# Small primes tried before Miller-Rabin; also its bases above 64 bits, exact for n < 3.18 * 10**23
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# Miller-Rabin bases that make the test exact for every 64-bit n (Sinclair)
+MILLER_RABIN_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+# Every prime below _limit, in order. Both only ever grow.
+_primes = [2, 3, 5, 7]
+_limit = 8
+_lock = threading.RLock()
+
+
+"""
+nth_prime_upper_bound(n)
+Returns a number no smaller than the nth prime (n >= 1), using
+p_n < n(ln n + ln ln n) for n >= 6 (Rosser's theorem).
+"""
+def nth_prime_upper_bound(n):
+
+    if n < 6:
+        return 13
+    log_n = math.log(n)
+    return int(n * (log_n + math.log(log_n))) + 1
+
+
+"""
+_sieve_segment(lo, hi, base)
+Returns the primes in [lo, hi) for even lo and hi, crossing off odd
+multiples of the odd primes in base. base must hold every prime up to
+sqrt(hi). Index i of the segment stands for the odd number lo + 1 + 2i.
+"""
+def _sieve_segment(lo, hi, base):
+
+    size = (hi - lo) // 2
+    segment = bytearray(b"\x01") * size
+    for p in base:
+        square = p * p
+        if square >= hi:
+            break
+        if p == 2:
+            continue
+        start = max(square, (lo + 1 + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        index = (start - lo - 1) // 2
+        if index < size:
+            segment[index::p] = bytes((size - 1 - index) // p + 1)
+    return list(compress(range(lo + 1, hi, 2), segment))
+
+
+"""
+_extend(limit)
+Sieves every number below limit into the cache, one segment at a time.
+"""
+def _extend(limit):
+    global _limit
+
+    with _lock:
+        if limit <= _limit:
+            return
+        root = math.isqrt(limit)
+        if root >= _limit:
+            # Sieving up to limit needs every prime up to its square root first
+            _extend(root + 1)
+        limit += limit % 2
+        while _limit < limit:
+            hi = min(_limit + SEGMENT_SPAN, limit)
+            _primes.extend(_sieve_segment(_limit, hi, _primes))
+            _limit = hi
+
+
+"""
+primes_below(limit)
+Returns a list of every prime smaller than limit.
+"""
+def primes_below(limit):
+
+    _extend(limit)
+    return _primes[:bisect_left(_primes, limit)]
+
+
+"""
+first_n_primes(n)
+Returns a list of the first n prime numbers, sieving only as far as the
+upper bound on the nth prime.
+"""
+def first_n_primes(n):
+
+    if n <= 0:
+        return []
+    if n > len(_primes):
+        _extend(nth_prime_upper_bound(n) + 1)
+    return _primes[:n]
+
+
+"""
+iter_primes()
+Yields the primes in order without end, sieving a segment at a time as the
+cache runs out.
+"""
+def iter_primes():
+
+    i = 0
+    while True:
+        known = len(_primes)
+        while i < known:
+            yield _primes[i]
+            i += 1
+        _extend(_limit + SEGMENT_SPAN)
+
+
+"""
+is_prime(n)
+Returns True if n is prime. Numbers already sieved are looked up in the
+cache; larger ones get deterministic Miller-Rabin (exact below 3.18 * 10**23).
+"""
+def is_prime(n):
+
+    if n < 2:
+        return False
+    if n < _limit:
+        i = bisect_left(_primes, n)
+        return i < len(_primes) and _primes[i] == n
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    shift = 0
+    while d % 2 == 0:
+        d //= 2
+        shift += 1
+    for base in MILLER_RABIN_BASES_64 if n < 1 << 64 else SMALL_PRIMES:
+        base %= n
+        if base == 0:
+            continue
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(shift - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+_tables = {}
+
+
+"""
+sieve_table(limit, backend=None)
+Returns a table t where t[i] is true exactly when i is prime, for 0 <= i < limit:
+a NumPy bool array for the "numpy" backend, a bytearray for "python". The
+largest table built so far is kept and sliced for smaller limits.
+"""
+def sieve_table(limit, backend=None):
+
+    backend = _backend(backend)
+    table = _tables.get(backend)
+    if table is None or len(table) < limit:
+        size = max(limit, 2)
+        if backend == "numpy":
+            table = np.ones(size, dtype=bool)
+            table[4::2] = False
+            for i in range(3, math.isqrt(size - 1) + 1, 2):
+                if table[i]:
+                    table[i * i::2 * i] = False
+        else:
+            table = bytearray(b"\x01") * size
+            table[4::2] = bytes(len(range(4, size, 2)))
+            for i in range(3, math.isqrt(size - 1) + 1, 2):
+                if table[i]:
+                    table[i * i::2 * i] = bytes(len(range(i * i, size, 2 * i)))
+        table[:2] = b"\x00\x00" if backend == "python" else False
+        _tables[backend] = table
+    return table[:limit]
+
+
+"""
+is_prime_array(values, backend=None)
+Returns which of values are prime. With NumPy (the default when it is
+installed) values is any integer array-like and the result a bool array of
+the same shape; the "python" backend returns a list of bools.
+Values below SIEVE_LIMIT are looked up in a sieve table. Larger ones are
+checked with Miller-Rabin after a vectorized pass drops multiples of
+SMALL_PRIMES, which rules out about 85% of them.
+"""
+def is_prime_array(values, backend=None):
+
+    if _backend(backend) == "python":
+        values = [int(v) for v in values]
+        top = max(values, default=0)
+        table = sieve_table(min(top + 1, SIEVE_LIMIT), "python")
+        size = len(table)
+        return [bool(table[v]) if 0 <= v < size else is_prime(v) for v in values]
+
+    values = np.asarray(values)
+    if values.dtype.kind not in "iu":
+        if values.dtype != object:
+            raise TypeError(f"is_prime_array needs integer values, not {values.dtype}")
+        # Python ints beyond 64 bits
+        flags = np.fromiter((is_prime(int(v)) for v in values.ravel()), dtype=bool, count=values.size)
+        return flags.reshape(values.shape)
+
+    result = np.zeros(values.shape, dtype=bool)
+    if values.size == 0:
+        return result
+    table = sieve_table(min(int(values.max()) + 1, SIEVE_LIMIT), "numpy")
+    small = (values >= 0) & (values < len(table))
+    result[small] = table[values[small]]
+
+    large = values >= len(table)
+    if large.any():
+        candidates = values[large]
+        survivors = np.ones(candidates.shape, dtype=bool)
+        for p in SMALL_PRIMES:
+            survivors &= candidates % candidates.dtype.type(p) != 0
+        checked = np.zeros(candidates.shape, dtype=bool)
+        checked[survivors] = np.fromiter(
+            (is_prime(int(v)) for v in candidates[survivors]), dtype=bool, count=int(survivors.sum())
+        )
+        result[large] = checked
+    return result
+
+
+"""
+_backend(backend)
+Resolves a backend name: None picks "numpy" when NumPy is installed, else "python".
+"""
+def _backend(backend):
+
+    if backend is None:
+        return "python" if np is None else "numpy"
+    if backend not in ("numpy", "python"):
+        raise ValueError(f"Unknown backend {backend!r}; use 'numpy' or 'python'")
+    if backend == "numpy" and np is None:
+        raise ImportError("The numpy backend needs NumPy installed")
+    return backend
@@ -0,0 +1,67 @@
+'''
+primes_benchmark.py
+Times is_prime_array on the NumPy and pure Python backends over the same
+random integers and checks that they agree.
+
+Run from homework1/:
+    python -m src.primes_benchmark --count 10000000 --max 10000000
+'''
+
+import argparse
+import random
+import time
+
+from src import primes
+
+
+"""
+time_backend(backend, values, repeat)
+Returns (best seconds over repeat runs, result as a list of bools).
+"""
+def time_backend(backend, values, repeat):
+
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = primes.is_prime_array(values, backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, list(result)
+
+
+"""
+main(argv=None)
+Parses the command line, runs every available backend and prints one line
+per backend with its time and throughput.
+"""
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1_000_000, help="How many integers to test")
+    parser.add_argument("--max", type=int, default=10_000_000, help="Integers are drawn from [0, max)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(argv)
+
+    rng = random.Random(options.seed)
+    values = [rng.randrange(options.max) for _ in range(options.count)]
+    backends = ["python"] if primes.np is None else ["numpy", "python"]
+    if primes.np is None:
+        print("NumPy is not installed; timing the pure Python backend only")
+
+    results = {}
+    for backend in backends:
+        data = values if backend == "python" else primes.np.array(values, dtype=primes.np.uint64)
+        # Build the sieve table outside the timed runs
+        primes.sieve_table(min(options.max, primes.SIEVE_LIMIT), backend)
+        seconds, results[backend] = time_backend(backend, data, options.repeat)
+        print(f"{backend:>6}: {seconds:.3f}s  {options.count / seconds:,.0f} values/s  "
+              f"{sum(results[backend]):,} prime")
+
+    if len(results) > 1 and results["numpy"] != results["python"]:
+        raise SystemExit("Backends disagree")
+
+
+if __name__ == "__main__":
+    main()
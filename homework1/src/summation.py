@@ -0,0 +1,112 @@
+'''
+summation.py
+Closed-form sums behind task3.sum_1_to_n: arithmetic series over any range,
+sums of powers (Faulhaber's formula) and a vectorized version for arrays of
+bounds. Every sum is O(1) in the length of the range.
+'''
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb, lcm
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; sum_range_array falls back to lists
+    np = None
+
+
+"""
+sum_1_to_n(n)
+Returns the sum of all integers from 1 to n inclusive (0 when n < 1).
+"""
+def sum_1_to_n(n):
+
+    if n < 1:
+        return 0
+    return n * (n + 1) // 2
+
+
+"""
+sum_range(start, stop, step=1)
+Returns sum(range(start, stop, step)) without iterating. Like range, a step
+of 0 raises ValueError.
+"""
+def sum_range(start, stop, step=1):
+
+    count = len(range(start, stop, step))
+    # first + last is even whenever count is odd, so halving stays exact
+    return count * (2 * start + (count - 1) * step) // 2
+
+
+# B_0, B_1, ... computed so far, with B_1 = +1/2
+_bernoulli_numbers = [Fraction(1)]
+
+
+"""
+_bernoulli(m)
+Returns the Bernoulli number B_m with B_1 = +1/2, as a Fraction.
+"""
+def _bernoulli(m):
+
+    while len(_bernoulli_numbers) <= m:
+        k = len(_bernoulli_numbers)
+        # From sum_{j=0}^{k} C(k+1, j) B_j = k + 1 with the B_1 = +1/2 convention
+        total = sum(comb(k + 1, j) * b for j, b in enumerate(_bernoulli_numbers))
+        _bernoulli_numbers.append(1 - total / (k + 1))
+    return _bernoulli_numbers[m]
+
+
+"""
+_faulhaber_coefficients(p)
+Returns (denominator, coefficients) with sum_{k=1}^{n} k**p equal to
+sum(c * n**(p + 1 - j) for j, c in enumerate(coefficients)) // denominator.
+"""
+@lru_cache(maxsize=None)
+def _faulhaber_coefficients(p):
+
+    terms = [comb(p + 1, j) * _bernoulli(j) / (p + 1) for j in range(p + 1)]
+    denominator = lcm(*(term.denominator for term in terms))
+    return denominator, tuple(int(term * denominator) for term in terms)
+
+
+"""
+sum_of_powers(n, p)
+Returns 1**p + 2**p + ... + n**p (0 when n < 1) for a whole number p, by
+Faulhaber's formula. Coefficients are computed once per p.
+"""
+def sum_of_powers(n, p):
+
+    if p < 0:
+        raise ValueError("p must be a whole number")
+    if n < 1:
+        return 0
+    denominator, coefficients = _faulhaber_coefficients(p)
+    total = 0
+    for c in coefficients:
+        # Horner's rule over n**(p+1), ..., n**1
+        total = (total + c) * n
+    return total // denominator
+
+
+"""
+sum_range_array(starts, stops, steps=1)
+Returns sum_range(start, stop, step) for each position of the broadcast
+arrays. With NumPy installed the result is an int64 array, so each sum
+(not just the bounds) must fit in 64 bits; without it, lists of ints.
+"""
+def sum_range_array(starts, stops, steps=1):
+
+    if np is None:
+        if not isinstance(steps, (list, tuple)):
+            steps = [steps] * len(starts)
+        return [sum_range(start, stop, step) for start, stop, step in zip(starts, stops, steps)]
+
+    starts, stops, steps = np.broadcast_arrays(
+        np.asarray(starts, dtype=np.int64), np.asarray(stops, dtype=np.int64), np.asarray(steps, dtype=np.int64)
+    )
+    if (steps == 0).any():
+        raise ValueError("sum_range_array() arg 3 must not be zero")
+    # len(range(start, stop, step)), rounding the span up towards the step
+    counts = np.maximum((stops - starts + steps - np.sign(steps)) // steps, 0)
+    ends = 2 * starts + (counts - 1) * steps
+    return np.where(counts % 2 == 0, counts // 2 * ends, counts * (ends // 2))
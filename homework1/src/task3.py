@@ -5,6 +5,8 @@ research how to calculate prime numbers). Create a while loop to find the sum of
 1 to 100. 
 ''' 
 
+from src import primes, summation
+
 
 """
 check_sign(n)
@@ -26,37 +28,18 @@ def check_sign(n):
 """
 first_n_primes(n)
 Returns a list of the first n prime numbers.
+The primes come from the cached segmented sieve in primes.py.
 """
 def first_n_primes(n):
 
-    primes = []
-    candidate = 2
-
-    while len(primes) < n:
-        is_prime = True
-
-        for p in primes:
-            if candidate % p == 0:
-                is_prime = False
-
-        if is_prime:
-            primes.append(candidate)
-
-        candidate += 1
-    return primes
+    return primes.first_n_primes(n)
 
 
 """
 sum_1_to_n(n)
 Returns the sum of all integers from 1 to n inclusive.
+Uses the closed form n(n + 1)/2 from summation.py.
 """
 def sum_1_to_n(n):
-    total = 0
-    i = 1
-
-    while i <= n:
-        total += i
-        i += 1
-
-    return total
 
+    return summation.sum_1_to_n(n)
@@ -3,15 +3,210 @@ task6.py
 Reads a text file and counts the number of words in it. 
 '''
 
+import argparse
+import codecs
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+# Bytes read from the file at a time; memory use is bounded by this, not the file size
+CHUNK_SIZE = 1 << 20
+
+# Files larger than this are split into byte ranges of about this size for parallel counting
+PARTITION_BYTES = 64 << 20
+
+
+"""
+count_words_in_file(filename, chunk_size=CHUNK_SIZE)
+Reads a UTF-8 file and returns the number of words it contains, the same
+count as len(text.split()) on the whole text. The file is streamed in
+chunk_size pieces, so even very large files use little memory.
+"""
+def count_words_in_file(filename, chunk_size=CHUNK_SIZE):
+
+    with open(filename, "rb") as f:
+        return count_words_in_chunks(iter(partial(f.read, chunk_size), b""))
+
+
+"""
+count_words_in_chunks(chunks)
+Returns the number of whitespace-delimited words in an iterable of UTF-8
+byte strings, as if they were joined and decoded first. Characters split
+across chunks are reassembled by an incremental decoder, and a word split
+across chunks is counted once. Invalid UTF-8 raises UnicodeDecodeError.
+"""
+def count_words_in_chunks(chunks):
+
+    count, _, _ = _scan_chunks(chunks)
+    return count
+
+
+"""
+_scan_chunks(chunks)
+Counts the words in chunks like count_words_in_chunks. Returns
+(count, starts_in_word, ends_in_word), where the flags say whether the
+text starts and ends with a non-whitespace character, so that counts of
+adjacent pieces of one file can be joined.
+"""
+def _scan_chunks(chunks):
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    count = 0
+    in_word = False
+    starts_in_word = None
+
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text and starts_in_word is None:
+            starts_in_word = not text[0].isspace()
+        count, in_word = _count_text(text, count, in_word)
+
+    text = decoder.decode(b"", final=True)
+    if text and starts_in_word is None:
+        starts_in_word = not text[0].isspace()
+    count, in_word = _count_text(text, count, in_word)
+    return count, bool(starts_in_word), in_word
+
+
+"""
+_count_text(text, count, in_word)
+Adds the words in text to count. in_word says whether the text before it
+ended part-way through a word, in which case a word at the start of text
+continues that one. Returns (count, whether text ends inside a word).
+"""
+def _count_text(text, count, in_word):
+
+    if not text:
+        return count, in_word
+
+    count += len(text.split())
+    if in_word and not text[0].isspace():
+        count -= 1
+
+    return count, not text[-1].isspace()
+
 
 """
-count_words_in_file(filename)
-Reads a file and returns the number of words it contains.
+count_words_in_files(filenames, workers=None, partition_bytes=PARTITION_BYTES)
+Counts the words in many files at once over a ProcessPoolExecutor with
+workers processes (default: one per CPU; 1 counts in this process).
+Each file is one task, except files larger than partition_bytes, which
+are split into byte ranges of about that size so one huge file also
+spreads over every worker.
+Returns (counts, total): counts maps each filename to its word count, in
+the order given.
 """
-def count_words_in_file(filename):
+def count_words_in_files(filenames, workers=None, partition_bytes=PARTITION_BYTES):
+
+    counts = dict.fromkeys(filenames, 0)
+    tasks = [(name, start, end) for name in counts for start, end in _partition(name, partition_bytes)]
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_count_range, tasks)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            # Hand small files out in batches so per-task overhead doesn't dominate
+            batch = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(pool.map(_count_range, tasks, chunksize=batch))
+
+    # A word running across the boundary of two ranges was counted by both
+    ends_in_word = {}
+    for (name, _, _), (count, starts, ends) in zip(tasks, results):
+        counts[name] += count - (1 if starts and ends_in_word.get(name) else 0)
+        ends_in_word[name] = ends
+
+    return counts, sum(counts.values())
+
+
+"""
+count_words_in_file_parallel(filename, workers=None)
+Counts the words in one large file by splitting it into one byte range per
+worker. Returns the same count as count_words_in_file.
+"""
+def count_words_in_file_parallel(filename, workers=None):
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(filename)
+    partition_bytes = max(-(-size // workers), CHUNK_SIZE)
+    _, total = count_words_in_files([filename], workers, partition_bytes)
+    return total
+
+
+"""
+_partition(filename, partition_bytes)
+Splits a file into (start, end) byte ranges of about partition_bytes each.
+Every range starts on the first byte of a UTF-8 character, so each one
+decodes on its own. An empty file has no ranges.
+"""
+def _partition(filename, partition_bytes):
+
+    size = os.path.getsize(filename)
+    parts = max(1, -(-size // partition_bytes))
+    if parts == 1:
+        return [(0, size)] if size else []
+
+    bounds = [0]
+    with open(filename, "rb") as f:
+        for i in range(1, parts):
+            offset = i * size // parts
+            f.seek(offset)
+            # Step past UTF-8 continuation bytes (10xxxxxx) to the next character
+            for byte in f.read(3):
+                if byte & 0xC0 != 0x80:
+                    break
+                offset += 1
+            if offset > bounds[-1]:
+                bounds.append(offset)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+"""
+_count_range(task)
+Worker for count_words_in_files: scans bytes start..end of a file given as
+(filename, start, end). Returns the _scan_chunks result for that range.
+"""
+def _count_range(task):
+
+    filename, start, end = task
+    with open(filename, "rb") as f:
+        f.seek(start)
+
+        def chunks():
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        return _scan_chunks(chunks())
+
+
+"""
+main(argv=None)
+Command line entry point: prints each file's word count and the total.
+    python -m src.task6 FILE [FILE ...] [--workers N] [--partition-mb MB]
+"""
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Count the words in text files in parallel.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--partition-mb", type=int, default=PARTITION_BYTES >> 20,
+                        help="Split files larger than this many MiB into byte ranges")
+    options = parser.parse_args(argv)
+    if options.partition_mb < 1:
+        parser.error("--partition-mb must be at least 1")
+
+    counts, total = count_words_in_files(options.files, options.workers, options.partition_mb << 20)
+    for name, count in counts.items():
+        print(f"{count:>12,}  {name}")
+    if len(counts) > 1:
+        print(f"{total:>12,}  total")
 
-    with open(filename, "r", encoding="utf-8") as f:
-        text = f.read()
 
-    words = text.split()
-    return len(words)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+'''
+task6_benchmark.py
+Measures how parallel word counting scales with worker processes, on one
+large generated file (byte-range partitions) and on many small ones (one
+task per file).
+
+Run from homework1/:
+    python -m src.task6_benchmark --mb 512 --files 2000
+'''
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src import task6
+
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "café", "naïve", "漢字", "テキスト", "😀"]
+SEPARATORS = [" ", " ", " ", "\n", "\t", " ", "　"]
+
+
+"""
+write_text(path, size, rng)
+Writes about size bytes of random words and whitespace to path.
+"""
+def write_text(path, size, rng):
+
+    line = "".join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(2000)).encode("utf-8")
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            f.write(line)
+            written += len(line)
+
+
+"""
+time_counts(filenames, workers, partition_bytes)
+Returns (seconds, total words) for one count_words_in_files run.
+"""
+def time_counts(filenames, workers, partition_bytes):
+
+    start = time.perf_counter()
+    _, total = task6.count_words_in_files(filenames, workers, partition_bytes)
+    return time.perf_counter() - start, total
+
+
+"""
+main(argv=None)
+Generates the data, then prints time and speedup over one worker for each
+worker count, for the large file and for the small files.
+"""
+def main(argv=None):
+
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=256, help="Size of the large file in MiB")
+    parser.add_argument("--files", type=int, default=1000, help="Number of small files")
+    parser.add_argument("--file-kb", type=int, default=64, help="Size of each small file in KiB")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, *(2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus), cpus}))
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(argv)
+
+    rng = random.Random(options.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        large = os.path.join(directory, "large.txt")
+        write_text(large, options.mb << 20, rng)
+        small = [os.path.join(directory, f"small{i:05d}.txt") for i in range(options.files)]
+        for name in small:
+            write_text(name, options.file_kb << 10, rng)
+
+        print(f"{cpus} CPU(s)")
+        for label, filenames in ((f"1 x {options.mb} MiB file", [large]),
+                                 (f"{options.files} x {options.file_kb} KiB files", small)):
+            print(label)
+            baseline = expected = None
+            for workers in options.workers:
+                # One range per worker for the large file; the small ones stay whole
+                size = sum(os.path.getsize(name) for name in filenames)
+                partition_bytes = max(-(-size // workers), task6.CHUNK_SIZE) if len(filenames) == 1 else task6.PARTITION_BYTES
+                seconds, total = time_counts(filenames, workers, partition_bytes)
+                baseline = baseline or seconds
+                expected = expected if expected is not None else total
+                if total != expected:
+                    raise SystemExit(f"{workers} workers counted {total:,} words, expected {expected:,}")
+                print(f"  {workers:>3} worker(s): {seconds:7.3f}s  {baseline / seconds:5.2f}x  {total:,} words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+'''
+Pytest test cases for the segmented sieve prime engine.
+'''
+
+from itertools import islice
+
+import pytest
+from src import primes
+
+
+'''
+_reference_primes(n)
+Purpose: First n primes from a plain, unsegmented sieve, for comparison.
+'''
+def _reference_primes(n):
+    limit = 16
+    while True:
+        is_prime = [True] * limit
+        is_prime[0] = is_prime[1] = False
+        for i in range(2, int(limit ** 0.5) + 1):
+            if is_prime[i]:
+                for multiple in range(i * i, limit, i):
+                    is_prime[multiple] = False
+        found = [i for i in range(limit) if is_prime[i]]
+        if len(found) >= n:
+            return found[:n]
+        limit *= 2
+
+
+'''
+test_first_n_primes_matches_reference_primes(n)
+Purpose: Ensure the sieve returns exactly the primes a plain sieve finds,
+including counts that span several segments.
+'''
+@pytest.mark.parametrize("n", [0, 1, 2, 5, 100, 5000, 60000])
+def test_first_n_primes_matches_reference_primes(n):
+    assert primes.first_n_primes(n) == _reference_primes(n)
+
+
+'''
+test_first_n_primes_large()
+Purpose: Check known values deep into the sieve: the millionth prime.
+'''
+def test_first_n_primes_large():
+    result = primes.first_n_primes(10**6)
+
+    assert len(result) == 10**6
+    assert result[-1] == 15485863
+
+
+'''
+test_nth_prime_upper_bound()
+Purpose: Ensure the estimate never falls below the nth prime.
+'''
+def test_nth_prime_upper_bound():
+    for n, nth in enumerate(_reference_primes(3000), start=1):
+        assert primes.nth_prime_upper_bound(n) >= nth
+
+
+'''
+test_primes_below()
+Purpose: Ensure primes_below stops strictly below its limit.
+'''
+def test_primes_below():
+    assert primes.primes_below(2) == []
+    assert primes.primes_below(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert primes.primes_below(29)[-1] == 23
+
+
+'''
+test_iter_primes_streams_past_the_cache()
+Purpose: Ensure the generator keeps going past what has been sieved so far.
+'''
+def test_iter_primes_streams_past_the_cache():
+    wanted = len(primes._primes) + 1000
+
+    assert list(islice(primes.iter_primes(), wanted)) == primes.first_n_primes(wanted)
+
+
+'''
+test_is_prime_large_values()
+Purpose: Ensure Miller-Rabin handles primes and strong pseudoprimes beyond the sieve.
+'''
+@pytest.mark.parametrize("n, expected", [
+    (2**61 - 1, True),
+    (2**64 - 59, True),
+    (2**64 - 1, False),
+    (3215031751, False),           # strong pseudoprime to bases 2, 3, 5, 7
+    (3825123056546413051, False),  # strong pseudoprime to every prime base up to 23
+    ((2**31 - 1) ** 2, False),
+])
+def test_is_prime_large_values(n, expected):
+    assert primes.is_prime(n) is expected
+
+
+'''
+test_is_prime_array_python_backend()
+Purpose: Ensure the pure Python backend agrees with the sieve on small values,
+including negatives, and with is_prime on large ones.
+'''
+def test_is_prime_array_python_backend():
+    values = list(range(-3, 2000)) + [2**61 - 1, 2**61 + 1]
+    known = set(primes.primes_below(2000)) | {2**61 - 1}
+
+    assert primes.is_prime_array(values, backend="python") == [v in known for v in values]
+
+
+'''
+test_is_prime_array_numpy_backend()
+Purpose: Ensure the NumPy backend returns a bool array of the input's shape
+that matches the pure Python backend, for signed and unsigned 64-bit input.
+'''
+def test_is_prime_array_numpy_backend():
+    np = pytest.importorskip("numpy")
+    values = np.array([[0, 1, 2, 97, 100], [2**61 - 1, 2**63 + 29, 3215031751, 7919, 7917]], dtype=np.uint64)
+
+    result = primes.is_prime_array(values, backend="numpy")
+
+    assert result.dtype == bool and result.shape == values.shape
+    assert result.tolist() == [[False, False, True, True, False], [True, True, False, True, False]]
+    signed = np.arange(-10, 5000, dtype=np.int64)
+    assert primes.is_prime_array(signed).tolist() == primes.is_prime_array(signed.tolist(), backend="python")
+
+
+'''
+test_is_prime_array_unknown_backend()
+Purpose: Ensure a misspelt backend is rejected rather than silently ignored.
+'''
+def test_is_prime_array_unknown_backend():
+    with pytest.raises(ValueError):
+        primes.is_prime_array([2, 3], backend="gpu")
@@ -0,0 +1,91 @@
+'''
+Pytest property tests for the closed-form sums, checked against plain loops.
+'''
+
+import random
+
+import pytest
+from src import summation
+
+
+'''
+_loop_sum_1_to_n(n)
+Purpose: The original while-loop sum_1_to_n, kept as the reference.
+'''
+def _loop_sum_1_to_n(n):
+    total = 0
+    i = 1
+
+    while i <= n:
+        total += i
+        i += 1
+
+    return total
+
+
+'''
+_random_ranges(count, seed)
+Purpose: Reproducible (start, stop, step) triples, including empty and
+descending ranges.
+'''
+def _random_ranges(count, seed):
+    rng = random.Random(seed)
+    steps = [s for s in range(-9, 10) if s != 0]
+    return [(rng.randint(-500, 500), rng.randint(-500, 500), rng.choice(steps)) for _ in range(count)]
+
+
+'''
+test_sum_1_to_n_matches_loop(n)
+Purpose: Ensure the closed form equals the loop, including n < 1.
+'''
+@pytest.mark.parametrize("n", list(range(-3, 200)) + [random.Random(0).randint(200, 100000) for _ in range(20)])
+def test_sum_1_to_n_matches_loop(n):
+    assert summation.sum_1_to_n(n) == _loop_sum_1_to_n(n)
+
+
+'''
+test_sum_1_to_n_huge()
+Purpose: Summing to 10**9 (and far beyond) is instant and exact.
+'''
+def test_sum_1_to_n_huge():
+    assert summation.sum_1_to_n(10**9) == 500000000500000000
+    assert summation.sum_1_to_n(10**30) == 10**30 * (10**30 + 1) // 2
+
+
+'''
+test_sum_range_matches_builtin()
+Purpose: Ensure sum_range equals sum(range(...)) for random bounds and steps.
+'''
+def test_sum_range_matches_builtin():
+    for start, stop, step in _random_ranges(5000, seed=1):
+        assert summation.sum_range(start, stop, step) == sum(range(start, stop, step))
+
+    with pytest.raises(ValueError):
+        summation.sum_range(0, 10, 0)
+
+
+'''
+test_sum_of_powers_matches_loop(p)
+Purpose: Ensure Faulhaber's formula equals direct summation for each power.
+'''
+@pytest.mark.parametrize("p", range(0, 16))
+def test_sum_of_powers_matches_loop(p):
+    for n in range(-1, 60):
+        assert summation.sum_of_powers(n, p) == sum(k ** p for k in range(1, n + 1))
+
+
+'''
+test_sum_range_array_matches_sum_range()
+Purpose: Ensure the vectorized sums match sum_range element by element,
+with and without NumPy.
+'''
+def test_sum_range_array_matches_sum_range(monkeypatch):
+    ranges = _random_ranges(2000, seed=2)
+    starts, stops, steps = (list(column) for column in zip(*ranges))
+    expected = [summation.sum_range(*r) for r in ranges]
+
+    if summation.np is not None:
+        assert summation.sum_range_array(starts, stops, steps).tolist() == expected
+        assert summation.sum_range_array(starts, stops).tolist() == [summation.sum_range(a, b) for a, b in zip(starts, stops)]
+    monkeypatch.setattr(summation, "np", None)
+    assert summation.sum_range_array(starts, stops, steps) == expected
@@ -3,6 +3,7 @@ Include pytest test cases that verify the word count for each text file.
 '''
 
 import os
+import random
 import pytest
 from src import task6
 
@@ -47,3 +48,115 @@ def test_count_words_in_small_files(tmp_path, content, expected):
     file.write_text(content)
 
     assert task6.count_words_in_file(str(file)) == expected
+
+
+'''
+test_count_words_across_chunk_boundaries(tmp_path, chunk_size)
+Purpose: Verify that streaming in tiny chunks gives the same count as
+str.split(), with words and multi-byte characters cut across chunks and
+Unicode whitespace (no-break space, ideographic space, U+001C..U+001F).
+'''
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_count_words_across_chunk_boundaries(tmp_path, chunk_size):
+    content = "héllo wörld 漢字　テキスト\x1csep line\r\nend 😀😀  ​zero-width em "
+    file = tmp_path / "unicode.txt"
+    file.write_bytes(content.encode("utf-8"))
+
+    assert task6.count_words_in_file(str(file), chunk_size=chunk_size) == len(content.split()) == 10
+
+
+'''
+test_count_words_in_chunks_random_text()
+Purpose: Verify random mixes of words and whitespace against str.split()
+for several chunk sizes.
+'''
+def test_count_words_in_chunks_random_text():
+    rng = random.Random(0)
+    whitespace = [" ", "\t", "\n", "\x0b", "\x1f", "\x85", " ", " ", "　"]
+    letters = ["a", "é", "漢", "😀", "﻿", "​"]
+    for _ in range(200):
+        text = "".join(rng.choice(whitespace if rng.random() < 0.3 else letters) for _ in range(rng.randint(0, 80)))
+        data = text.encode("utf-8")
+        for size in (1, 2, 5):
+            chunks = (data[i:i + size] for i in range(0, len(data), size))
+            assert task6.count_words_in_chunks(chunks) == len(text.split())
+
+
+'''
+test_count_words_invalid_utf8(tmp_path)
+Purpose: Verify that invalid UTF-8, including a truncated final character,
+raises like reading the file as text would.
+'''
+def test_count_words_invalid_utf8(tmp_path):
+    file = tmp_path / "truncated.txt"
+    file.write_bytes("word 漢".encode("utf-8")[:-1])
+
+    with pytest.raises(UnicodeDecodeError):
+        task6.count_words_in_file(str(file), chunk_size=2)
+
+
+'''
+test_count_words_in_files_parallel(tmp_path, workers, partition_bytes)
+Purpose: Verify per-file and total counts from the process pool, with files
+split into byte ranges small enough to cut words and multi-byte characters.
+'''
+@pytest.mark.parametrize("workers, partition_bytes", [(1, 3), (2, 5), (2, 1 << 20)])
+def test_count_words_in_files_parallel(tmp_path, workers, partition_bytes):
+    contents = ["", "one", "héllo wörld 漢字　テキスト 😀😀", "  lead and trail\n", "a b　c d" * 20]
+    names = []
+    for i, content in enumerate(contents):
+        file = tmp_path / f"file{i}.txt"
+        file.write_text(content, encoding="utf-8")
+        names.append(str(file))
+
+    counts, total = task6.count_words_in_files(names, workers=workers, partition_bytes=partition_bytes)
+
+    assert counts == {name: len(content.split()) for name, content in zip(names, contents)}
+    assert total == sum(len(content.split()) for content in contents)
+
+
+'''
+test_count_words_in_file_parallel()
+Purpose: Verify that splitting one file across workers matches the
+sequential count, using the provided task6_read_me.txt. The file is far
+below CHUNK_SIZE, so it is also counted in 64-byte ranges that cut words.
+'''
+def test_count_words_in_file_parallel():
+    filename = os.path.join(os.path.dirname(__file__), "..", "src", "task6_read_me.txt")
+
+    assert task6.count_words_in_file_parallel(filename, workers=2) == task6.count_words_in_file(filename) == 127
+    assert len(task6._partition(filename, 64)) > 1
+    assert task6.count_words_in_files([filename], 2, partition_bytes=64) == ({filename: 127}, 127)
+
+
+'''
+test_main_prints_counts(tmp_path, capsys)
+Purpose: Verify the command line entry point prints each file and the total.
+'''
+def test_main_prints_counts(tmp_path, capsys):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("one two")
+    second.write_text("three")
+
+    task6.main([str(first), str(second), "--workers", "1"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == ["2", "1", "3"]
+    assert lines[-1].endswith("total")
+
+
+'''
+test_main_rejects_bad_partition_size(tmp_path, capsys, value)
+Purpose: Verify --partition-mb below 1 is a usage error rather than a
+ZeroDivisionError from splitting the file.
+'''
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_main_rejects_bad_partition_size(tmp_path, capsys, value):
+    file = tmp_path / "a.txt"
+    file.write_text("one two")
+
+    with pytest.raises(SystemExit) as excinfo:
+        task6.main([str(file), "--partition-mb", value])
+
+    assert excinfo.value.code == 2
+    assert "--partition-mb must be at least 1" in capsys.readouterr().err
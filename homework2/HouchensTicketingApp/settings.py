@@ -59,6 +59,16 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [],  # ← disable Basic/Session auth for now
 }
 
+# Serve movie/screening/seat/booking list endpoints through the compiled read serializers
+# in bookings/fast_serializers.py (same JSON, less CPU per row)
+BOOKINGS_FAST_SERIALIZERS = os.environ.get('BOOKINGS_FAST_SERIALIZERS', '0') == '1'
+
+# Per-view latency/query metrics (bookings.middleware.RequestMetricsMiddleware),
+# reported as Server-Timing headers and at /api/metrics/ for staff users.
+BOOKINGS_METRICS_ENABLED = os.environ.get('BOOKINGS_METRICS', '0') == '1'
+# Samples kept per view for the rolling percentiles
+BOOKINGS_METRICS_WINDOW = 1000
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -74,7 +84,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'bookings.middleware.AsyncWhiteNoiseMiddleware',
+    'bookings.middleware.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -114,6 +125,58 @@ DATABASES = {
         conn_max_age=600
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # An on-disk test database locks like the real one; the default in-memory
+    # database's shared cache fails concurrent reads with "table is locked".
+    DATABASES['default']['TEST'] = {'NAME': str(BASE_DIR / 'test_db.sqlite3')}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Seat availability bitmaps live here. Set CACHE_BACKEND/CACHE_LOCATION to a
+# Redis or Memcached backend to share them across workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'houchensticketing'),
+    }
+}
+
+# Cache alias used by bookings.availability, bookings.layout and the seat grid fragment
+BOOKINGS_CACHE_ALIAS = 'default'
+
+# Seconds seat availability (and the seat layout token) is cached. Booking
+# signals only update the cache of the worker that handled the booking, so with
+# the per-process locmem cache this is how long other workers can show a booked
+# seat as free. A shared cache is updated at once; this then only bounds memory.
+BOOKINGS_AVAILABILITY_TIMEOUT = 30
+
+# Seconds a rendered seat grid fragment is kept. Fragments are keyed by booking
+# version, so this only bounds how long superseded fragments linger.
+BOOKINGS_SEAT_GRID_CACHE_TIMEOUT = 3600
+
+# Pub/sub backend for live seat events (bookings.events). The in-process broker
+# only reaches browsers connected to the same worker process.
+BOOKINGS_EVENT_BROKER = 'bookings.events.InProcessBroker'
+# Seconds between SSE keepalive comments, and before a stream is closed so the
+# browser reconnects and receives a fresh snapshot
+BOOKINGS_SSE_KEEPALIVE = 15
+BOOKINGS_SSE_MAX_AGE = 300
+
+# Seconds shared caches may serve /api/movies/ and /api/seats/ responses without
+# revalidating. Clients revalidate with the ETag/Last-Modified the responses carry
+# and get a 304 until the table changes.
+BOOKINGS_API_CACHE_MAX_AGE = 10
+
+# House seat map created by `manage.py generate_seats`: one entry per row from
+# the front (A..Z, AA, AB..), each a seat count or seat counts per block with
+# "|" for an aisle, e.g. "3|8|3". See bookings/seating.py.
+BOOKINGS_SEAT_MAP = [5] * 5
+
+# Seconds a seat hold (/api/holds/) lasts before its seats are free again.
+# Expired rows are deleted by `manage.py sweep_holds`.
+BOOKINGS_HOLD_TTL = 600
 
 
 # Password validation
@@ -1,11 +1,18 @@
 from django.contrib import admin
-from .models import Movie, Seat, Booking
+from .models import Movie, Screening, Seat, Booking, SeatHold
 
 @admin.register(Movie)
 class MovieAdmin(admin.ModelAdmin):
-    list_display = ['title', 'showtime', 'release_date', 'duration']
-    list_filter = ['showtime', 'release_date']
+    list_display = ['title', 'release_date', 'duration']
+    list_filter = ['release_date']
     search_fields = ['title', 'description']
+    ordering = ['title']
+
+@admin.register(Screening)
+class ScreeningAdmin(admin.ModelAdmin):
+    list_display = ['movie', 'showtime', 'auditorium', 'seats_booked']
+    list_filter = ['auditorium', 'showtime']
+    search_fields = ['movie__title', 'auditorium']
     ordering = ['-showtime']
 
 @admin.register(Seat)
@@ -16,7 +23,14 @@ class SeatAdmin(admin.ModelAdmin):
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ['movie', 'seat', 'user', 'booking_date']
-    list_filter = ['movie', 'booking_date']
-    search_fields = ['movie__title', 'user__username', 'seat__seat_number']
-    ordering = ['-booking_date']
\ No newline at end of file
+    list_display = ['screening', 'seat', 'user', 'booking_date']
+    list_filter = ['screening__movie', 'booking_date']
+    search_fields = ['screening__movie__title', 'user__username', 'seat__seat_number']
+    ordering = ['-booking_date']
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ['screening', 'seat', 'user', 'token', 'expires_at']
+    list_filter = ['screening__movie', 'expires_at']
+    search_fields = ['screening__movie__title', 'user__username', 'seat__seat_number', 'token']
+    ordering = ['expires_at']
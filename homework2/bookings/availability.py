@@ -0,0 +1,250 @@
+"""
+Cached per-screening seat availability.
+
+Booked seats for each screening are stored as a bitset indexed by seat position
+in the cache configured by ``BOOKINGS_CACHE_ALIAS`` (locmem by default).
+Booking signals keep the bitset current incrementally, so steady-state grid
+reads never query Seat or Booking. Bit positions follow bookings.layout.
+
+Every change to a screening's bookings bumps a per-screening version counter. A
+cached bitset is only trusted if it was written for the current version and
+seat layout, so a bitset rebuilt from a stale read is discarded rather than
+served forever.
+
+Signals only reach the cache of the process that handled the write, so with the
+default per-process cache other workers would keep serving their old bitset.
+Entries therefore expire after ``BOOKINGS_AVAILABILITY_TIMEOUT`` seconds, which
+bounds how long a worker can miss another worker's booking. Configure a shared
+cache (Redis or Memcached) to see bookings immediately.
+
+Seat holds are cached alongside the bitset with their expiry times. Expired
+holds are dropped when a snapshot is read, so a lapsed hold frees its seat
+without any write having to happen.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from . import layout as seat_layout
+from .models import Booking, SeatHold
+
+
+def _cache():
+    return caches[getattr(settings, "BOOKINGS_CACHE_ALIAS", "default")]
+
+
+def _timeout():
+    """Seconds a version counter or bitset is kept, from BOOKINGS_AVAILABILITY_TIMEOUT."""
+    return getattr(settings, "BOOKINGS_AVAILABILITY_TIMEOUT", 30)
+
+
+def _version_key(screening_id):
+    return f"bookings:availability:screening:{screening_id}:version"
+
+
+def _bitmap_key(screening_id):
+    return f"bookings:availability:screening:{screening_id}:bitmap"
+
+
+def _new_token():
+    # Time-based so a counter recreated after eviction never repeats an old value.
+    return time.time_ns()
+
+
+class SeatBitmap:
+    """Fixed-size bitset where bit i is set when the seat at position i is booked."""
+    __slots__ = ("bits",)
+
+    def __init__(self, size=0, data=None):
+        self.bits = bytearray(data) if data is not None else bytearray((size + 7) // 8)
+
+    def add(self, position):
+        self.bits[position >> 3] |= 1 << (position & 7)
+
+    def discard(self, position):
+        self.bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    def __contains__(self, position):
+        return bool(self.bits[position >> 3] & (1 << (position & 7)))
+
+    def positions(self):
+        """Yield the position of every set bit in ascending order."""
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_index << 3) + low.bit_length() - 1
+                byte ^= low
+
+
+class ScreeningAvailability:
+    """
+    Snapshot of seat availability for one screening.
+
+    Attributes:
+        version: Booking version this snapshot reflects
+        layout: SeatLayout the bitmap positions refer to
+        bitmap: SeatBitmap of booked positions
+        holds: Tuple of (position, expiry timestamp) for holds, possibly expired
+        held: Positions held by unexpired holds
+    """
+
+    def __init__(self, version, layout, bitmap, holds=()):
+        self.version = version
+        self.layout = layout
+        self.bitmap = bitmap
+        self.holds = holds
+        now = time.time()
+        self.held = frozenset(pos for pos, expires in holds if expires > now)
+
+    @property
+    def grid_version(self):
+        """Changes whenever the rendered seat grid for this screening could change."""
+        version = f"{self.layout.token}.{self.version}"
+        if self.held:
+            version += ".h" + "-".join(map(str, sorted(self.held)))
+        return version
+
+    def booked_seat_ids(self):
+        seats = self.layout.seats
+        return {seats[pos].id for pos in self.bitmap.positions()}
+
+    def held_seat_ids(self):
+        seats = self.layout.seats
+        return {seats[pos].id for pos in self.held}
+
+    def is_booked(self, seat_id):
+        pos = self.layout.positions.get(seat_id)
+        return pos is not None and pos in self.bitmap
+
+    def is_held(self, seat_id):
+        pos = self.layout.positions.get(seat_id)
+        return pos is not None and pos in self.held
+
+
+def _from_entry(version, layout, entry):
+    """Return the cached snapshot if it matches version and layout, else None."""
+    if entry is not None and entry[0] == version and entry[1] == layout.token:
+        return ScreeningAvailability(version, layout, SeatBitmap(data=entry[2]), entry[3])
+    return None
+
+
+def _build(version, layout, booked_seat_ids, holds):
+    """Build a snapshot from booked seat ids and (seat_id, expires_at) hold rows."""
+    positions = layout.positions
+    bitmap = SeatBitmap(len(layout))
+    for seat_id in booked_seat_ids:
+        pos = positions.get(seat_id)
+        if pos is not None:
+            bitmap.add(pos)
+    holds = tuple(
+        (positions[seat_id], expires_at.timestamp())
+        for seat_id, expires_at in holds if seat_id in positions
+    )
+    return ScreeningAvailability(version, layout, bitmap, holds)
+
+
+def _entry(snapshot):
+    return (snapshot.version, snapshot.layout.token, bytes(snapshot.bitmap.bits), snapshot.holds)
+
+
+def _live_holds(screening_id):
+    return SeatHold.objects.filter(screening_id=screening_id, expires_at__gt=timezone.now()).values_list(
+        "seat_id", "expires_at"
+    )
+
+
+def get_availability(screening_id):
+    """Return the ScreeningAvailability for a screening, rebuilding it only when stale."""
+    cache = _cache()
+    layout = seat_layout.get_layout()
+    version_key, bitmap_key = _version_key(screening_id), _bitmap_key(screening_id)
+    found = cache.get_many([version_key, bitmap_key])
+    version = found.get(version_key)
+    if version is None:
+        cache.add(version_key, _new_token(), _timeout())
+        version = cache.get(version_key)
+
+    snapshot = _from_entry(version, layout, found.get(bitmap_key))
+    if snapshot is None:
+        booked = Booking.objects.filter(screening_id=screening_id).values_list("seat_id", flat=True)
+        snapshot = _build(version, layout, booked, _live_holds(screening_id))
+        cache.set(bitmap_key, _entry(snapshot), _timeout())
+    return snapshot
+
+
+async def aget_availability(screening_id):
+    """
+    Async version of get_availability().
+
+    The layout token is read in the same batch as the screening's keys, so the
+    steady state costs one cache round trip.
+    """
+    cache = _cache()
+    version_key, bitmap_key = _version_key(screening_id), _bitmap_key(screening_id)
+    found = await cache.aget_many([seat_layout.TOKEN_KEY, version_key, bitmap_key])
+    layout = await seat_layout.aget_layout(found.get(seat_layout.TOKEN_KEY))
+    version = found.get(version_key)
+    if version is None:
+        await cache.aadd(version_key, _new_token(), _timeout())
+        version = await cache.aget(version_key)
+
+    snapshot = _from_entry(version, layout, found.get(bitmap_key))
+    if snapshot is None:
+        booked = Booking.objects.filter(screening_id=screening_id).values_list("seat_id", flat=True)
+        holds = [hold async for hold in _live_holds(screening_id)]
+        snapshot = _build(version, layout, [seat_id async for seat_id in booked], holds)
+        await cache.aset(bitmap_key, _entry(snapshot), _timeout())
+    return snapshot
+
+
+def _apply(screening_id, seat_ids, booked):
+    cache = _cache()
+    version_key, bitmap_key = _version_key(screening_id), _bitmap_key(screening_id)
+    try:
+        version = cache.incr(version_key)
+    except ValueError:
+        # No counter means no trustworthy bitmap either; the next read rebuilds.
+        cache.add(version_key, _new_token(), _timeout())
+        return
+    if not seat_ids:
+        return
+
+    entry = cache.get(bitmap_key)
+    if entry is None or entry[0] != version - 1:
+        # Another writer got in between; leave the bitmap stale so it gets rebuilt.
+        return
+    layout = seat_layout.get_layout()
+    if entry[1] != layout.token:
+        return
+    bitmap = SeatBitmap(data=entry[2])
+    for seat_id in seat_ids:
+        pos = layout.positions.get(seat_id)
+        if pos is None:
+            continue
+        if booked:
+            bitmap.add(pos)
+        else:
+            bitmap.discard(pos)
+    cache.set(bitmap_key, (version, layout.token, bytes(bitmap.bits), entry[3]), _timeout())
+
+
+def mark_booked(screening_id, seat_ids):
+    """Record newly committed bookings for a screening."""
+    _apply(screening_id, seat_ids, booked=True)
+
+
+def mark_released(screening_id, seat_ids):
+    """Record deleted bookings for a screening."""
+    _apply(screening_id, seat_ids, booked=False)
+
+
+def invalidate(screening_id):
+    """Bump a screening's version without applying a delta, forcing a rebuild (e.g. after holds change)."""
+    _apply(screening_id, (), booked=False)
+
+
+def forget(screening_id):
+    """Drop everything cached for a deleted screening."""
+    _cache().delete_many([_version_key(screening_id), _bitmap_key(screening_id)])
@@ -0,0 +1,188 @@
+"""
+Live seat availability events.
+
+Once a booking or hold change commits, the seats it booked, held or released
+are published to a per-screening channel, and screening_seat_events streams
+them to
+the seat grid page as Server-Sent Events. A stream opens with a snapshot of
+the booked and held seats and then carries small deltas, so the page never
+has to be polled.
+
+The broker is pluggable through the BOOKINGS_EVENT_BROKER setting: a dotted
+path to a class with publish(channel, message) and subscribe(channel), the
+latter returning a Subscription-like object. The default InProcessBroker only
+reaches clients connected to the same process, so deployments running several
+workers need a broker on shared infrastructure (e.g. Redis pub/sub) to deliver
+every change. Streams are closed after BOOKINGS_SSE_MAX_AGE seconds and the
+browser reconnects with a fresh snapshot, which bounds how long a missed
+event can go unnoticed.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+
+from . import availability
+from .models import Screening
+
+BOOKED = "booked"
+HELD = "held"
+RELEASED = "released"
+# Published when changes can't be expressed as deltas; streams resend the snapshot
+RESYNC_STATUS = "resync"
+
+# Messages a subscriber may fall behind by before its backlog is replaced
+# with a request to resend the snapshot.
+MAX_PENDING = 100
+
+# Tells a stream to resend the snapshot rather than a delta.
+RESYNC = object()
+
+_broker = None
+
+
+class Subscription:
+    """
+    One stream's queue of messages from a channel.
+
+    put() may be called from any thread (bookings commit in worker threads);
+    messages are handed to the event loop the subscription was created on.
+    Use as a context manager so it is always unsubscribed.
+    """
+
+    def __init__(self, broker, channel, max_pending=MAX_PENDING):
+        self.broker = broker
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(max_pending)
+
+    def put(self, message):
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, message)
+        except RuntimeError:
+            # The stream's event loop has shut down without unsubscribing.
+            self.close()
+
+    def _deliver(self, message):
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            message = RESYNC
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Return the next message, or None if none arrives within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class InProcessBroker:
+    """Fan messages out to subscriptions held by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        path = getattr(settings, "BOOKINGS_EVENT_BROKER", "bookings.events.InProcessBroker")
+        _broker = import_string(path)()
+    return _broker
+
+
+def _channel(screening_id):
+    return f"bookings:seats:screening:{screening_id}"
+
+
+def publish_seats(screening_id, seat_ids, status):
+    """Announce that seats were booked, held or released for a screening; call once committed."""
+    if seat_ids:
+        get_broker().publish(_channel(screening_id), {"status": status, "seat_ids": list(seat_ids)})
+
+
+def publish_resync(screening_id):
+    """Tell a screening's streams to resend their snapshot; call once committed."""
+    get_broker().publish(_channel(screening_id), {"status": RESYNC_STATUS, "seat_ids": []})
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _snapshot(screening_id):
+    seat_availability = await availability.aget_availability(screening_id)
+    return _event("snapshot", {
+        "booked": sorted(seat_availability.booked_seat_ids()),
+        "held": sorted(seat_availability.held_seat_ids()),
+    })
+
+
+async def _stream(screening_id):
+    keepalive = getattr(settings, "BOOKINGS_SSE_KEEPALIVE", 15)
+    max_age = getattr(settings, "BOOKINGS_SSE_MAX_AGE", 300)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    # Subscribe before reading the snapshot so no change falls between the two.
+    with get_broker().subscribe(_channel(screening_id)) as subscription:
+        yield "retry: 3000\n\n"
+        yield await _snapshot(screening_id)
+        while (remaining := deadline - loop.time()) > 0:
+            message = await subscription.get(min(keepalive, remaining))
+            if message is None:
+                yield ": keepalive\n\n"
+            elif message is RESYNC or message["status"] == RESYNC_STATUS:
+                yield await _snapshot(screening_id)
+            else:
+                yield _event("seats", message)
+
+
+async def screening_seat_events(request, screening_id: int):
+    """Stream seat booked/held/released events for one screening as Server-Sent Events."""
+    if not isinstance(request, ASGIRequest):
+        # A sync server would hold a worker thread per open stream. 204 tells
+        # EventSource not to reconnect; the page still works without live updates.
+        return HttpResponse(status=204)
+    if not await Screening.objects.filter(pk=screening_id).aexists():
+        raise Http404("No Screening matches the given query.")
+    response = StreamingHttpResponse(_stream(screening_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
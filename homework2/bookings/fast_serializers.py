@@ -0,0 +1,127 @@
+"""
+Compiled, read-only serializers for list endpoints.
+
+A CompiledSerializer walks a ModelSerializer's readable fields once and
+generates a function that turns a ``.values()`` row straight into the output
+dict. Per-field work is reduced to a dict lookup, plus a pre-bound
+``to_representation`` call for fields whose database value needs formatting
+(dates, datetimes). Field names, order and formatting come from the
+ModelSerializer itself, so the JSON is byte-identical to the regular
+serializer's. Enabled with the BOOKINGS_FAST_SERIALIZERS setting.
+
+ISO 8601 date and datetime fields get specialised converters: DRF resolves
+the active timezone for every datetime it formats, whereas here it is
+resolved once per serialize() call.
+"""
+import datetime
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .serializers import MovieSerializer, ScreeningSerializer, SeatSerializer, BookingSerializer
+
+# DRF fields whose representation of a database value is the value itself
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _is_iso(field, default_format):
+    output_format = getattr(field, "format", default_format)
+    return output_format is not None and output_format.lower() == ISO_8601
+
+
+def _converter(field):
+    """
+    Return a callable that, once per serialize() call, yields the function
+    converting a non-None database value for this field.
+    """
+    if type(field) is serializers.DateField and _is_iso(field, api_settings.DATE_FORMAT):
+        return lambda: datetime.date.isoformat
+
+    if (type(field) is serializers.DateTimeField and not hasattr(field, "timezone")
+            and _is_iso(field, api_settings.DATETIME_FORMAT)):
+        def prepare():
+            tz = field.default_timezone()
+            if tz is None:
+                return field.to_representation
+
+            def convert(value):
+                if value.utcoffset() is None:
+                    return field.to_representation(value)
+                value = value.astimezone(tz).isoformat()
+                return value[:-6] + "Z" if value.endswith("+00:00") else value
+            return convert
+        return prepare
+
+    return lambda: field.to_representation
+
+
+class CompiledSerializer:
+    """
+    Read-only fast path compiled from a ModelSerializer class.
+
+    Attributes:
+        lookups: values() lookups needed to build one row
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.lookups = []
+        self._converters = []
+        expression = self._compile(serializer_class(), prefix="")
+        namespace = {}
+        exec(f"def build(row, c):\n    return {expression}\n", namespace)
+        self._build = namespace["build"]
+
+    def _lookup(self, field, prefix):
+        if field.source == "*" or any(not attr.isidentifier() for attr in field.source_attrs):
+            raise ImproperlyConfigured(
+                f"{self.serializer_class.__name__}.{field.field_name}: only model fields "
+                f"and relations can be compiled, not source='{field.source}'"
+            )
+        # source="screening.movie" follows the relation in the values() lookup
+        lookup = prefix + "__".join(field.source_attrs)
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return lookup
+
+    def _compile(self, serializer, prefix):
+        """Return a Python expression building the dict for one (possibly nested) serializer."""
+        items = []
+        for field in serializer._readable_fields:
+            lookup = self._lookup(field, prefix)
+            if isinstance(field, serializers.BaseSerializer):
+                # values(lookup) on a relation yields its pk; None means no related object
+                nested = self._compile(field, prefix=lookup + "__")
+                value = f"(None if row[{lookup!r}] is None else {nested})"
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                value = f"row[{lookup!r}]"
+            else:
+                index = len(self._converters)
+                self._converters.append(_converter(field))
+                # Serializer.to_representation skips the field's conversion for None
+                value = f"(None if (v := row[{lookup!r}]) is None else c[{index}](v))"
+            items.append(f"{field.field_name!r}: {value}")
+        return "{" + ", ".join(items) + "}"
+
+    def _prepare(self):
+        return tuple(prepare() for prepare in self._converters)
+
+    def to_representation(self, row):
+        return self._build(row, self._prepare())
+
+    def serialize(self, rows):
+        """Build output dicts for an iterable of values() rows."""
+        build, converters = self._build, self._prepare()
+        return [build(row, converters) for row in rows]
+
+
+fast_movie_serializer = CompiledSerializer(MovieSerializer)
+fast_screening_serializer = CompiledSerializer(ScreeningSerializer)
+fast_seat_serializer = CompiledSerializer(SeatSerializer)
+fast_booking_serializer = CompiledSerializer(BookingSerializer)
@@ -0,0 +1,75 @@
+"""
+Guest user resolution.
+
+Anonymous bookings are made on behalf of a shared "guest" user. Looking it up
+with get_or_create on every booking costs a query, so each process keeps the
+resolved user in memory. It is loaded when the process first connects to the
+database and dropped whenever that user is saved or deleted.
+
+A user is only remembered when it was read outside any transaction, so a
+guest created inside a transaction that is later rolled back is never cached.
+"""
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.db.backends.signals import connection_created
+
+GUEST_USERNAME = "guest"
+
+_guest = None
+
+
+def _remember(user):
+    global _guest
+    _guest = user
+
+
+def _remember_if_committed(user):
+    if not transaction.get_connection().in_atomic_block:
+        _remember(user)
+
+
+def get_guest_user():
+    """Return the guest user, creating it the first time it is needed."""
+    guest = _guest
+    if guest is None:
+        guest, _ = get_user_model().objects.get_or_create(username=GUEST_USERNAME)
+        _remember_if_committed(guest)
+    return guest
+
+
+def resolve_user(request):
+    """The authenticated user, or the guest user for anonymous requests."""
+    user = request.user
+    return user if user.is_authenticated else get_guest_user()
+
+
+def invalidate():
+    """Forget the cached guest user; call after any change to it."""
+    _remember(None)
+
+
+def warm():
+    """Load an existing guest user without creating one."""
+    try:
+        guest = get_user_model().objects.filter(username=GUEST_USERNAME).first()
+    except DatabaseError:
+        # Tables not migrated yet; the first anonymous booking resolves it instead.
+        return
+    if guest is not None:
+        _remember_if_committed(guest)
+
+
+def _warm_on_first_connection(sender, **kwargs):
+    connection_created.disconnect(dispatch_uid="bookings_warm_guest")
+    warm()
+
+
+def warm_on_connect():
+    """
+    Warm the cache when the process first connects to the database.
+
+    Called from AppConfig.ready(), which must not query the database itself:
+    under the test runner it would read the development database rather than
+    the test one.
+    """
+    connection_created.connect(_warm_on_first_connection, dispatch_uid="bookings_warm_guest")
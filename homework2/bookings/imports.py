@@ -0,0 +1,169 @@
+"""
+Bulk movie, screening and seat imports.
+
+A payload is a list of rows (parsed from JSON or CSV). Rows are validated
+together through the API serializers with many=True, and any errors are
+reported against the row's index in the payload. Writes happen in one
+transaction: existing rows are looked up in chunks, changed ones are written
+back with bulk_update and new ones inserted with bulk_create, IMPORT_CHUNK_SIZE
+rows per statement, so the number of queries grows with the number of chunks
+rather than the number of rows.
+
+By default an import with any invalid row writes nothing. With partial=True
+the valid rows are imported and the invalid ones are only reported.
+"""
+from django.db import transaction
+
+from . import layout, versions
+from .models import Movie, Screening, Seat
+from .serializers import MovieImportSerializer, SeatSerializer
+
+# Rows per lookup, INSERT and UPDATE statement
+IMPORT_CHUNK_SIZE = 1000
+
+# Fields an import may change on a movie that already exists
+MOVIE_UPDATE_FIELDS = ["description", "duration"]
+
+
+class ImportResult:
+    """
+    Outcome of an import.
+
+    Attributes:
+        counts: Rows created/updated/skipped, by name (e.g. "movies_created")
+        errors: One {"index", "errors"} entry per invalid row, in payload order
+        written: Whether anything was imported
+    """
+
+    def __init__(self, counts=None, errors=None, written=False):
+        self.counts = counts or {}
+        self.errors = errors or []
+        self.written = written
+
+    def as_dict(self):
+        return {**self.counts, "errors": self.errors}
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _validate(serializer_class, rows, partial):
+    """
+    Validate rows with serializer_class(many=True).
+
+    Returns (validated rows, per-row errors). Without partial, any error
+    leaves no validated rows.
+    """
+    if not isinstance(rows, list):
+        return [], [{"index": None, "errors": {"non_field_errors": ["Expected a list of rows."]}}]
+    serializer = serializer_class(data=rows, many=True)
+    if serializer.is_valid():
+        return serializer.validated_data, []
+    errors = [{"index": index, "errors": row_errors} for index, row_errors in enumerate(serializer.errors) if row_errors]
+    if not partial:
+        return [], errors
+    # ListSerializer keeps no validated data once a row fails, so revalidate the good ones.
+    valid = serializer_class(data=[row for row, row_errors in zip(rows, serializer.errors) if not row_errors], many=True)
+    valid.is_valid(raise_exception=True)
+    return valid.validated_data, errors
+
+
+def import_movies(rows, partial=False, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import movies and their screenings.
+
+    Each row carries a movie's fields plus an optional showtime and
+    auditorium (see MovieImportSerializer). Movies are matched on title and
+    release date: existing ones get their description and duration updated,
+    new ones are created. A row with a showtime or auditorium adds that
+    screening unless the movie already has it.
+    """
+    validated, errors = _validate(MovieImportSerializer, rows, partial)
+    if not validated:
+        return ImportResult(errors=errors)
+
+    movies = {}
+    screenings = {}
+    for data in validated:
+        key = (data["title"], data["release_date"])
+        wanted = screenings.setdefault(key, {})
+        if "showtime" in data or "auditorium" in data:
+            wanted[(data.pop("showtime", None), data.pop("auditorium", "Main"))] = None
+        movies[key] = data
+
+    with transaction.atomic():
+        existing = {}
+        keys = list(movies)
+        for chunk in _chunks(keys, chunk_size):
+            for movie in Movie.objects.filter(title__in={title for title, _ in chunk}):
+                key = (movie.title, movie.release_date)
+                if key in movies:
+                    existing.setdefault(key, movie)
+
+        to_update = []
+        for key, movie in existing.items():
+            data = movies[key]
+            if any(getattr(movie, field) != data[field] for field in MOVIE_UPDATE_FIELDS):
+                for field in MOVIE_UPDATE_FIELDS:
+                    setattr(movie, field, data[field])
+                to_update.append(movie)
+        Movie.objects.bulk_update(to_update, MOVIE_UPDATE_FIELDS, batch_size=chunk_size)
+
+        to_create = [Movie(**movies[key]) for key in keys if key not in existing]
+        Movie.objects.bulk_create(to_create, batch_size=chunk_size)
+        if to_update or to_create:
+            # bulk_update and bulk_create skip the Movie signals that start a new version
+            versions.touch(versions.MOVIES)
+        by_key = {**existing, **{(movie.title, movie.release_date): movie for movie in to_create}}
+
+        scheduled = set()
+        existing_ids = [movie.pk for movie in existing.values()]
+        for chunk in _chunks(existing_ids, chunk_size):
+            scheduled.update(
+                Screening.objects.filter(movie_id__in=chunk).values_list("movie_id", "showtime", "auditorium")
+            )
+        new_screenings = [
+            Screening(movie=by_key[key], showtime=showtime, auditorium=auditorium)
+            for key, wanted in screenings.items()
+            for showtime, auditorium in wanted
+            if (by_key[key].pk, showtime, auditorium) not in scheduled
+        ]
+        Screening.objects.bulk_create(new_screenings, batch_size=chunk_size)
+
+    return ImportResult({
+        "movies_created": len(to_create),
+        "movies_updated": len(to_update),
+        "screenings_created": len(new_screenings),
+    }, errors, written=True)
+
+
+def import_seats(rows, partial=False, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import seats from rows of {"seat_number": ...}.
+
+    Seat numbers that already exist, or repeat earlier in the payload, are
+    skipped, so re-running an import is harmless.
+    """
+    validated, errors = _validate(SeatSerializer, rows, partial)
+    if not validated:
+        return ImportResult(errors=errors)
+
+    numbers = list(dict.fromkeys(data["seat_number"] for data in validated))
+    with transaction.atomic():
+        taken = set()
+        for chunk in _chunks(numbers, chunk_size):
+            taken.update(Seat.objects.filter(seat_number__in=chunk).values_list("seat_number", flat=True))
+        created = Seat.objects.bulk_create(
+            (Seat(seat_number=number) for number in numbers if number not in taken), batch_size=chunk_size
+        )
+        if created:
+            # bulk_create skips the Seat signals that start a new version and rebuild the layout
+            versions.touch(versions.SEATS)
+            transaction.on_commit(layout.invalidate)
+
+    return ImportResult({
+        "seats_created": len(created),
+        "seats_skipped": len(validated) - len(created),
+    }, errors, written=True)
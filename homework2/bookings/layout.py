@@ -0,0 +1,163 @@
+"""
+Precomputed seat layout.
+
+Seats are grouped into rows and ordered once per change to the Seat table
+rather than on every request. The layout is shared through the bookings
+cache under a token that seat signals replace, and each process keeps the
+layout for the current token in memory so a steady-state read costs a single
+cache lookup. aget_layout() is the same lookup for async views. Like the
+availability entries, the token expires after BOOKINGS_AVAILABILITY_TIMEOUT
+seconds so workers with their own cache pick up seat changes made elsewhere.
+
+Aisles come from the house seat map (bookings.seating) and are marked on the
+seat they follow.
+"""
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import seating
+from .models import Seat
+
+TOKEN_KEY = "bookings:layout:token"
+
+# Layouts for superseded tokens are never read again; let them age out.
+LAYOUT_TIMEOUT = 24 * 60 * 60
+
+SEAT_NUMBER_RE = re.compile(r"^([A-Za-z]+)\s*(\d+)$")
+
+_current = None
+
+
+def _cache():
+    return caches[getattr(settings, "BOOKINGS_CACHE_ALIAS", "default")]
+
+
+def parse_seat_number(seat_number):
+    """
+    Split a seat number into (row_label, column).
+
+    "A1" -> ("A", 1), "AB12" -> ("AB", 12). Seat numbers that don't follow the
+    letters-then-digits pattern keep their whole text as the row label and
+    sort first in that row with column 0.
+    """
+    match = SEAT_NUMBER_RE.match(seat_number.strip())
+    if match is None:
+        return seat_number, 0
+    return match.group(1).upper(), int(match.group(2))
+
+
+def row_sort_key(row_label):
+    """Order rows A..Z, then AA, AB.. like spreadsheet columns."""
+    return (len(row_label), row_label)
+
+
+class SeatLayout:
+    """
+    Ordered row/column layout of every seat.
+
+    Attributes:
+        token: Identifies the Seat table state this layout was built from
+        rows: List of (row_label, [(column, seat), ...]) in display order
+        seats: Every seat in display order; a seat's index is its position
+        positions: Mapping of seat id to position
+        aisle_after: Ids of the seats an aisle follows
+    """
+
+    def __init__(self, token, seats, aisles=None):
+        self.token = token
+        parsed = sorted(
+            ((parse_seat_number(seat.seat_number), seat) for seat in seats),
+            key=lambda item: (row_sort_key(item[0][0]), item[0][1], item[1].seat_number),
+        )
+        self.rows = []
+        for (row_label, col), seat in parsed:
+            if not self.rows or self.rows[-1][0] != row_label:
+                self.rows.append((row_label, []))
+            self.rows[-1][1].append((col, seat))
+        self.seats = [seat for _, seat in parsed]
+        self.positions = {seat.id: pos for pos, seat in enumerate(self.seats)}
+        if aisles is None:
+            aisles = seating.seat_map().aisles()
+        self.aisle_after = {
+            seat.id for row_label, entries in self.rows for col, seat in entries
+            if col in aisles.get(row_label, ())
+        }
+
+    def __len__(self):
+        return len(self.seats)
+
+
+def _current_token(cache):
+    token = cache.get(TOKEN_KEY)
+    if token is None:
+        cache.add(TOKEN_KEY, time.time_ns(), _token_timeout())
+        token = cache.get(TOKEN_KEY)
+    return token
+
+
+async def _acurrent_token(cache):
+    token = await cache.aget(TOKEN_KEY)
+    if token is None:
+        await cache.aadd(TOKEN_KEY, time.time_ns(), _token_timeout())
+        token = await cache.aget(TOKEN_KEY)
+    return token
+
+
+def _token_timeout():
+    return getattr(settings, "BOOKINGS_AVAILABILITY_TIMEOUT", 30)
+
+
+def _layout_key(token):
+    return f"bookings:layout:{token}"
+
+
+def get_layout():
+    """Return the SeatLayout for the current seats, building it only after a change."""
+    global _current
+    cache = _cache()
+    token = _current_token(cache)
+    layout = _current
+    if layout is not None and layout.token == token:
+        return layout
+
+    layout = cache.get(_layout_key(token))
+    if layout is None:
+        layout = SeatLayout(token, Seat.objects.all())
+        cache.set(_layout_key(token), layout, LAYOUT_TIMEOUT)
+    _current = layout
+    return layout
+
+
+async def aget_layout(token=None):
+    """
+    Async version of get_layout() using the async cache API and ORM.
+
+    Callers that already fetched TOKEN_KEY in a batched cache read can pass it
+    in to save a round trip.
+    """
+    global _current
+    cache = _cache()
+    if token is None:
+        token = await _acurrent_token(cache)
+    layout = _current
+    if layout is not None and layout.token == token:
+        return layout
+
+    layout = await cache.aget(_layout_key(token))
+    if layout is None:
+        layout = SeatLayout(token, [seat async for seat in Seat.objects.all()])
+        await cache.aset(_layout_key(token), layout, LAYOUT_TIMEOUT)
+    _current = layout
+    return layout
+
+
+def invalidate():
+    """Start a new layout token; call after any change to Seat rows."""
+    _cache().set(TOKEN_KEY, time.time_ns(), _token_timeout())
+
+
+async def ainvalidate():
+    await _cache().aset(TOKEN_KEY, time.time_ns(), _token_timeout())
@@ -0,0 +1,252 @@
+import datetime
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from bookings import layout
+from bookings.metrics import percentile
+from bookings.models import Movie, Screening, Seat, Booking
+from bookings.seating import row_label
+
+SEATS_PER_ROW = 20
+
+
+def _summarize(latencies, elapsed, queries=None, errors=0):
+    ordered = sorted(latencies)
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "latency_ms": {f"p{pct}": round(percentile(ordered, pct), 3) for pct in (50, 95, 99)},
+    }
+    if queries is not None:
+        summary["queries_per_request"] = round(sum(queries) / len(queries), 2)
+    return summary
+
+
+class _NoDelayConnection(http.client.HTTPConnection):
+    """
+    Keep-alive connection with Nagle's algorithm off, so a request split over
+    two writes isn't held back waiting for the server's delayed ACK.
+    """
+
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic movies/seats/bookings into a throwaway test database and "
+        "measure the ticketing API and pages in-process (Django test client) and "
+        "concurrently through a local ASGI server. Prints a JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--movies", type=int, default=20)
+        parser.add_argument("--seats", type=int, default=200, help="Seats in the auditorium")
+        parser.add_argument("--bookings", type=int, default=2000)
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=8, help="Client threads for the ASGI run")
+        parser.add_argument("--seed", type=int, default=4300)
+        parser.add_argument("--no-asgi", action="store_true", help="Skip the ASGI server run")
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument("--compare", help="Baseline JSON report to diff this run against")
+
+    def handle(self, *args, **options):
+        for name in ("movies", "seats", "requests", "concurrency"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1")
+        if options["bookings"] < 0:
+            raise CommandError("--bookings must not be negative")
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            cache.clear()
+            targets = self._seed(options)
+            report = {
+                "meta": {
+                    "movies": options["movies"],
+                    "seats": options["seats"],
+                    "bookings": options["bookings"],
+                    "requests": options["requests"],
+                    "concurrency": options["concurrency"],
+                    "database": connection.vendor,
+                    "django": django.get_version(),
+                    "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                },
+                "in_process": self._run_in_process(targets, options),
+            }
+            if not options["no_asgi"]:
+                report["asgi"] = self._run_asgi(targets, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+        if baseline is not None:
+            self._compare(baseline, report)
+
+    def _seed(self, options):
+        rng = random.Random(options["seed"])
+        user = User.objects.create_user(username="bench")
+        movies = Movie.objects.bulk_create(
+            Movie(title=f"Benchmark Movie {i:04d}", description="Synthetic benchmark movie",
+                  release_date=datetime.date(2024, 1, 1), duration=90 + i % 60)
+            for i in range(options["movies"])
+        )
+        # One screening per movie, spread over the next week
+        start = timezone.now() + datetime.timedelta(hours=1)
+        screenings = Screening.objects.bulk_create(
+            Screening(movie=m, showtime=start + datetime.timedelta(hours=3 * i), auditorium=f"Screen {i % 4 + 1}")
+            for i, m in enumerate(movies)
+        )
+        seats = Seat.objects.bulk_create(
+            Seat(seat_number=f"{row_label(i // SEATS_PER_ROW)}{i % SEATS_PER_ROW + 1}")
+            for i in range(options["seats"])
+        )
+        pairs = [(sc, s) for sc in screenings for s in seats]
+        rng.shuffle(pairs)
+        booked_count = min(options["bookings"], len(pairs))
+        Booking.objects.bulk_create(
+            (Booking(screening=sc, seat=s, user=user) for sc, s in pairs[:booked_count]),
+            batch_size=1000,
+        )
+        # bulk_create skips signals, so start from a fresh layout/availability cache
+        layout.invalidate()
+
+        free = [(sc.pk, s.pk) for sc, s in pairs[booked_count:]]
+        screening_id = screenings[0].pk
+        return [
+            ("movie-list", "GET", lambda i: "/api/movies/", None),
+            ("screening-list", "GET", lambda i: "/api/screenings/", None),
+            ("seat-list", "GET", lambda i: "/api/seats/", None),
+            ("booking-list", "GET", lambda i: "/api/bookings/", None),
+            ("seat-book", "POST", lambda i: f"/api/seats/{free[i % len(free)][1]}/book/" if free else "/api/seats/0/book/",
+             lambda i: {"screening_id": free[i % len(free)][0]} if free else {}),
+            ("movie_list_page", "GET", lambda i: "/api/pages/movies/", None),
+            ("screening_seat_grid_page", "GET", lambda i: f"/api/pages/screenings/{screening_id}/seats/", None),
+            ("booking_history_page", "GET", lambda i: "/api/pages/history/", None),
+        ]
+
+    def _run_in_process(self, targets, options):
+        client = Client()
+        results = {}
+        for name, method, path, body in targets:
+            latencies, queries, errors = [], [], 0
+            start = time.perf_counter()
+            for i in range(options["requests"]):
+                with CaptureQueriesContext(connection) as captured:
+                    t0 = time.perf_counter()
+                    if method == "POST":
+                        response = client.post(path(i), body(i), content_type="application/json")
+                    else:
+                        response = client.get(path(i), HTTP_ACCEPT="application/json")
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                queries.append(len(captured))
+                errors += response.status_code >= 500
+            results[name] = _summarize(latencies, time.perf_counter() - start, queries, errors)
+            self.stderr.write(f"in-process {name}: {results[name]['rps']} req/s")
+        return results
+
+    def _run_asgi(self, targets, options):
+        try:
+            import uvicorn
+        except ImportError:
+            self.stderr.write(self.style.WARNING("uvicorn is not installed; skipping the ASGI run"))
+            return None
+        from HouchensTicketingApp.asgi import application
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        # Accepted connections inherit this. Without it the response body, written
+        # after the headers, waits ~40 ms on every reused keep-alive connection for
+        # the client's delayed ACK, and the run measures TCP instead of the app.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        host, port = sock.getsockname()
+        server = uvicorn.Server(uvicorn.Config(application, lifespan="off", log_level="warning"))
+        thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if time.monotonic() > deadline or not thread.is_alive():
+                raise CommandError("ASGI server failed to start")
+            time.sleep(0.05)
+
+        local = threading.local()
+
+        def send(method, path, body):
+            conn = getattr(local, "conn", None)
+            if conn is None:
+                conn = local.conn = _NoDelayConnection(host, port, timeout=30)
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {"Accept": "application/json"}
+            if payload is not None:
+                headers["Content-Type"] = "application/json"
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (http.client.HTTPException, OSError):
+                local.conn = None
+                status = 599
+            return (time.perf_counter() - t0) * 1000, status
+
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                for name, method, path, body in targets:
+                    # Continue after the in-process run so POSTs book seats that are still free
+                    offset = options["requests"]
+                    start = time.perf_counter()
+                    outcomes = list(pool.map(
+                        lambda i: send(method, path(offset + i), body(offset + i) if body else None),
+                        range(options["requests"]),
+                    ))
+                    elapsed = time.perf_counter() - start
+                    errors = sum(1 for _, status in outcomes if status >= 500)
+                    results[name] = _summarize([ms for ms, _ in outcomes], elapsed, errors=errors)
+                    self.stderr.write(f"asgi {name}: {results[name]['rps']} req/s")
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+        return results
+
+    def _compare(self, baseline, report):
+        self.stdout.write("\nChange vs baseline (req/s, p95 latency):")
+        for mode in ("in_process", "asgi"):
+            old_mode, new_mode = baseline.get(mode) or {}, report.get(mode) or {}
+            for name, new in new_mode.items():
+                old = old_mode.get(name)
+                if not old or not old.get("rps") or not new.get("rps"):
+                    continue
+                rps_change = (new["rps"] - old["rps"]) / old["rps"] * 100
+                p95_old, p95_new = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+                p95_change = (p95_new - p95_old) / p95_old * 100 if p95_old else 0.0
+                line = f"  {mode:10} {name:22} {rps_change:+7.1f}% req/s  {p95_change:+7.1f}% p95"
+                self.stdout.write(self.style.ERROR(line) if rps_change < -10 else line)
@@ -0,0 +1,87 @@
+import datetime
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from bookings.fast_serializers import fast_booking_serializer
+from bookings.models import Movie, Screening, Seat, Booking
+from bookings.serializers import BookingSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare BookingSerializer with the compiled fast-path serializer on "
+        "synthetic in-memory bookings. No database access is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Bookings per run")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer (best is reported)")
+
+    def handle(self, *args, **options):
+        instances, rows = self._synthetic_bookings(options["rows"])
+        renderer = JSONRenderer()
+
+        def drf():
+            return renderer.render(BookingSerializer(instances, many=True).data)
+
+        def compiled():
+            return renderer.render(fast_booking_serializer.serialize(rows))
+
+        if drf() != compiled():
+            raise CommandError("Compiled serializer output differs from BookingSerializer")
+
+        drf_time = self._best_of(drf, options["repeat"])
+        compiled_time = self._best_of(compiled, options["repeat"])
+        self.stdout.write(f"rows:      {options['rows']}")
+        self.stdout.write(f"drf:       {drf_time * 1000:.1f} ms")
+        self.stdout.write(f"compiled:  {compiled_time * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"speedup:   {drf_time / compiled_time:.1f}x (identical JSON)"))
+
+    @staticmethod
+    def _best_of(func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    @staticmethod
+    def _synthetic_bookings(count):
+        """Build matching unsaved Booking instances and values() rows."""
+        user = User(id=1, username="bench")
+        base = timezone.now()
+        movies = [
+            Movie(
+                id=i, title=f"Movie {i}", description="Synthetic benchmark movie " * 4,
+                release_date=datetime.date(2024, 1, 1) + datetime.timedelta(days=i),
+                duration=90 + i,
+            )
+            for i in range(1, 21)
+        ]
+        screenings = [
+            Screening(id=i, movie=movie, showtime=base + datetime.timedelta(hours=i) if i % 2 else None,
+                      auditorium=f"Screen {i % 4 + 1}")
+            for i, movie in enumerate(movies, start=1)
+        ]
+        seats = [Seat(id=i, seat_number=f"{chr(ord('A') + i // 20)}{i % 20 + 1}") for i in range(200)]
+        instances, rows = [], []
+        for i in range(count):
+            screening, seat = screenings[i % len(screenings)], seats[i % len(seats)]
+            movie = screening.movie
+            booking = Booking(id=i + 1, screening=screening, seat=seat, user=user,
+                              booking_date=base - datetime.timedelta(seconds=i))
+            instances.append(booking)
+            row = {"id": booking.id, "screening": screening.id, "seat": seat.id,
+                   "user": user.id, "booking_date": booking.booking_date}
+            row.update({f"screening__{f}": getattr(screening, f) for f in ("id", "showtime", "auditorium")})
+            row.update({"screening__movie": movie.id, "screening__movie__id": movie.id})
+            row.update({f"screening__movie__{f}": getattr(movie, f) for f in
+                        ("title", "description", "release_date", "duration")})
+            row.update({"seat__id": seat.id, "seat__seat_number": seat.seat_number})
+            rows.append(row)
+        return instances, rows
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.seating import SeatMap, generate_seats, seat_map
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the seats of the house seat map (BOOKINGS_SEAT_MAP) that don't "
+        "exist yet. Run after migrate; existing seats are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", nargs="+", metavar="ROW",
+                            help='Seat map to use instead of BOOKINGS_SEAT_MAP, e.g. --rows 10 10 "3|8|3"')
+
+    def handle(self, *args, **options):
+        try:
+            house = SeatMap(options["rows"]) if options["rows"] else seat_map()
+        except ValueError as exc:
+            raise CommandError(exc)
+        created = generate_seats(house)
+        self.stdout.write(f"Created {created} of {len(house)} seat(s) in {len(house.rows)} row(s)")
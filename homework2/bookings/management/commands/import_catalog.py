@@ -0,0 +1,40 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings import imports
+from bookings.parsers import parse_csv
+
+IMPORTERS = {"movies": imports.import_movies, "seats": imports.import_seats}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import movies (with screenings) or seats from a JSON or CSV file. "
+        "Nothing is written if any row is invalid, unless --partial is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path", help="A .json file holding a list of rows, or a .csv file with a header row")
+        parser.add_argument("--partial", action="store_true", help="Import the valid rows even if others fail")
+        parser.add_argument("--chunk-size", type=int, default=imports.IMPORT_CHUNK_SIZE,
+                            help="Rows per lookup, INSERT and UPDATE statement")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        try:
+            with open(options["path"], encoding="utf-8") as f:
+                text = f.read()
+            rows = json.loads(text) if options["path"].endswith(".json") else parse_csv(text)
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError, csv.Error) as exc:
+            raise CommandError(f"Can't read {options['path']}: {exc}")
+
+        result = IMPORTERS[options["kind"]](rows, partial=options["partial"], chunk_size=options["chunk_size"])
+        for error in result.errors:
+            self.stderr.write(f"Row {error['index']}: {json.dumps(error['errors'])}")
+        if not result.written:
+            raise CommandError(f"Nothing imported: {len(result.errors)} invalid row(s)")
+        self.stdout.write(", ".join(f"{name.replace('_', ' ')}: {count}" for name, count in result.counts.items()))
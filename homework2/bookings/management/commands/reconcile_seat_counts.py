@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.services import reconcile_seats_booked
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each screening's seats_booked counter with its bookings and "
+        "repair any that drifted. Use --check to only report them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true",
+                            help="Report drifted counters without repairing them; exits 1 if any")
+
+    def handle(self, *args, **options):
+        drifted = reconcile_seats_booked(repair=not options["check"])
+        for screening_id, stored, actual in drifted:
+            self.stdout.write(f"Screening {screening_id}: seats_booked {stored}, actual {actual}")
+        if options["check"] and drifted:
+            raise CommandError(f"Found {len(drifted)} drifted counter(s)", returncode=1)
+        verb = "Found" if options["check"] else "Repaired"
+        self.stdout.write(f"{verb} {len(drifted)} drifted counter(s)")
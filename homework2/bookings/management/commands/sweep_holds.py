@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.services import SWEEP_BATCH_SIZE, sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired seat holds in batches. Runs once by default; with "
+        "--interval it keeps sweeping, for use as a worker process or cron job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=SWEEP_BATCH_SIZE,
+                            help="Holds deleted per statement")
+        parser.add_argument("--interval", type=float, default=0,
+                            help="Seconds between sweeps; 0 sweeps once and exits")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        while True:
+            deleted = sweep_expired_holds(batch_size=options["batch_size"])
+            self.stdout.write(f"Deleted {deleted} expired hold(s)")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
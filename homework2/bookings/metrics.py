@@ -0,0 +1,79 @@
+"""
+In-process request metrics for the bookings views.
+
+RequestMetricsMiddleware records wall time, query count and database time for
+every request routed to a bookings view. The last BOOKINGS_METRICS_WINDOW
+samples per view are kept in memory, and percentiles are computed only when
+the metrics endpoint is read, so recording a request is a few deque appends.
+Each worker process reports its own numbers.
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[rank - 1]
+
+
+class ViewMetrics:
+    """Rolling window of samples for one view."""
+
+    def __init__(self, window):
+        self.count = 0
+        self.wall_ms = deque(maxlen=window)
+        self.db_ms = deque(maxlen=window)
+        self.queries = deque(maxlen=window)
+
+    def summary(self):
+        summary = {"count": self.count, "window": len(self.wall_ms)}
+        for name in ("wall_ms", "db_ms", "queries"):
+            values = sorted(getattr(self, name))
+            summary[name] = {
+                f"p{pct}": round(percentile(values, pct), 3) for pct in PERCENTILES
+            } if values else {}
+        return summary
+
+
+class MetricsRegistry:
+    """Thread-safe collection of ViewMetrics keyed by URL name."""
+
+    def __init__(self, window=None):
+        self.window = window
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, wall_ms, queries, db_ms):
+        with self._lock:
+            metrics = self._views.get(view_name)
+            if metrics is None:
+                window = self.window or getattr(settings, "BOOKINGS_METRICS_WINDOW", 1000)
+                metrics = self._views[view_name] = ViewMetrics(window)
+            metrics.count += 1
+            metrics.wall_ms.append(wall_ms)
+            metrics.db_ms.append(db_ms)
+            metrics.queries.append(queries)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: metrics.summary() for name, metrics in sorted(self._views.items())}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+@staff_member_required
+def metrics_view(request):
+    """Admin-only JSON dump of per-view latency, query count and DB time percentiles."""
+    return JsonResponse({"views": registry.snapshot()})
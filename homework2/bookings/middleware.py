@@ -0,0 +1,141 @@
+import contextvars
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import registry
+
+# QueryTimer for the request being handled. Context variables follow the request
+# into the threads that async views use for ORM calls, whereas a connection's
+# execute_wrapper only sees queries made from the thread that registered it.
+_active_timer = contextvars.ContextVar("bookings_query_timer", default=None)
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook counting queries and their total duration."""
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _active_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created, dispatch_uid="bookings_query_timer")
+def install_query_timer(sender, connection, **kwargs):
+    """Route every new connection's queries to the active request's QueryTimer."""
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def _is_bookings_view(match):
+    view = getattr(match.func, "cls", match.func)
+    return view.__module__.startswith("bookings.")
+
+
+class RequestMetricsMiddleware:
+    """
+    Record wall time, query count and DB time for requests served by bookings views.
+
+    Enabled with the BOOKINGS_METRICS_ENABLED setting. Samples go to
+    bookings.metrics.registry and are summarised as a Server-Timing header
+    on each response. Works in both sync and async middleware chains.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BOOKINGS_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+        # Connections opened before the app was ready missed connection_created.
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(None, connection)
+
+    def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _active_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _active_timer.reset(token)
+        return self._record(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _active_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _active_timer.reset(token)
+        return self._record(request, response, timer, start)
+
+    def _record(self, request, response, timer, start):
+        wall_ms = (time.perf_counter() - start) * 1000
+        match = request.resolver_match
+        if match is not None and _is_bookings_view(match):
+            db_ms = timer.duration * 1000
+            registry.record(match.view_name, wall_ms, timer.count, db_ms)
+            response["Server-Timing"] = (
+                f'app;dur={wall_ms:.2f}, db;dur={db_ms:.2f};desc="{timer.count} queries"'
+            )
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that can sit in an async middleware chain.
+
+    WhiteNoise's middleware is sync-only, so under ASGI Django would run every
+    request, static or not, through a worker thread to call it. Static files
+    are still served synchronously; everything else is passed straight on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
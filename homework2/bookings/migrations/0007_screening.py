@@ -0,0 +1,47 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_seathold'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Screening',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('showtime', models.DateTimeField(blank=True, help_text='Screening start time', null=True)),
+                ('auditorium', models.CharField(default='Main', max_length=50)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='screenings', to='bookings.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['showtime'], name='screening_showtime_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='screening',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='bookings.screening'),
+        ),
+        migrations.AddField(
+            model_name='seathold',
+            name='screening',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='bookings.screening'),
+        ),
+        # Nullable while bookings and holds move over, so this can be unapplied
+        migrations.AlterField(
+            model_name='booking',
+            name='movie',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='bookings.movie'),
+        ),
+        migrations.AlterField(
+            model_name='seathold',
+            name='movie',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='bookings.movie'),
+        ),
+    ]
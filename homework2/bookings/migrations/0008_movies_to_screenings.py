@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+def create_screenings(apps, schema_editor):
+    """
+    Turn every Movie row into a screening and move its bookings and holds onto it.
+
+    Rows that only existed to give a film another showtime (same title,
+    description, release date and duration) become screenings of the first
+    such row; 0009 deletes the leftover duplicates.
+    """
+    Movie = apps.get_model("bookings", "Movie")
+    Screening = apps.get_model("bookings", "Screening")
+    Booking = apps.get_model("bookings", "Booking")
+    SeatHold = apps.get_model("bookings", "SeatHold")
+
+    canonical = {}
+    for movie in Movie.objects.order_by("pk"):
+        key = (movie.title, movie.description, movie.release_date, movie.duration)
+        screening = Screening.objects.create(movie_id=canonical.setdefault(key, movie.pk), showtime=movie.showtime)
+        Booking.objects.filter(movie_id=movie.pk).update(screening_id=screening.pk)
+        SeatHold.objects.filter(movie_id=movie.pk).update(screening_id=screening.pk)
+
+
+def restore_movies(apps, schema_editor):
+    """
+    Give each screening a Movie row again and point its bookings and holds at it.
+
+    A movie's first screening keeps the original row; every further screening
+    gets a copy of it with that screening's showtime.
+    """
+    Movie = apps.get_model("bookings", "Movie")
+    Screening = apps.get_model("bookings", "Screening")
+    Booking = apps.get_model("bookings", "Booking")
+    SeatHold = apps.get_model("bookings", "SeatHold")
+
+    seen = set()
+    for screening in Screening.objects.select_related("movie").order_by("pk"):
+        movie = screening.movie
+        if movie.pk in seen:
+            movie.pk = None
+        seen.add(movie.pk)
+        movie.showtime = screening.showtime
+        movie.save()
+        seen.add(movie.pk)
+        Booking.objects.filter(screening_id=screening.pk).update(movie_id=movie.pk)
+        SeatHold.objects.filter(screening_id=screening.pk).update(movie_id=movie.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_screening'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_screenings, restore_movies),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def delete_merged_movies(apps, schema_editor):
+    """Every movie got a screening in 0008, so movies left without one were merged into another."""
+    Movie = apps.get_model("bookings", "Movie")
+    Movie.objects.filter(screenings__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_movies_to_screenings'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='booking',
+            name='unique_booking_per_movie_seat',
+        ),
+        migrations.RemoveConstraint(
+            model_name='seathold',
+            name='unique_hold_per_movie_seat',
+        ),
+        migrations.RemoveField(
+            model_name='booking',
+            name='movie',
+        ),
+        migrations.RemoveField(
+            model_name='seathold',
+            name='movie',
+        ),
+        migrations.RemoveField(
+            model_name='movie',
+            name='showtime',
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='screening',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='bookings.screening'),
+        ),
+        migrations.AlterField(
+            model_name='seathold',
+            name='screening',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='bookings.screening'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('screening', 'seat'), name='unique_booking_per_screening_seat'),
+        ),
+        migrations.AddConstraint(
+            model_name='seathold',
+            constraint=models.UniqueConstraint(fields=('screening', 'seat'), name='unique_hold_per_screening_seat'),
+        ),
+        migrations.RunPython(delete_merged_movies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_bookings(apps, schema_editor):
+    """Start every screening's counter from its current bookings."""
+    Screening = apps.get_model("bookings", "Screening")
+    Booking = apps.get_model("bookings", "Booking")
+    booked = (
+        Booking.objects.filter(screening=OuterRef("pk")).order_by()
+        .values("screening").annotate(n=Count("pk")).values("n")
+    )
+    Screening.objects.update(seats_booked=Coalesce(Subquery(booked), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_screening_keyed_bookings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screening',
+            name='seats_booked',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-18 22:06
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def create_versions(apps, schema_editor):
+    """Start the stamps of the tables whose API responses carry an ETag."""
+    TableVersion = apps.get_model("bookings", "TableVersion")
+    for table in ("movie", "seat"):
+        TableVersion.objects.get_or_create(table=table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_screening_seats_booked'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('table', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,11 @@
-from django.db import models
+import datetime
+import uuid
+
+from django.db import models, transaction
+from django.db.models import Count, F, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Movie(models.Model):
@@ -11,13 +17,19 @@ class Movie(models.Model):
         description: Detailed description of the movie
         release_date: Original release date
         duration: Runtime in minutes
-        showtime: Scheduled showing time (optional)
+
+    When and where the movie is shown lives on its screenings.
     """
     title = models.CharField(max_length=200)
     description = models.TextField()
     release_date = models.DateField()
     duration = models.PositiveIntegerField(help_text="Duration in minutes")
-    showtime = models.DateTimeField(help_text="Movie showtime", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Movie lists are always ordered by title
+            models.Index(fields=["title"], name="movie_title_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -32,35 +44,171 @@ class Seat(models.Model):
     """
     seat_number = models.CharField(max_length=10)
 
+    class Meta:
+        indexes = [
+            # Seat lists are always ordered by seat number
+            models.Index(fields=["seat_number"], name="seat_number_idx"),
+        ]
+
     def __str__(self):
         return f"Seat {self.seat_number}"
 
 
+class ScreeningQuerySet(models.QuerySet):
+    def upcoming(self, days=7, now=None):
+        """
+        Screenings starting within the next `days` days, soonest first.
+
+        A single range scan on screening_showtime_idx, however many movies
+        and past screenings there are.
+        """
+        now = now or timezone.now()
+        return (
+            self.filter(showtime__gte=now, showtime__lt=now + datetime.timedelta(days=days))
+            .order_by("showtime", "id")
+        )
+
+    def with_seats_left(self):
+        """
+        Annotate seats_left: the seat count minus the seats_booked counter.
+
+        The seat count is a scalar subquery, so this adds no query of its own
+        and never counts bookings.
+        """
+        seat_count = Seat.objects.order_by().annotate(one=Value(1)).values("one").annotate(n=Count("pk")).values("n")
+        return self.annotate(seats_left=Coalesce(Subquery(seat_count), 0) - F("seats_booked"))
+
+
+class Screening(models.Model):
+    """
+    One showing of a movie in an auditorium.
+
+    Bookings and holds are made per screening, so a movie shown many times is
+    a single Movie row with many screenings.
+
+    Attributes:
+        movie: The movie being shown
+        showtime: When the screening starts (null while still to be announced)
+        auditorium: Where the movie is shown
+        seats_booked: Number of bookings for this screening. Maintained with
+            F() updates in the transaction that books or cancels seats; the
+            reconcile_seat_counts command repairs any drift.
+    """
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name="screenings")
+    showtime = models.DateTimeField(null=True, blank=True, help_text="Screening start time")
+    auditorium = models.CharField(max_length=50, default="Main")
+    seats_booked = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ScreeningQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Upcoming screenings are listed with a range scan on showtime
+            models.Index(fields=["showtime"], name="screening_showtime_idx"),
+        ]
+
+    def __str__(self):
+        when = timezone.localtime(self.showtime).strftime("%b %d, %Y %H:%M") if self.showtime else "TBA"
+        return f"{self.movie.title} @ {when} ({self.auditorium})"
+
+
 class Booking(models.Model):
     """
-    Represents a seat booking for a specific movie.
+    Represents a seat booking for a specific screening.
     
-    A booking links a user, seat, and movie together. The unique constraint
-    ensures that the same seat cannot be booked twice for the same movie,
+    A booking links a user, seat, and screening together. The unique constraint
+    ensures that the same seat cannot be booked twice for the same screening,
     preventing double-booking. However, the same seat can be booked for
-    different movies.
+    different screenings.
     
     Attributes:
-        movie: The movie being booked
+        screening: The screening being booked
         seat: The seat being reserved
         user: The user making the booking
         booking_date: Timestamp when the booking was created
     """
-    movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
+    screening = models.ForeignKey(Screening, on_delete=models.CASCADE)
     seat = models.ForeignKey(Seat, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     booking_date = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        # Prevent double-booking: same seat cannot be booked twice for the same movie
+        # Prevent double-booking: same seat cannot be booked twice for the same screening
         constraints = [
-            models.UniqueConstraint(fields=["movie", "seat"], name="unique_booking_per_movie_seat"),
+            models.UniqueConstraint(fields=["screening", "seat"], name="unique_booking_per_screening_seat"),
+        ]
+        # Lookups by (screening, seat) and by screening ordered by seat are served
+        # by the unique constraint's index.
+        indexes = [
+            # Backs keyset pagination on (booking_date, id) in BookingViewSet
+            models.Index(fields=["booking_date", "id"], name="booking_date_id_idx"),
+            # Per-user history, newest first (booking history page, ?user=me)
+            models.Index(fields=["user", "booking_date", "id"], name="booking_user_date_idx"),
         ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.movie.title} ({self.seat.seat_number})"
+        return f"{self.user.username} - {self.screening.movie.title} ({self.seat.seat_number})"
+
+    def save(self, *args, **kwargs):
+        # Keep the post_save signal's seats_booked update in the same transaction as the row
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class SeatHold(models.Model):
+    """
+    Temporarily reserves a seat for a screening while a customer checks out.
+
+    A held seat can't be booked or held by anyone else until the hold expires,
+    is released, or is confirmed into a Booking. Seats held in one request
+    share a token, which is how the customer addresses the hold. Expired rows
+    are ignored everywhere and deleted by the sweep_holds command.
+
+    Attributes:
+        screening: The screening the seat is held for
+        seat: The seat being held
+        user: The user holding the seat
+        token: Identifies the group of seats held together
+        created_at: Timestamp when the hold was placed
+        expires_at: When the hold lapses
+    """
+    screening = models.ForeignKey(Screening, on_delete=models.CASCADE)
+    seat = models.ForeignKey(Seat, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    token = models.UUIDField(default=uuid.uuid4, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        # At most one hold row per screening/seat; expired rows are deleted before re-holding
+        constraints = [
+            models.UniqueConstraint(fields=["screening", "seat"], name="unique_hold_per_screening_seat"),
+        ]
+        indexes = [
+            # The sweeper scans for expired holds
+            models.Index(fields=["expires_at"], name="seathold_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} holds {self.seat.seat_number} for {self.screening}"
+
+
+class TableVersion(models.Model):
+    """
+    Version stamp of a table whose API responses carry an ETag.
+
+    Bumped in the same transaction as each change to the table (see
+    bookings.versions), so every worker process validates against the same
+    version.
+
+    Attributes:
+        table: Name of the stamped table (e.g. "movie", "seat")
+        version: Incremented on every change
+        updated_at: Time of the last change, sent as Last-Modified
+    """
+    table = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
@@ -1,77 +1,119 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import get_user_model
+"""
+Server-rendered pages.
+
+The read-heavy pages are async views so that, under the Uvicorn ASGI
+deployment, a request waiting on the database or cache doesn't tie up a
+worker thread. Templates are returned as TemplateResponse so Django renders
+them after the view; context processors touch the session and request.user,
+which are sync-only in Django 4.2.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 from django.contrib import messages
-from .models import Movie, Seat, Booking
+from . import availability
+from .guest import resolve_user
+from .models import Movie, Screening, Booking
+from .services import SeatContention, book_seats
+
+# How far ahead the movie list shows screenings
+UPCOMING_DAYS = 7
+
 
-User = get_user_model()
+async def _aget_screening_or_404(screening_id):
+    try:
+        return await Screening.objects.select_related("movie").aget(pk=screening_id)
+    except Screening.DoesNotExist:
+        raise Http404("No Screening matches the given query.")
 
-def _ensure_seat_grid(rows: int = 5, cols: int = 5) -> None:
-    """Create a consistent Rows x Cols seat grid (e.g., A1..E5) if no seats exist."""
-    if Seat.objects.exists():
+async def _ais_authenticated(request):
+    # request.user is loaded lazily from the session; Django 4.2 has no request.auser().
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+async def movie_list_page(request):
+    """Display all available movies with their screenings over the next week."""
+    movies = [movie async for movie in Movie.objects.all().order_by("title")]
+    # One range query on the showtime index for every movie's screenings; seats
+    # left come from each screening's seats_booked counter, not a COUNT per screening.
+    upcoming = {}
+    async for screening in Screening.objects.upcoming(days=UPCOMING_DAYS).with_seats_left():
+        upcoming.setdefault(screening.movie_id, []).append(screening)
+    for movie in movies:
+        movie.upcoming_screenings = upcoming.get(movie.pk, [])
+    return TemplateResponse(request, "bookings/movie_list.html", {"movies": movies, "upcoming_days": UPCOMING_DAYS})
+
+
+def _book_from_form(request, screening):
+    """Book the seats posted from the grid page; runs in a thread for the transaction."""
+    seat_ids = request.POST.getlist("seat_ids")
+    movie = screening.movie
+    try:
+        result = book_seats(screening, seat_ids, resolve_user(request))
+    except SeatContention:
+        messages.error(request, "Those seats are being booked by someone else right now. Please try again.")
         return
-    row_letters = [chr(ord('A') + i) for i in range(rows)]
-    to_create = []
-    for r in row_letters:
-        for c in range(1, cols + 1):
-            to_create.append(Seat(seat_number=f"{r}{c}"))
-    Seat.objects.bulk_create(to_create)
+    if result.booked_seat_numbers:
+        messages.success(request, f"Successfully booked seats {', '.join(result.booked_seat_numbers)} for {movie.title}!")
+    if result.conflicts:
+        taken = ", ".join(r["seat_number"] for r in result.conflicts)
+        messages.warning(request, f"Seats {taken} were already booked for {movie.title}.")
+
 
-def movie_list_page(request):
-    """Display all available movies with their details and showtimes."""
-    movies = Movie.objects.all().order_by("title")
-    return render(request, "bookings/movie_list.html", {"movies": movies})
+async def movie_seat_grid_page(request, movie_id: int):
+    """Redirect to the seat grid of a movie's next screening, or its latest one if none is upcoming."""
+    screening = await Screening.objects.upcoming(days=UPCOMING_DAYS).filter(movie_id=movie_id).afirst()
+    if screening is None:
+        screening = await Screening.objects.filter(movie_id=movie_id).order_by("-id").afirst()
+    if screening is None:
+        raise Http404("No Screening matches the given query.")
+    return redirect("screening_seat_grid_page", screening_id=screening.pk)
 
 
-def movie_seat_grid_page(request, movie_id: int):
-    """Display a selectable seat grid for a specific movie; support multi-seat booking."""
-    _ensure_seat_grid()
-    movie = get_object_or_404(Movie, pk=movie_id)
+async def screening_seat_grid_page(request, screening_id: int):
+    """Display a selectable seat grid for a specific screening; support multi-seat booking."""
     if request.method == "POST":
-        seat_ids = request.POST.getlist("seat_ids")
-        user = request.user if request.user.is_authenticated else User.objects.get_or_create(username="guest")[0]
-        booked_seats = []
-        for sid in seat_ids:
-            try:
-                seat = Seat.objects.get(pk=sid)
-            except Seat.DoesNotExist:
-                continue
-            if not Booking.objects.filter(movie=movie, seat=seat).exists():
-                Booking.objects.create(movie=movie, seat=seat, user=user)
-                booked_seats.append(seat.seat_number)
-        if booked_seats:
-            messages.success(request, f"Successfully booked seats {', '.join(booked_seats)} for {movie.title}!")
-        return redirect("../../")
+        screening = await _aget_screening_or_404(screening_id)
+        await sync_to_async(_book_from_form)(request, screening)
+        return redirect("movie_list_page")
 
-    seats = list(Seat.objects.all().order_by("seat_number"))
-    booked_ids = set(Booking.objects.filter(movie=movie).values_list("seat_id", flat=True))
-    # Group seats by row letter (first character) and sort by numeric column
-    row_map = {}
-    for s in seats:
-        row = s.seat_number[0]
-        try:
-            col = int(s.seat_number[1:])
-        except ValueError:
-            col = 0
-        row_map.setdefault(row, []).append((col, s))
-    for r in row_map:
-        row_map[r].sort(key=lambda t: t[0])
-    ordered_rows = sorted(row_map.items(), key=lambda t: t[0])
+    # The screening row and the cached availability are independent, so fetch both at once.
+    # Rows/columns come from the cached layout; booked and held seats from the cached
+    # availability. The rendered grid is fragment-cached per grid_version, so booked_ids
+    # and held_ids are passed uncalled and only evaluated when the fragment is re-rendered.
+    screening, seat_availability = await asyncio.gather(
+        _aget_screening_or_404(screening_id),
+        availability.aget_availability(screening_id),
+    )
     context = {
-        "movie": movie,
-        "ordered_rows": ordered_rows,
-        "booked_ids": booked_ids,
+        "screening": screening,
+        "movie": screening.movie,
+        "ordered_rows": seat_availability.layout.rows,
+        "aisle_after": seat_availability.layout.aisle_after,
+        "booked_ids": seat_availability.booked_seat_ids,
+        "held_ids": seat_availability.held_seat_ids,
+        "grid_version": seat_availability.grid_version,
+        "grid_cache_alias": getattr(settings, "BOOKINGS_CACHE_ALIAS", "default"),
+        "grid_cache_timeout": getattr(settings, "BOOKINGS_SEAT_GRID_CACHE_TIMEOUT", 3600),
     }
-    return render(request, "bookings/seat_booking.html", context)
+    return TemplateResponse(request, "bookings/seat_booking.html", context)
 
-def booking_history_page(request):
+async def booking_history_page(request):
     """
     Display booking history for the current user.
     
     Shows only user's bookings if authenticated, otherwise shows all bookings
     (useful for development/testing without authentication).
     """
-    if request.user.is_authenticated:
-        bookings = Booking.objects.filter(user=request.user).select_related("movie", "seat").order_by("-booking_date")
+    if await _ais_authenticated(request):
+        bookings = (
+            Booking.objects.filter(user=request.user)
+            .select_related("screening__movie", "seat").order_by("-booking_date")
+        )
     else:
-        bookings = Booking.objects.select_related("movie", "seat", "user").order_by("-booking_date")
-    return render(request, "bookings/booking_history.html", {"bookings": bookings})
+        bookings = Booking.objects.select_related("screening__movie", "seat", "user").order_by("-booking_date")
+    bookings = [booking async for booking in bookings]
+    return TemplateResponse(request, "bookings/booking_history.html", {"bookings": bookings})
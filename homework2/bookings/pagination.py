@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BookingCursorPagination(CursorPagination):
+    """
+    Keyset pagination for bookings, newest first.
+
+    The cursor holds a booking_date from the previous page plus an offset.
+    The next page is fetched with WHERE booking_date < cursor and an OFFSET
+    that skips only the rows already served after that point, which share a
+    booking_date, so a page costs about the same no matter how deep the
+    client scrolls. DRF filters on the first ordering field only; id just
+    breaks ties so the order is stable. The ordering matches the
+    booking_date_id_idx index on Booking.
+    """
+    ordering = ("-booking_date", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -0,0 +1,34 @@
+import csv
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """
+    text/csv parser for the bulk import endpoints.
+
+    The header row names the fields; each following row becomes a dict. Empty
+    cells are left out so optional fields fall back to their defaults.
+    """
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            text = stream.read().decode(encoding)
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"CSV parse error - {exc}")
+        try:
+            return parse_csv(text)
+        except csv.Error as exc:
+            raise ParseError(f"CSV parse error - {exc}")
+
+
+def parse_csv(text):
+    """Read CSV text with a header row into a list of dicts without empty cells."""
+    reader = csv.DictReader(io.StringIO(text))
+    return [{key: value for key, value in row.items() if key and value not in ("", None)} for row in reader]
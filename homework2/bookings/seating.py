@@ -0,0 +1,94 @@
+"""
+House seat map.
+
+The auditorium's seats are described by BOOKINGS_SEAT_MAP, one entry per row
+from the front. A row is either a seat count or a string of seat counts per
+block with "|" marking an aisle between blocks, so [10, "3|8|3"] is row A with
+seats A1..A10 and row B with B1..B14 and aisles after B3 and B11. Rows are
+labelled A..Z, then AA, AB.. like spreadsheet columns, and numbering runs on
+across aisles.
+
+generate_seats() creates whichever seats of the map are missing in a single
+bulk_create. It runs from `manage.py generate_seats` at deploy time (after
+migrate) rather than from the seat grid page, so a request never pays for
+checking the Seat table.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from . import layout, versions
+from .models import Seat
+
+# The original 5x5 grid, A1..E5
+DEFAULT_SEAT_MAP = [5] * 5
+
+
+def row_label(index):
+    """0 -> A, 25 -> Z, 26 -> AA, ..."""
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+class SeatMap:
+    """
+    Parsed seat map.
+
+    Attributes:
+        rows: List of (row_label, seat_count, aisles) from the front, where
+            aisles is the frozenset of columns an aisle follows
+    """
+
+    def __init__(self, rows):
+        self.rows = []
+        for index, spec in enumerate(rows):
+            try:
+                blocks = [int(block) for block in str(spec).split("|")]
+            except ValueError:
+                blocks = []
+            if not blocks or any(block < 1 for block in blocks):
+                raise ValueError(f"Row {row_label(index)} of the seat map needs at least one seat per block: {spec!r}")
+            ends = [sum(blocks[:i + 1]) for i in range(len(blocks))]
+            self.rows.append((row_label(index), ends[-1], frozenset(ends[:-1])))
+
+    def __len__(self):
+        return sum(count for _, count, _ in self.rows)
+
+    def seat_numbers(self):
+        """Every seat number in the map, front row first."""
+        for label, count, _ in self.rows:
+            for col in range(1, count + 1):
+                yield f"{label}{col}"
+
+    def aisles(self):
+        """Mapping of row label to the columns an aisle follows, for rows that have aisles."""
+        return {label: aisles for label, _, aisles in self.rows if aisles}
+
+
+def seat_map():
+    """The configured house seat map."""
+    return SeatMap(getattr(settings, "BOOKINGS_SEAT_MAP", DEFAULT_SEAT_MAP))
+
+
+def generate_seats(house=None):
+    """
+    Create the seats of the map (default: the configured one) that don't exist yet.
+
+    Existing seats are left alone, so this is safe to run on every deploy.
+    Returns the number of seats created.
+    """
+    if house is None:
+        house = seat_map()
+    existing = set(Seat.objects.values_list("seat_number", flat=True))
+    with transaction.atomic():
+        created = Seat.objects.bulk_create(
+            Seat(seat_number=number) for number in house.seat_numbers() if number not in existing
+        )
+        if created:
+            # bulk_create skips the Seat signals that start a new version and rebuild the layout
+            versions.touch(versions.SEATS)
+            transaction.on_commit(layout.invalidate)
+    return len(created)
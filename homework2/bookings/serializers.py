@@ -1,5 +1,42 @@
 from rest_framework import serializers
-from .models import Movie, Seat, Booking
+from .models import Movie, Screening, Seat, Booking, SeatHold
+
+
+class FieldSelectionMixin:
+    """
+    Lets API clients trim read payloads with query parameters.
+
+    ?fields=id,seat,booking_date  only the listed fields are returned
+    ?expand=seat                  only the listed relations are nested; the
+                                  other expandable relations are returned as ids
+
+    Relations a serializer allows to be collapsed are listed in
+    Meta.expandable_fields. Write-only fields are never removed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+        params = request.query_params
+
+        expand = params.get("expand")
+        if expand is not None:
+            expanded = {name for name in expand.split(",") if name}
+            for name in getattr(self.Meta, "expandable_fields", ()):
+                if name not in expanded and name in self.fields:
+                    source = self.fields[name].source
+                    self.fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True, source=None if source == name else source
+                    )
+
+        fields = params.get("fields")
+        if fields:
+            wanted = {name for name in fields.split(",") if name}
+            for name in list(self.fields):
+                if name not in wanted and not self.fields[name].write_only:
+                    self.fields.pop(name)
 
 
 class MovieSerializer(serializers.ModelSerializer):
@@ -7,7 +44,29 @@ class MovieSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Movie
-        fields = ["id", "title", "description", "release_date", "duration", "showtime"]
+        fields = ["id", "title", "description", "release_date", "duration"]
+
+
+class MovieImportSerializer(MovieSerializer):
+    """
+    One row of a movie import: the movie's fields plus an optional screening.
+
+    Rows for the same movie (title and release date) with different showtimes
+    add several screenings of it.
+    """
+    showtime = serializers.DateTimeField(required=False, allow_null=True, write_only=True)
+    auditorium = serializers.CharField(required=False, max_length=50, write_only=True)
+
+    class Meta(MovieSerializer.Meta):
+        fields = MovieSerializer.Meta.fields + ["showtime", "auditorium"]
+
+
+class ScreeningSerializer(serializers.ModelSerializer):
+    """Serializer for Screening model; the movie is given by id."""
+
+    class Meta:
+        model = Screening
+        fields = ["id", "movie", "showtime", "auditorium"]
 
 
 class SeatSerializer(serializers.ModelSerializer):
@@ -18,20 +77,22 @@ class SeatSerializer(serializers.ModelSerializer):
         fields = ["id", "seat_number"]
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """
-    Serializer for Booking model with nested movie and seat details.
+    Serializer for Booking model with nested screening, movie and seat details.
     
     Uses nested serializers for read operations to provide full object details,
-    and PrimaryKeyRelatedField for write operations to accept IDs.
+    and PrimaryKeyRelatedField for write operations to accept IDs. Supports
+    ?fields= and ?expand= (see FieldSelectionMixin) to skip nested payloads.
     """
     # Nested serializers for read operations (GET)
-    movie = MovieSerializer(read_only=True)
+    screening = ScreeningSerializer(read_only=True)
+    movie = MovieSerializer(source="screening.movie", read_only=True)
     seat = SeatSerializer(read_only=True)
     
     # Primary key fields for write operations (POST/PUT)
-    movie_id = serializers.PrimaryKeyRelatedField(
-        queryset=Movie.objects.all(), source="movie", write_only=True
+    screening_id = serializers.PrimaryKeyRelatedField(
+        queryset=Screening.objects.all(), source="screening", write_only=True
     )
     seat_id = serializers.PrimaryKeyRelatedField(
         queryset=Seat.objects.all(), source="seat", write_only=True
@@ -39,5 +100,15 @@ class BookingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Booking
-        fields = ["id", "movie", "seat", "user", "booking_date", "movie_id", "seat_id"]
+        fields = ["id", "screening", "movie", "seat", "user", "booking_date", "screening_id", "seat_id"]
         read_only_fields = ["user", "booking_date"]
+        expandable_fields = ["screening", "movie", "seat"]
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    """Serializer for SeatHold model; holds are placed and changed through SeatHoldViewSet."""
+
+    class Meta:
+        model = SeatHold
+        fields = ["id", "screening", "seat", "user", "token", "created_at", "expires_at"]
+        read_only_fields = fields
@@ -0,0 +1,396 @@
+import datetime
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from . import availability, events
+from .models import Screening, Seat, Booking, SeatHold
+
+# How many times a bulk booking re-checks availability after losing a race
+# against a concurrent buyer before giving up on the remaining seats.
+BULK_BOOKING_ATTEMPTS = 3
+
+# How many times a booking or hold transaction is run when it fails on lock
+# contention (deadlock, lock timeout, SQLite "database is locked"), and the
+# base delay in seconds before a retry; it doubles per attempt, with jitter.
+CONTENTION_ATTEMPTS = 6
+CONTENTION_BACKOFF = 0.01
+
+# PostgreSQL SQLSTATEs for deadlock_detected, serialization_failure and lock_not_available
+CONTENTION_PGCODES = {"40P01", "40001", "55P03"}
+
+# Rows deleted per statement by sweep_expired_holds()
+SWEEP_BATCH_SIZE = 1000
+
+BOOKED = "booked"
+HELD = "held"
+CONFLICT = "conflict"
+NOT_FOUND = "not_found"
+
+
+class SeatContention(Exception):
+    """A booking or hold kept failing on lock contention after every retry."""
+
+
+class BulkBookingResult:
+    """
+    Outcome of a bulk booking request.
+
+    Attributes:
+        bookings: Booking rows created by this request
+        results: One {"seat_id", "seat_number", "status"} entry per requested
+            seat, in request order. Status is "booked", "conflict" or "not_found".
+    """
+
+    def __init__(self, bookings, results):
+        self.bookings = bookings
+        self.results = results
+
+    @property
+    def booked_seat_numbers(self):
+        return [r["seat_number"] for r in self.results if r["status"] == BOOKED]
+
+    @property
+    def conflicts(self):
+        return [r for r in self.results if r["status"] == CONFLICT]
+
+
+class HoldResult:
+    """
+    Outcome of a hold request.
+
+    Attributes:
+        token: Token addressing the seats held by this request
+        expires_at: When the holds lapse
+        holds: SeatHold rows created by this request
+        results: One {"seat_id", "seat_number", "status"} entry per requested
+            seat, in request order. Status is "held", "conflict" or "not_found".
+    """
+
+    def __init__(self, token, expires_at, holds, results):
+        self.token = token
+        self.expires_at = expires_at
+        self.holds = holds
+        self.results = results
+
+
+def hold_ttl():
+    """How long new holds last, from the BOOKINGS_HOLD_TTL setting (seconds)."""
+    return datetime.timedelta(seconds=getattr(settings, "BOOKINGS_HOLD_TTL", 600))
+
+
+def _normalize_seat_ids(seat_ids):
+    """Convert raw seat ids to ints, dropping duplicates but keeping request order."""
+    normalized = []
+    seen = set()
+    for sid in seat_ids:
+        try:
+            sid = int(sid)
+        except (TypeError, ValueError):
+            continue
+        if sid not in seen:
+            seen.add(sid)
+            normalized.append(sid)
+    return normalized
+
+
+def unavailable_seat_ids(screening, seat_ids, now=None):
+    """Return which of seat_ids are booked, or held by an unexpired hold, for a screening."""
+    now = now or timezone.now()
+    booked = Booking.objects.filter(screening=screening, seat_id__in=seat_ids).values_list("seat_id", flat=True)
+    held = (
+        SeatHold.objects.filter(screening=screening, seat_id__in=seat_ids, expires_at__gt=now)
+        .values_list("seat_id", flat=True)
+    )
+    return set(booked.union(held))
+
+
+def _is_contention(exc):
+    pgcode = getattr(exc.__cause__, "pgcode", None)
+    return pgcode in CONTENTION_PGCODES or "locked" in str(exc)
+
+
+def _retry_on_contention(func):
+    """
+    Call func, which runs its own transaction, retrying it on lock contention.
+
+    Other database errors propagate unchanged. Raises SeatContention once
+    CONTENTION_ATTEMPTS runs have all failed on contention.
+    """
+    for attempt in range(CONTENTION_ATTEMPTS):
+        try:
+            return func()
+        except OperationalError as exc:
+            if not _is_contention(exc):
+                raise
+            if attempt == CONTENTION_ATTEMPTS - 1:
+                raise SeatContention from exc
+        time.sleep(CONTENTION_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def _claim_seats(screening, requested, model, make_row):
+    """
+    Insert a model row for every free seat among requested with one bulk_create.
+
+    Must run inside a transaction. The requested Seat rows are locked in id
+    order (SELECT ... FOR UPDATE, on databases that support it), so bookings
+    and holds for the same seats queue behind each other instead of racing;
+    locking in a fixed order keeps overlapping multi-seat requests from
+    deadlocking. Seats are then checked against bookings and live holds with
+    one query, and every free seat is inserted at once. Where rows can't be
+    locked and a concurrent buyer takes a seat between the check and the
+    insert, a unique constraint rejects the batch; the savepoint is rolled
+    back and availability re-checked. The number of queries stays constant
+    regardless of how many seats are requested.
+
+    Returns ({id: Seat} for the requested seats that exist, created rows).
+    """
+    seats = {
+        seat.pk: seat
+        for seat in Seat.objects.select_for_update().filter(pk__in=requested).order_by("pk")
+    }
+    pending = [sid for sid in requested if sid in seats]
+    created = []
+    for _ in range(BULK_BOOKING_ATTEMPTS):
+        taken = unavailable_seat_ids(screening, pending)
+        to_create = [make_row(seats[sid]) for sid in pending if sid not in taken]
+        try:
+            with transaction.atomic():
+                created = model.objects.bulk_create(to_create)
+        except IntegrityError:
+            created = []
+            continue
+        break
+    return seats, created
+
+
+def _seat_results(requested, seats, claimed_ids, claimed_status):
+    results = []
+    for sid in requested:
+        seat = seats.get(sid)
+        if seat is None:
+            status = NOT_FOUND
+        elif sid in claimed_ids:
+            status = claimed_status
+        else:
+            status = CONFLICT
+        results.append({
+            "seat_id": sid,
+            "seat_number": seat.seat_number if seat else None,
+            "status": status,
+        })
+    return results
+
+
+def _group_by_screening(pairs):
+    """Group (screening_id, seat_id) pairs into {screening_id: [seat_id, ...]}."""
+    grouped = {}
+    for screening_id, seat_id in pairs:
+        grouped.setdefault(screening_id, []).append(seat_id)
+    return grouped
+
+
+def adjust_seats_booked(deltas):
+    """
+    Apply {screening_id: change} to Screening.seats_booked.
+
+    Each change is a single UPDATE ... SET seats_booked = seats_booked + n, so
+    concurrent bookings never overwrite each other's counts. The result is
+    clamped at 0: a counter that drifted low (see reconcile_seats_booked)
+    would otherwise fail the column's CHECK and break the delete. Call it
+    inside the transaction that creates or deletes the bookings.
+    """
+    for screening_id, delta in deltas.items():
+        if delta:
+            Screening.objects.filter(pk=screening_id).update(seats_booked=Greatest(F("seats_booked") + delta, 0))
+
+
+def reconcile_seats_booked(repair=True):
+    """
+    Find screenings whose seats_booked counter disagrees with their bookings.
+
+    Bookings written without the ORM's signals (raw SQL, QuerySet.update()
+    moving rows between screenings, fixtures) leave the counter behind. With
+    repair, drifted counters are recomputed from the bookings table in one
+    UPDATE. Returns [(screening_id, stored, actual), ...].
+    """
+    drifted = [
+        (row["pk"], row["seats_booked"], row["actual"])
+        for row in Screening.objects.annotate(actual=Count("booking"))
+        .exclude(seats_booked=F("actual"))
+        .order_by("pk")
+        .values("pk", "seats_booked", "actual")
+    ]
+    if repair and drifted:
+        actual = (
+            Booking.objects.filter(screening=OuterRef("pk")).order_by()
+            .values("screening").annotate(n=Count("pk")).values("n")
+        )
+        with transaction.atomic():
+            Screening.objects.filter(pk__in=[pk for pk, _, _ in drifted]).update(
+                seats_booked=Coalesce(Subquery(actual), 0)
+            )
+    return drifted
+
+
+def book_seats(screening, seat_ids, user):
+    """
+    Book several seats for a screening in one transaction.
+
+    Seats that are already booked, or held by someone checking out, are
+    reported as conflicts. See _claim_seats for how races are handled; raises
+    SeatContention if lock contention outlasts the retries.
+    """
+    requested = _normalize_seat_ids(seat_ids)
+
+    def attempt():
+        with transaction.atomic():
+            seats, created = _claim_seats(
+                screening, requested, Booking, lambda seat: Booking(screening=screening, seat=seat, user=user)
+            )
+            # bulk_create skips model signals, so update the counter, availability and live events here.
+            if created:
+                new_seat_ids = [b.seat_id for b in created]
+                adjust_seats_booked({screening.pk: len(created)})
+
+                def announce():
+                    availability.mark_booked(screening.pk, new_seat_ids)
+                    events.publish_seats(screening.pk, new_seat_ids, events.BOOKED)
+
+                transaction.on_commit(announce)
+        return seats, created
+
+    seats, created = _retry_on_contention(attempt)
+    results = _seat_results(requested, seats, {b.seat_id for b in created}, BOOKED)
+    return BulkBookingResult(created, results)
+
+
+def hold_seats(screening, seat_ids, user):
+    """
+    Hold several seats for a screening for hold_ttl() under one new token.
+
+    Free seats are held together; booked or already-held seats are reported
+    as conflicts. Expired holds on the requested seats are deleted first so
+    they don't trip the one-hold-per-seat constraint. Raises SeatContention
+    like book_seats.
+    """
+    requested = _normalize_seat_ids(seat_ids)
+    token = uuid.uuid4()
+    expires_at = timezone.now() + hold_ttl()
+
+    def attempt():
+        with transaction.atomic():
+            SeatHold.objects.filter(
+                screening=screening, seat_id__in=requested, expires_at__lte=timezone.now()
+            ).delete()
+            seats, created = _claim_seats(
+                screening, requested, SeatHold,
+                lambda seat: SeatHold(screening=screening, seat=seat, user=user, token=token, expires_at=expires_at),
+            )
+            if created:
+                held_ids = [h.seat_id for h in created]
+
+                def announce():
+                    availability.invalidate(screening.pk)
+                    events.publish_seats(screening.pk, held_ids, events.HELD)
+
+                transaction.on_commit(announce)
+        return seats, created
+
+    seats, created = _retry_on_contention(attempt)
+    results = _seat_results(requested, seats, {h.seat_id for h in created}, HELD)
+    return HoldResult(token, expires_at, created, results)
+
+
+def confirm_hold(token):
+    """
+    Convert a hold's unexpired seats into bookings for the holder, atomically.
+
+    Returns the created bookings; an empty list means the hold is unknown or
+    has fully expired. Raises IntegrityError if a held seat was booked anyway,
+    in which case nothing is booked and the hold is left in place, and
+    SeatContention like book_seats.
+    """
+    def attempt():
+        with transaction.atomic():
+            holds = list(
+                SeatHold.objects.select_for_update()
+                .filter(token=token, expires_at__gt=timezone.now())
+                .select_related("screening", "seat")
+            )
+            if not holds:
+                return []
+            bookings = Booking.objects.bulk_create(
+                Booking(screening=hold.screening, seat=hold.seat, user_id=hold.user_id) for hold in holds
+            )
+            SeatHold.objects.filter(token=token).delete()
+            confirmed = _group_by_screening((b.screening_id, b.seat_id) for b in bookings)
+            adjust_seats_booked({screening_id: len(seat_ids) for screening_id, seat_ids in confirmed.items()})
+
+            def announce():
+                for screening_id, seat_ids in confirmed.items():
+                    availability.invalidate(screening_id)
+                    events.publish_seats(screening_id, seat_ids, events.BOOKED)
+
+            transaction.on_commit(announce)
+        return bookings
+
+    return _retry_on_contention(attempt)
+
+
+def release_hold(token):
+    """Drop every seat held under token. Returns how many seats were released."""
+    with transaction.atomic():
+        released = list(SeatHold.objects.filter(token=token).values_list("screening_id", "seat_id"))
+        if not released:
+            return 0
+        SeatHold.objects.filter(token=token).delete()
+        grouped = _group_by_screening(released)
+
+        def announce():
+            for screening_id, seat_ids in grouped.items():
+                availability.invalidate(screening_id)
+                events.publish_seats(screening_id, seat_ids, events.RELEASED)
+
+        transaction.on_commit(announce)
+    return len(released)
+
+
+def sweep_expired_holds(batch_size=SWEEP_BATCH_SIZE, now=None):
+    """
+    Delete expired holds in batches of batch_size rows, one transaction per batch.
+
+    Expired holds are already ignored when checking availability, so sweeping
+    reclaims space and tells live seat streams for the affected screenings to
+    resend their snapshot. Returns the number of holds deleted.
+    """
+    now = now or timezone.now()
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                SeatHold.objects.filter(expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("pk", "screening_id")[:batch_size]
+            )
+            if not batch:
+                break
+            # No signals or cascades hang off SeatHold, so this is a single DELETE.
+            SeatHold.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+            screening_ids = {screening_id for _, screening_id in batch}
+
+            def announce(screening_ids=screening_ids):
+                for screening_id in screening_ids:
+                    events.publish_resync(screening_id)
+
+            transaction.on_commit(announce)
+        deleted += len(batch)
+        if len(batch) < batch_size:
+            break
+    return deleted
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import availability, events, guest, layout, versions
+from .models import Movie, Screening, Seat, Booking
+from .services import adjust_seats_booked
+
+
+@receiver(pre_save, sender=Booking)
+def remember_previous_booking(sender, instance, **kwargs):
+    """Capture the screening/seat an existing booking pointed at before it is updated."""
+    if instance._state.adding or instance.pk is None:
+        instance._previous = None
+        return
+    instance._previous = (
+        Booking.objects.filter(pk=instance.pk).values_list("screening_id", "seat_id").first()
+    )
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, raw=False, **kwargs):
+    """Apply a created or moved booking to the availability cache and live events once committed."""
+    if raw:
+        # loaddata: fixtures carry their own seats_booked; reconcile_seat_counts repairs the rest.
+        return
+    screening_id, seat_id = instance.screening_id, instance.seat_id
+    previous = None if created else getattr(instance, "_previous", None)
+    # Booking.save() runs this inside its transaction, so the counter moves with the row.
+    if created:
+        adjust_seats_booked({screening_id: 1})
+    elif previous is not None and previous[0] != screening_id:
+        adjust_seats_booked({previous[0]: -1, screening_id: 1})
+
+    def apply():
+        if previous is not None and previous != (screening_id, seat_id):
+            availability.mark_released(previous[0], [previous[1]])
+            events.publish_seats(previous[0], [previous[1]], events.RELEASED)
+        availability.mark_booked(screening_id, [seat_id])
+        events.publish_seats(screening_id, [seat_id], events.BOOKED)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, origin=None, **kwargs):
+    """Release the seat in the availability cache and live events once the delete commits."""
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model in (Movie, Screening):
+        # The screening, its counter and its cached availability go with it.
+        return
+    screening_id, seat_id = instance.screening_id, instance.seat_id
+    # Deletes run in a transaction, so the counter moves with the row.
+    adjust_seats_booked({screening_id: -1})
+    if origin_model is Seat:
+        # The seat's removal from the grid is handled by seats_changed below.
+        return
+
+    def apply():
+        availability.mark_released(screening_id, [seat_id])
+        events.publish_seats(screening_id, [seat_id], events.RELEASED)
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=Screening)
+def screening_deleted(sender, instance, **kwargs):
+    screening_id = instance.pk
+    transaction.on_commit(lambda: availability.forget(screening_id))
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def movies_changed(sender, **kwargs):
+    versions.touch(versions.MOVIES)
+
+
+@receiver(post_save, sender=Seat)
+@receiver(post_delete, sender=Seat)
+def seats_changed(sender, **kwargs):
+    versions.touch(versions.SEATS)
+    transaction.on_commit(layout.invalidate)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    """Drop the cached guest user when it, or a user now named like it, changes."""
+    cached = guest._guest
+    if instance.get_username() == guest.GUEST_USERNAME or (cached is not None and cached.pk == instance.pk):
+        transaction.on_commit(guest.invalidate)
@@ -1,14 +1,19 @@
-from django.test import TestCase, Client
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, Client
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
-from datetime import date
-from .models import Movie, Seat, Booking
+from datetime import date, timedelta
+from uuid import UUID
+from . import availability, guest, layout
+from .models import Movie, Screening, Seat, Booking
+from .services import book_seats
 
 
 class ModelTests(TestCase):
-    """Unit tests for Movie, Seat, and Booking models."""
+    """Unit tests for Movie, Screening, Seat, and Booking models."""
     
     def setUp(self):
         """Set up test data"""
@@ -18,6 +23,7 @@ class ModelTests(TestCase):
             release_date=date(2024, 1, 1),
             duration=120
         )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
         self.seat = Seat.objects.create(seat_number="A1")
         self.user = User.objects.create_user(username="testuser", password="testpass")
     
@@ -36,42 +42,48 @@ class ModelTests(TestCase):
     def test_booking_creation(self):
         """Test Booking model creation and string representation."""
         booking = Booking.objects.create(
-            movie=self.movie,
+            screening=self.screening,
             seat=self.seat,
             user=self.user
         )
         expected_str = f"{self.user.username} - {self.movie.title} ({self.seat.seat_number})"
         self.assertEqual(str(booking), expected_str)
-        self.assertEqual(booking.movie, self.movie)
+        self.assertEqual(booking.screening.movie, self.movie)
         self.assertEqual(booking.seat, self.seat)
         self.assertEqual(booking.user, self.user)
     
     def test_booking_unique_constraint(self):
-        """Test that same seat cannot be booked twice for same movie."""
+        """Test that same seat cannot be booked twice for same screening."""
         # Create first booking
-        Booking.objects.create(movie=self.movie, seat=self.seat, user=self.user)
+        Booking.objects.create(screening=self.screening, seat=self.seat, user=self.user)
         
         # Attempt to create duplicate booking - should raise IntegrityError
         from django.db import IntegrityError
         with self.assertRaises(IntegrityError):
-            Booking.objects.create(movie=self.movie, seat=self.seat, user=self.user)
+            Booking.objects.create(screening=self.screening, seat=self.seat, user=self.user)
     
-    def test_seat_can_be_booked_for_different_movies(self):
-        """Test that same seat can be booked for different movies."""
-        movie2 = Movie.objects.create(
-            title="Another Movie",
-            description="Another test movie",
-            release_date=date(2024, 2, 1),
-            duration=90
-        )
+    def test_seat_can_be_booked_for_different_screenings(self):
+        """Test that same seat can be booked for different screenings of a movie."""
+        later = Screening.objects.create(movie=self.movie, showtime=self.screening.showtime + timedelta(hours=3))
         
-        # Book same seat for two different movies
-        booking1 = Booking.objects.create(movie=self.movie, seat=self.seat, user=self.user)
-        booking2 = Booking.objects.create(movie=movie2, seat=self.seat, user=self.user)
+        # Book same seat for two different screenings
+        booking1 = Booking.objects.create(screening=self.screening, seat=self.seat, user=self.user)
+        booking2 = Booking.objects.create(screening=later, seat=self.seat, user=self.user)
         
         self.assertEqual(Booking.objects.count(), 2)
         self.assertEqual(booking1.seat, booking2.seat)
-        self.assertNotEqual(booking1.movie, booking2.movie)
+        self.assertNotEqual(booking1.screening, booking2.screening)
+
+    def test_upcoming_screenings_range(self):
+        """Test upcoming() returns screenings in the next N days, soonest first."""
+        now = timezone.now()
+        Screening.objects.create(movie=self.movie, showtime=now - timedelta(hours=1))
+        Screening.objects.create(movie=self.movie, showtime=now + timedelta(days=8))
+        Screening.objects.create(movie=self.movie, showtime=None)
+        soon = Screening.objects.create(movie=self.movie, showtime=now + timedelta(hours=2))
+
+        self.assertEqual(list(Screening.objects.upcoming(now=now)), [soon, self.screening])
+        self.assertEqual(Screening.objects.upcoming(days=10, now=now).count(), 3)
 
 
 class APITests(APITestCase):
@@ -85,6 +97,7 @@ class APITests(APITestCase):
             release_date=date(2024, 1, 1),
             duration=120
         )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
         self.seat = Seat.objects.create(seat_number="B2")
         self.user = User.objects.create_user(username="apiuser", password="testpass")
     
@@ -113,28 +126,42 @@ class APITests(APITestCase):
         self.assertEqual(response.data['title'], 'New Movie')
         self.assertEqual(Movie.objects.count(), 2)
     
-    def test_movie_update_showtime(self):
-        """Test POST /api/movies/{id}/update-showtime/ updates movie showtime."""
-        url = f'/api/movies/{self.movie.pk}/update-showtime/'
-        data = {'showtime': '2025-10-15T19:30:00Z'}
+    def test_movie_add_screening(self):
+        """Test POST /api/movies/{id}/screenings/ adds a screening to the movie."""
+        url = f'/api/movies/{self.movie.pk}/screenings/'
+        data = {'showtime': '2025-10-15T19:30:00Z', 'auditorium': 'Screen 2'}
         response = self.client.post(url, data, format='json')
         
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(response.data['success'])
-        self.assertIn('updated', response.data['message'].lower())
-        
-        # Verify movie was updated
-        self.movie.refresh_from_db()
-        self.assertIsNotNone(self.movie.showtime)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['movie'], self.movie.pk)
+        self.assertEqual(response.data['auditorium'], 'Screen 2')
+        self.assertEqual(self.movie.screenings.count(), 2)
+        self.assertEqual(len(self.client.get(url).data), 2)
     
-    def test_movie_update_showtime_missing_data(self):
-        """Test update showtime fails without showtime data."""
-        url = f'/api/movies/{self.movie.pk}/update-showtime/'
-        data = {}
-        response = self.client.post(url, data, format='json')
+    def test_screenings_api_lists_upcoming(self):
+        """Test GET /api/screenings/ lists the next week's screenings with one query."""
+        Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=30))
+        Screening.objects.create(movie=self.movie, showtime=None)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/screenings/')
         
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([s['id'] for s in response.data], [self.screening.pk])
+        self.assertEqual(len(self.client.get('/api/screenings/?days=31').data), 2)
+
+    def test_booking_by_movie_id_needs_single_screening(self):
+        """Test movie_id still books while the movie has one screening, and is rejected once it has more."""
+        url = f'/api/seats/{self.seat.pk}/book/'
+        response = self.client.post(url, {'movie_id': self.movie.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['screening']['id'], self.screening.pk)
+
+        Screening.objects.create(movie=self.movie, showtime=None)
+        other_seat = Seat.objects.create(seat_number="B3")
+        response = self.client.post(f'/api/seats/{other_seat.pk}/book/', {'movie_id': self.movie.pk}, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
+        self.assertIn('screening_id', response.data['error'])
     
     def test_seats_api_list(self):
         """Test GET /api/seats/ returns list of seats."""
@@ -158,47 +185,48 @@ class APITests(APITestCase):
     def test_seat_booking_api(self):
         """Test POST /api/seats/{id}/book/ books a seat."""
         url = f'/api/seats/{self.seat.pk}/book/'
-        data = {'movie_id': self.movie.pk}
+        data = {'screening_id': self.screening.pk}
         response = self.client.post(url, data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Booking.objects.count(), 1)
         
         booking = Booking.objects.first()
-        self.assertEqual(booking.movie, self.movie)
+        self.assertEqual(booking.screening, self.screening)
         self.assertEqual(booking.seat, self.seat)
     
     def test_seat_booking_duplicate_fails(self):
-        """Test that booking same seat twice for same movie fails."""
+        """Test that booking same seat twice for same screening fails."""
         # Create first booking
-        Booking.objects.create(movie=self.movie, seat=self.seat, user=self.user)
+        Booking.objects.create(screening=self.screening, seat=self.seat, user=self.user)
         
         # Try to book again
         url = f'/api/seats/{self.seat.pk}/book/'
-        data = {'movie_id': self.movie.pk}
+        data = {'screening_id': self.screening.pk}
         response = self.client.post(url, data, format='json')
         
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
         self.assertIn('already booked', response.data['error'].lower())
     
     def test_bookings_api_list(self):
         """Test GET /api/bookings/ returns list of bookings."""
         # Create a booking first
-        Booking.objects.create(movie=self.movie, seat=self.seat, user=self.user)
+        Booking.objects.create(screening=self.screening, seat=self.seat, user=self.user)
         
         url = '/api/bookings/'
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['movie']['title'], "API Test Movie")
-        self.assertEqual(response.data[0]['seat']['seat_number'], "B2")
+        results = response.data['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['movie']['title'], "API Test Movie")
+        self.assertEqual(results[0]['seat']['seat_number'], "B2")
     
     def test_bookings_api_create(self):
         """Test POST /api/bookings/ creates new booking."""
         url = '/api/bookings/'
         data = {
-            'movie_id': self.movie.pk,
+            'screening_id': self.screening.pk,
             'seat_id': self.seat.pk
         }
         response = self.client.post(url, data, format='json')
@@ -207,7 +235,7 @@ class APITests(APITestCase):
         self.assertEqual(Booking.objects.count(), 1)
         
         booking = Booking.objects.first()
-        self.assertEqual(booking.movie, self.movie)
+        self.assertEqual(booking.screening, self.screening)
         self.assertEqual(booking.seat, self.seat)
 
 
@@ -216,6 +244,7 @@ class PageTests(TestCase):
     
     def setUp(self):
         """Set up test data"""
+        cache.clear()
         self.client = Client()
         self.movie = Movie.objects.create(
             title="Page Test Movie",
@@ -223,6 +252,7 @@ class PageTests(TestCase):
             release_date=date(2024, 1, 1),
             duration=120
         )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
     
     def test_movie_list_page(self):
         """Test movie list page loads correctly."""
@@ -234,15 +264,1512 @@ class PageTests(TestCase):
     
     def test_seat_booking_page(self):
         """Test seat booking page loads correctly."""
-        url = f'/api/pages/movies/{self.movie.pk}/seats/'
+        url = f'/api/pages/screenings/{self.screening.pk}/seats/'
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Page Test Movie")
+
+    def test_movie_seat_page_redirects_to_next_screening(self):
+        """Test the per-movie seat page redirects to the movie's next screening."""
+        response = self.client.get(f'/api/pages/movies/{self.movie.pk}/seats/')
+
+        self.assertRedirects(response, reverse('screening_seat_grid_page', args=[self.screening.pk]),
+                             fetch_redirect_response=False)
     
     def test_booking_history_page(self):
         """Test booking history page loads correctly."""
         url = '/api/pages/history/'
         response = self.client.get(url)
         
-        self.assertEqual(response.status_code, 200)
\ No newline at end of file
+        self.assertEqual(response.status_code, 200)
+
+class BulkBookingTests(APITestCase):
+    """Tests for the transactional multi-seat booking service and endpoint."""
+
+    def setUp(self):
+        """Set up test data"""
+        self.movie = Movie.objects.create(
+            title="Bulk Test Movie",
+            description="A movie for bulk booking",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"A{i}") for i in range(1, 11)]
+        self.user = User.objects.create_user(username="bulkuser", password="testpass")
+
+    def test_bulk_booking_creates_all_seats(self):
+        """Test POST /api/bookings/bulk/ books every requested seat."""
+        url = '/api/bookings/bulk/'
+        data = {'screening_id': self.screening.pk, 'seat_ids': [s.pk for s in self.seats]}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['bookings']), 10)
+        self.assertTrue(all(r['status'] == 'booked' for r in response.data['results']))
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), 10)
+
+    def test_bulk_booking_query_count_is_constant(self):
+        """Test that booking 10 seats does not issue a query per seat."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        other_screening = Screening.objects.create(movie=self.movie, showtime=None)
+
+        with CaptureQueriesContext(connection) as single:
+            book_seats(other_screening, [self.seats[0].pk], self.user)
+        with CaptureQueriesContext(connection) as group:
+            result = book_seats(self.screening, [s.pk for s in self.seats], self.user)
+
+        self.assertEqual(len(result.bookings), 10)
+        self.assertEqual(len(group), len(single))
+
+    def test_bulk_booking_reports_conflicts(self):
+        """Test that already-booked and unknown seats are reported per seat."""
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+
+        url = '/api/bookings/bulk/'
+        data = {'screening_id': self.screening.pk, 'seat_ids': [self.seats[0].pk, self.seats[1].pk, 99999]}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statuses = [r['status'] for r in response.data['results']]
+        self.assertEqual(statuses, ['conflict', 'booked', 'not_found'])
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), 2)
+
+    def test_bulk_booking_all_conflicts_returns_409(self):
+        """Test that a request where no seat could be booked returns 409."""
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+
+        url = '/api/bookings/bulk/'
+        data = {'screening_id': self.screening.pk, 'seat_ids': [self.seats[0].pk]}
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_bulk_booking_missing_data(self):
+        """Test bulk booking fails without screening_id or seat_ids."""
+        url = '/api/bookings/bulk/'
+        response = self.client.post(url, {'screening_id': self.screening.pk}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_seat_grid_page_books_multiple_seats(self):
+        """Test POST to the seat grid page books all selected seats."""
+        url = f'/api/pages/screenings/{self.screening.pk}/seats/'
+        response = self.client.post(url, {'seat_ids': [self.seats[0].pk, self.seats[1].pk]})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), 2)
+
+
+class AvailabilityCacheTests(TestCase):
+    """Tests for the cached per-screening seat availability bitmap."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Cache Test Movie",
+            description="A movie for availability caching",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"B{i}") for i in range(1, 6)]
+        self.user = User.objects.create_user(username="cacheuser", password="testpass")
+
+    def test_bitmap_set_and_clear(self):
+        """Test SeatBitmap stores, clears, and enumerates positions."""
+        from .availability import SeatBitmap
+        bitmap = SeatBitmap(20)
+        for pos in (0, 7, 8, 19):
+            bitmap.add(pos)
+        bitmap.discard(7)
+
+        self.assertIn(19, bitmap)
+        self.assertNotIn(7, bitmap)
+        self.assertEqual(list(bitmap.positions()), [0, 8, 19])
+
+    def test_steady_state_read_skips_database(self):
+        """Test that a second availability read is served entirely from cache."""
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        availability.get_availability(self.screening.pk)
+
+        with self.assertNumQueries(0):
+            snapshot = availability.get_availability(self.screening.pk)
+        self.assertEqual(snapshot.booked_seat_ids(), {self.seats[0].pk})
+
+    def test_booking_signals_update_bitmap_incrementally(self):
+        """Test that booking create/delete update the cached bitmap without a rebuild."""
+        before = availability.get_availability(self.screening.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Booking.objects.create(screening=self.screening, seat=self.seats[2], user=self.user)
+        with self.assertNumQueries(0):
+            after_create = availability.get_availability(self.screening.pk)
+        self.assertGreater(after_create.version, before.version)
+        self.assertTrue(after_create.is_booked(self.seats[2].pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        with self.assertNumQueries(0):
+            after_delete = availability.get_availability(self.screening.pk)
+        self.assertFalse(after_delete.is_booked(self.seats[2].pk))
+
+    def test_bulk_booking_updates_bitmap(self):
+        """Test that seats booked through book_seats show up in the cached bitmap."""
+        availability.get_availability(self.screening.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book_seats(self.screening, [self.seats[0].pk, self.seats[1].pk], self.user)
+        with self.assertNumQueries(0):
+            snapshot = availability.get_availability(self.screening.pk)
+        self.assertEqual(snapshot.booked_seat_ids(), {self.seats[0].pk, self.seats[1].pk})
+
+    def test_bitmap_expires_so_other_workers_catch_up(self):
+        """Test a booking whose signal reached another worker's cache shows up once the entries expire."""
+        import time
+        from unittest import mock
+        from django.conf import settings
+        availability.get_availability(self.screening.pk)
+        # No on_commit callbacks run, as if another process handled the booking
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        self.assertFalse(availability.get_availability(self.screening.pk).is_booked(self.seats[0].pk))
+
+        later = time.time() + settings.BOOKINGS_AVAILABILITY_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            snapshot = availability.get_availability(self.screening.pk)
+        self.assertTrue(snapshot.is_booked(self.seats[0].pk))
+
+    def test_adding_a_seat_rebuilds_the_index(self):
+        """Test that seat changes invalidate the seat index used by the bitmap."""
+        availability.get_availability(self.screening.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Seat.objects.create(seat_number="B6")
+        snapshot = availability.get_availability(self.screening.pk)
+        self.assertEqual(len(snapshot.layout.seats), 6)
+
+    def test_delete_movie_drops_cached_availability(self):
+        """Test POST /api/movies/{id}/delete-movie/ reports bookings and clears the cache."""
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        availability.get_availability(self.screening.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/movies/{self.movie.pk}/delete-movie/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['bookings_deleted'], 1)
+        self.assertIsNone(cache.get(availability._bitmap_key(self.screening.pk)))
+
+    def test_seat_grid_page_marks_booked_seats(self):
+        """Test the seat grid page renders cached booked seats as unavailable."""
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        url = f'/api/pages/screenings/{self.screening.pk}/seats/'
+
+        response = self.client.get(url)
+        self.assertContains(response, "Seat B1 - Already Booked")
+        self.assertContains(response, 'value="%d"' % self.seats[1].pk)
+
+
+class SeatLayoutTests(TestCase):
+    """Tests for the precomputed, cached seat layout."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+
+    def test_parse_seat_number(self):
+        """Test seat numbers split into row label and numeric column."""
+        self.assertEqual(layout.parse_seat_number("A1"), ("A", 1))
+        self.assertEqual(layout.parse_seat_number("ab12"), ("AB", 12))
+        self.assertEqual(layout.parse_seat_number("BOX"), ("BOX", 0))
+
+    def test_rows_and_columns_are_ordered(self):
+        """Test rows sort A..Z before AA and columns sort numerically."""
+        for number in ["AA1", "B10", "B2", "Z1", "A1", "B1"]:
+            Seat.objects.create(seat_number=number)
+
+        rows = layout.get_layout().rows
+
+        self.assertEqual([label for label, _ in rows], ["A", "B", "Z", "AA"])
+        self.assertEqual([col for col, _ in rows[1][1]], [1, 2, 10])
+
+    def test_layout_is_built_once(self):
+        """Test repeat layout reads don't query the database."""
+        Seat.objects.create(seat_number="A1")
+        layout.get_layout()
+
+        with self.assertNumQueries(0):
+            layout.get_layout()
+
+    def test_seat_changes_invalidate_layout(self):
+        """Test creating a seat produces a new layout on the next read."""
+        Seat.objects.create(seat_number="A1")
+        first = layout.get_layout()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Seat.objects.create(seat_number="A2")
+        second = layout.get_layout()
+
+        self.assertNotEqual(first.token, second.token)
+        self.assertEqual(len(second), 2)
+
+    def test_large_auditorium(self):
+        """Test a layout with thousands of seats and rows beyond Z."""
+        labels = [chr(ord("A") + i) for i in range(26)] + ["AA", "AB", "AC", "AD"]
+        Seat.objects.bulk_create(
+            Seat(seat_number=f"{label}{col}") for label in labels for col in range(1, 101)
+        )
+
+        seat_layout = layout.get_layout()
+
+        self.assertEqual(len(seat_layout), 3000)
+        self.assertEqual(seat_layout.rows[-1][0], "AD")
+        self.assertEqual(seat_layout.seats[0].seat_number, "A1")
+        self.assertEqual(seat_layout.positions[seat_layout.seats[-1].id], 2999)
+
+
+class SeatMapTests(TestCase):
+    """Tests for the house seat map and seat generation."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+
+    def test_rows_beyond_z_with_aisles(self):
+        """Test row labels run on past Z and aisles split a row without breaking its numbering."""
+        from .seating import SeatMap
+        house = SeatMap([2] * 27 + ["3|8|3"])
+
+        self.assertEqual([label for label, _, _ in house.rows[25:]], ["Z", "AA", "AB"])
+        self.assertEqual(house.rows[-1], ("AB", 14, frozenset({3, 11})))
+        self.assertEqual(len(house), 68)
+        self.assertEqual(list(house.seat_numbers())[-1], "AB14")
+        with self.assertRaises(ValueError):
+            SeatMap(["3||3"])
+
+    def test_generate_seats_creates_only_missing_seats(self):
+        """Test generation fills in a partly seated house in one insert and is idempotent."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .seating import SeatMap, generate_seats
+        Seat.objects.create(seat_number="A1")
+        house = SeatMap([3, "1|2"])
+
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(generate_seats(house), 5)
+        self.assertEqual(sum(q['sql'].startswith('INSERT INTO "bookings_seat"') for q in queries), 1)
+        self.assertEqual(generate_seats(house), 0)
+
+        seat_layout = layout.SeatLayout(0, Seat.objects.all(), aisles=house.aisles())
+        self.assertEqual(len(layout.get_layout()), 6)
+        self.assertEqual(
+            [seat.seat_number for seat in seat_layout.seats if seat.id in seat_layout.aisle_after], ["B1"]
+        )
+
+    def test_seat_grid_renders_aisles(self):
+        """Test the seat grid leaves a gap where the configured seat map has an aisle."""
+        movie = Movie.objects.create(title="Aisle Movie", description="", release_date=date(2024, 1, 1), duration=90)
+        screening = Screening.objects.create(movie=movie, showtime=timezone.now() + timedelta(days=1))
+        with self.settings(BOOKINGS_SEAT_MAP=["2|2"]), self.captureOnCommitCallbacks(execute=True):
+            from .seating import generate_seats
+            generate_seats()
+            response = self.client.get(f'/api/pages/screenings/{screening.pk}/seats/')
+
+        self.assertContains(response, 'class="seat-aisle"', count=1)
+
+
+class SeatGridFragmentCacheTests(TestCase):
+    """Tests for fragment caching of the rendered seat grid."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Fragment Test Movie",
+            description="A movie for fragment caching",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"C{i}") for i in range(1, 4)]
+        self.user = User.objects.create_user(username="fragmentuser", password="testpass")
+        self.url = f'/api/pages/screenings/{self.screening.pk}/seats/'
+
+    def test_repeat_views_reuse_rendered_grid(self):
+        """Test the grid fragment is not re-rendered while the booking version is unchanged."""
+        from unittest import mock
+        self.client.get(self.url)
+
+        with mock.patch.object(availability.ScreeningAvailability, "booked_seat_ids") as booked_seat_ids:
+            response = self.client.get(self.url)
+
+        booked_seat_ids.assert_not_called()
+        self.assertContains(response, 'value="%d"' % self.seats[0].pk)
+        self.assertContains(response, "csrfmiddlewaretoken")
+
+    def test_booking_bumps_version_and_rerenders_grid(self):
+        """Test a committed booking changes the grid version and the rendered markup."""
+        first = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        second = self.client.get(self.url)
+
+        self.assertNotEqual(first.context["grid_version"], second.context["grid_version"])
+        self.assertContains(second, "Seat C1 - Already Booked")
+
+
+class SeatCounterTests(APITestCase):
+    """Tests for the denormalized Screening.seats_booked counter."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Counter Test Movie",
+            description="A movie for seat counters",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"K{i}") for i in range(1, 6)]
+        self.user = User.objects.create_user(username="counteruser", password="testpass")
+
+    def assertSeatsBooked(self, expected):
+        self.screening.refresh_from_db()
+        self.assertEqual(self.screening.seats_booked, expected)
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), expected)
+
+    def test_counter_follows_bookings(self):
+        """Test single, bulk and hold-confirmed bookings and cancellations all move the counter."""
+        booking = Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        self.assertSeatsBooked(1)
+        book_seats(self.screening, [self.seats[1].pk, self.seats[2].pk], self.user)
+        self.assertSeatsBooked(3)
+        token = self.client.post('/api/holds/', {'screening_id': self.screening.pk, 'seat_ids': [self.seats[3].pk]},
+                                 format='json').data['token']
+        self.client.post(f'/api/holds/{token}/confirm/')
+        self.assertSeatsBooked(4)
+
+        self.client.delete(f'/api/bookings/{booking.pk}/')
+        self.assertSeatsBooked(3)
+        self.seats[1].delete()
+        self.assertSeatsBooked(2)
+
+    def test_moving_a_booking_moves_the_count(self):
+        """Test saving a booking onto another screening updates both counters."""
+        later = Screening.objects.create(movie=self.movie, showtime=None)
+        booking = Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+
+        booking.screening = later
+        booking.save()
+
+        self.assertSeatsBooked(0)
+        later.refresh_from_db()
+        self.assertEqual(later.seats_booked, 1)
+
+    def test_delete_with_counter_drifted_low(self):
+        """Test deleting a booking the counter never saw leaves it at 0 instead of failing its CHECK."""
+        booking, = Booking.objects.bulk_create([Booking(screening=self.screening, seat=self.seats[0], user=self.user)])
+        self.screening.refresh_from_db()
+        self.assertEqual(self.screening.seats_booked, 0)
+
+        self.assertEqual(self.client.delete(f'/api/bookings/{booking.pk}/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertSeatsBooked(0)
+
+    def test_loaddata_does_not_count_fixture_bookings(self):
+        """Test bookings loaded from a fixture keep the fixture's seats_booked instead of adding to it."""
+        from django.core import serializers
+        booking = Booking(pk=999, screening=self.screening, seat=self.seats[0], user=self.user,
+                          booking_date=timezone.now())
+        Screening.objects.filter(pk=self.screening.pk).update(seats_booked=1)
+
+        for obj in serializers.deserialize('json', serializers.serialize('json', [booking])):
+            obj.save()
+
+        self.assertSeatsBooked(1)
+
+    def test_reconcile_repairs_drift(self):
+        """Test reconcile_seat_counts reports and repairs counters changed behind the ORM's back."""
+        import io
+        from django.core.management import CommandError, call_command
+        book_seats(self.screening, [s.pk for s in self.seats[:3]], self.user)
+        Screening.objects.filter(pk=self.screening.pk).update(seats_booked=7)
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_seat_counts', '--check', stdout=io.StringIO())
+        out = io.StringIO()
+        call_command('reconcile_seat_counts', stdout=out)
+
+        self.assertIn(f"Screening {self.screening.pk}: seats_booked 7, actual 3", out.getvalue())
+        self.assertSeatsBooked(3)
+        call_command('reconcile_seat_counts', '--check', stdout=io.StringIO())
+
+    def test_movie_list_shows_seats_left(self):
+        """Test the movie list renders seats left from the counter."""
+        book_seats(self.screening, [self.seats[0].pk, self.seats[1].pk], self.user)
+
+        response = self.client.get('/api/pages/movies/')
+
+        self.assertContains(response, "3 seats left")
+        self.assertEqual(response.context['movies'][0].upcoming_screenings[0].seats_left, 3)
+
+
+class ConditionalGetTests(APITestCase):
+    """Tests for ETag/Last-Modified validation of the movie and seat endpoints."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Cached Movie", description="", release_date=date(2024, 1, 1), duration=90
+        )
+        self.seat = Seat.objects.create(seat_number="A1")
+
+    def test_unchanged_list_is_not_modified(self):
+        """Test a revalidated list is answered 304 after only the version lookup."""
+        response = self.client.get('/api/movies/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('Accept', response['Vary'])
+
+        with self.assertNumQueries(1):
+            cached = self.client.get('/api/movies/', HTTP_ACCEPT='application/json',
+                                     HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+        url = f'/api/seats/{self.seat.pk}/'
+        last_modified = self.client.get(url, HTTP_ACCEPT='application/json')['Last-Modified']
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(cached.status_code, 304)
+
+    def test_changes_start_a_new_version(self):
+        """Test saving a movie or seat, or importing movies, changes that table's ETag only."""
+        def etag(url):
+            return self.client.get(url, HTTP_ACCEPT='application/json')['ETag']
+        movies, seats = etag('/api/movies/'), etag('/api/seats/')
+
+        self.movie.duration = 95
+        self.movie.save()
+        response = self.client.get('/api/movies/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=movies)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['duration'], 95)
+        self.assertEqual(etag('/api/seats/'), seats)
+
+        from . import imports
+        movies = response['ETag']
+        imports.import_movies([{'title': 'New', 'description': 'x', 'release_date': '2024-02-01', 'duration': 80}])
+        self.assertNotEqual(etag('/api/movies/'), movies)
+
+        self.seat.delete()
+        self.assertNotEqual(etag('/api/seats/'), seats)
+
+    def test_version_does_not_depend_on_the_cache(self):
+        """Test a change made by another worker, whose cache this process never sees, still changes the ETag."""
+        def etag():
+            return self.client.get('/api/movies/', HTTP_ACCEPT='application/json')['ETag']
+        before = etag()
+        cache.clear()
+        self.assertEqual(etag(), before)
+
+        # No on_commit callbacks run, as for a write committed by another process
+        Movie.objects.create(title="Elsewhere", description="", release_date=date(2024, 3, 1), duration=90)
+
+        after = etag()
+        self.assertNotEqual(after, before)
+        cache.clear()
+        self.assertEqual(etag(), after)
+
+    def test_browsable_api_is_private(self):
+        """Test browsable API pages get their own ETag and aren't shared by caches."""
+        json_etag = self.client.get('/api/movies/', HTTP_ACCEPT='application/json')['ETag']
+        response = self.client.get('/api/movies/', HTTP_ACCEPT='text/html')
+
+        self.assertNotEqual(response['ETag'], json_etag)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class BulkImportTests(APITestCase):
+    """Tests for bulk movie/screening and seat imports."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.rows = [
+            {'title': 'Import Movie', 'description': 'First', 'release_date': '2024-05-01', 'duration': 100,
+             'showtime': '2030-01-01T19:00:00Z', 'auditorium': 'Screen 1'},
+            {'title': 'Import Movie', 'description': 'First', 'release_date': '2024-05-01', 'duration': 100,
+             'showtime': '2030-01-02T19:00:00Z', 'auditorium': 'Screen 1'},
+            {'title': 'Other Import', 'description': 'Second', 'release_date': '2024-06-01', 'duration': 90},
+        ]
+
+    def test_movie_import_creates_and_updates(self):
+        """Test importing creates movies with screenings, and a re-import only updates changed movies."""
+        response = self.client.post('/api/movies/import/', self.rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['movies_created'], 2)
+        self.assertEqual(response.data['screenings_created'], 2)
+        self.assertEqual(Movie.objects.get(title='Import Movie').screenings.count(), 2)
+
+        self.rows[2]['duration'] = 95
+        response = self.client.post('/api/movies/import/', self.rows, format='json')
+        self.assertEqual((response.data['movies_created'], response.data['movies_updated'],
+                          response.data['screenings_created']), (0, 1, 0))
+        self.assertEqual(Movie.objects.get(title='Other Import').duration, 95)
+
+    def test_invalid_rows_are_reported_per_row(self):
+        """Test an invalid row blocks the import unless ?partial=1, and is reported by index."""
+        self.rows[1]['duration'] = 'long'
+
+        response = self.client.post('/api/movies/import/', self.rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e['index'] for e in response.data['errors']], [1])
+        self.assertIn('duration', response.data['errors'][0]['errors'])
+        self.assertFalse(Movie.objects.exists())
+
+        response = self.client.post('/api/movies/import/?partial=1', self.rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['movies_created'], 2)
+        self.assertEqual(len(response.data['errors']), 1)
+
+    def test_seat_csv_import_skips_existing(self):
+        """Test a CSV seat layout imports new seat numbers and skips existing or repeated ones."""
+        Seat.objects.create(seat_number='A1')
+        body = 'seat_number\nA1\nA2\nA3\nA3\n'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.generic('POST', '/api/seats/import/', body, content_type='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['seats_created'], response.data['seats_skipped']), (2, 2))
+        self.assertEqual(len(layout.get_layout()), 3)
+
+    def test_import_queries_grow_with_chunks_not_rows(self):
+        """Test an import costs the same number of queries for 5 rows as for 200."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from . import imports
+
+        def rows(count, prefix):
+            return [{'title': f'{prefix} {i}', 'description': 'Imported', 'release_date': '2024-01-01', 'duration': 90,
+                     'showtime': f'2030-01-01T{i % 24:02d}:00:00Z'} for i in range(count)]
+
+        with CaptureQueriesContext(connection) as few:
+            imports.import_movies(rows(5, 'Few'))
+        with CaptureQueriesContext(connection) as many:
+            imports.import_movies(rows(200, 'Many'))
+
+        self.assertEqual(Screening.objects.count(), 205)
+        self.assertEqual(len(many), len(few))
+
+    def test_import_command(self):
+        """Test the import_catalog command reads a JSON file."""
+        import io
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(self.rows, f)
+        self.addCleanup(os.remove, f.name)
+
+        out = io.StringIO()
+        call_command('import_catalog', 'movies', f.name, stdout=out)
+
+        self.assertIn('movies created: 2', out.getvalue())
+
+    def test_import_command_unreadable_file(self):
+        """Test import_catalog reports a missing or malformed file as a CommandError."""
+        import io
+        import os
+        import tempfile
+        from django.core.management import CommandError, call_command
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            f.write('[{"title": ')
+        self.addCleanup(os.remove, f.name)
+
+        for path in (f.name, f.name + '.missing.json'):
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', 'movies', path, stdout=io.StringIO())
+        self.assertFalse(Movie.objects.exists())
+
+    def test_import_command_rejects_bad_chunk_size(self):
+        """Test import_catalog refuses --chunk-size below 1."""
+        import io
+        from django.core.management import CommandError, call_command
+        for value in ('0', '-5'):
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', 'movies', 'rows.json', '--chunk-size', value, stdout=io.StringIO())
+
+    def test_csv_import_malformed_body(self):
+        """Test a CSV body the csv module rejects gives 400, not 500."""
+        body = 'seat_number\n"' + 'A' * 200000 + '"\n'
+
+        response = self.client.generic('POST', '/api/seats/import/', body, content_type='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BookingPaginationTests(APITestCase):
+    """Tests for cursor pagination and field selection on /api/bookings/."""
+
+    def setUp(self):
+        """Set up test data"""
+        self.movie = Movie.objects.create(
+            title="Paging Test Movie",
+            description="A long description that clients may not want",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.user = User.objects.create_user(username="pageuser", password="testpass")
+        seats = Seat.objects.bulk_create(Seat(seat_number=f"D{i}") for i in range(1, 8))
+        self.bookings = [Booking.objects.create(screening=self.screening, seat=s, user=self.user) for s in seats]
+
+    def test_cursor_pages_cover_all_bookings_once(self):
+        """Test following next links returns every booking exactly once, newest first."""
+        url = '/api/bookings/?page_size=3'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(b['id'] for b in response.data['results'])
+            url = response.data['next']
+            if url:
+                # Links carry the reverse-proxy script prefix; request the app path
+                url = url[url.index('/api/'):]
+
+        expected = [b.pk for b in sorted(self.bookings, key=lambda b: (b.booking_date, b.pk), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def test_page_query_count_is_constant(self):
+        """Test a page costs one query regardless of page size."""
+        with self.assertNumQueries(1):
+            self.client.get('/api/bookings/?page_size=2')
+        with self.assertNumQueries(1):
+            self.client.get('/api/bookings/?page_size=7')
+
+    def test_fields_parameter_limits_output(self):
+        """Test ?fields= returns only the requested fields."""
+        response = self.client.get('/api/bookings/?fields=id,booking_date')
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'booking_date'})
+
+    def test_expand_parameter_collapses_relations(self):
+        """Test ?expand=seat nests the seat but returns the screening and movie as ids."""
+        response = self.client.get('/api/bookings/?expand=seat')
+
+        booking = response.data['results'][0]
+        self.assertEqual(booking['screening'], self.screening.pk)
+        self.assertEqual(booking['movie'], self.movie.pk)
+        self.assertIn('seat_number', booking['seat'])
+        self.assertNotIn('description', str(booking))
+
+
+class BookingExportTests(APITestCase):
+    """Tests for the streaming CSV/NDJSON booking export."""
+
+    def setUp(self):
+        """Set up test data"""
+        self.movie = Movie.objects.create(
+            title="Export, The Movie",
+            description="A movie for exports",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.user = User.objects.create_user(username="exportuser", password="testpass")
+        seats = Seat.objects.bulk_create(Seat(seat_number=f"E{i}") for i in range(1, 4))
+        self.bookings = [Booking.objects.create(screening=self.screening, seat=s, user=self.user) for s in seats]
+
+    def test_csv_export_streams_all_bookings(self):
+        """Test GET /api/bookings/export/ streams a CSV with a header row."""
+        import csv
+        import io
+        response = self.client.get('/api/bookings/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([int(r['id']) for r in rows], [b.pk for b in self.bookings])
+        self.assertEqual(rows[0]['movie_title'], "Export, The Movie")
+        self.assertEqual(rows[0]['seat_number'], "E1")
+
+    def test_ndjson_export(self):
+        """Test ?format=ndjson streams one JSON object per line."""
+        import json
+        response = self.client.get('/api/bookings/export/?format=ndjson')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['username'], "exportuser")
+
+    def test_export_since_filter(self):
+        """Test ?since= only exports bookings made at or after the given time."""
+        import datetime
+        from django.utils import timezone
+        cutoff = timezone.now() - datetime.timedelta(days=1)
+        Booking.objects.filter(pk=self.bookings[0].pk).update(booking_date=cutoff - datetime.timedelta(days=1))
+
+        response = self.client.get('/api/bookings/export/', {'since': cutoff.isoformat(), 'format': 'ndjson'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_export_invalid_since(self):
+        """Test an unparseable since= is rejected."""
+        response = self.client.get('/api/bookings/export/?since=yesterday')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_impossible_since(self):
+        """Test a well-formed but impossible since= date or datetime is rejected, not a 500."""
+        for since in ('2025-02-30', '2025-02-30T10:00:00'):
+            response = self.client.get(f'/api/bookings/export/?since={since}')
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, since)
+            self.assertEqual(response.data, {"error": "since must be an ISO 8601 date or datetime"})
+
+    def test_async_stream_matches_sync_stream(self):
+        """Test the ASGI export stream produces the same body as the WSGI one."""
+        from asgiref.sync import async_to_sync
+        from . import exports
+        rows = exports.export_rows(Booking.objects.all())
+
+        async def collect():
+            return [chunk async for chunk in exports.astream(rows, exports.CSVEncoder())]
+
+        self.assertEqual(async_to_sync(collect)(), list(exports.stream(rows, exports.CSVEncoder())))
+
+
+class FastSerializerParityTests(APITestCase):
+    """Tests that the compiled read serializers produce byte-identical JSON."""
+
+    def setUp(self):
+        """Set up test data"""
+        import datetime
+        from django.utils import timezone
+        self.movies = [
+            Movie.objects.create(
+                title="Parity Movie",
+                description="Unicode too: café ✓",
+                release_date=date(2024, 1, 1),
+                duration=120,
+            ),
+            Movie.objects.create(
+                title="Second Movie",
+                description="",
+                release_date=date(2023, 6, 15),
+                duration=95,
+            ),
+        ]
+        self.screenings = [
+            Screening.objects.create(movie=self.movies[0], showtime=timezone.now().replace(microsecond=123456)),
+            Screening.objects.create(movie=self.movies[1], showtime=None, auditorium="Screen 2"),
+        ]
+        self.user = User.objects.create_user(username="parityuser", password="testpass")
+        seats = Seat.objects.bulk_create(Seat(seat_number=f"F{i}") for i in range(1, 6))
+        for i, seat in enumerate(seats):
+            booking = Booking.objects.create(screening=self.screenings[i % 2], seat=seat, user=self.user)
+            # Spread booking dates so pagination cursors are exercised
+            Booking.objects.filter(pk=booking.pk).update(
+                booking_date=booking.booking_date - datetime.timedelta(minutes=i)
+            )
+
+    def assertFastPathMatches(self, url):
+        from unittest import mock
+        from django.test import override_settings
+        from .fast_serializers import CompiledSerializer
+        with override_settings(BOOKINGS_FAST_SERIALIZERS=False):
+            regular = self.client.get(url, HTTP_ACCEPT='application/json')
+        with override_settings(BOOKINGS_FAST_SERIALIZERS=True), \
+                mock.patch.object(CompiledSerializer, 'serialize', autospec=True,
+                                  side_effect=CompiledSerializer.serialize) as serialize:
+            fast = self.client.get(url, HTTP_ACCEPT='application/json')
+        serialize.assert_called_once()
+        self.assertEqual(regular.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, regular.content)
+
+    def test_movie_list_parity(self):
+        """Test /api/movies/ JSON is identical on the fast path."""
+        self.assertFastPathMatches('/api/movies/')
+
+    def test_screening_list_parity(self):
+        """Test /api/screenings/ JSON is identical on the fast path."""
+        self.assertFastPathMatches('/api/screenings/')
+
+    def test_seat_list_parity(self):
+        """Test /api/seats/ JSON is identical on the fast path."""
+        self.assertFastPathMatches('/api/seats/')
+
+    def test_booking_list_parity(self):
+        """Test paginated /api/bookings/ JSON (including cursors) is identical on the fast path."""
+        self.assertFastPathMatches('/api/bookings/')
+        self.assertFastPathMatches('/api/bookings/?page_size=2')
+
+    def test_fast_path_uses_single_query(self):
+        """Test the fast booking list builds nested data from one values() query."""
+        from django.test import override_settings
+        with override_settings(BOOKINGS_FAST_SERIALIZERS=True), self.assertNumQueries(1):
+            self.client.get('/api/bookings/', HTTP_ACCEPT='application/json')
+
+    def test_serializer_matches_in_other_timezone(self):
+        """Test datetime formatting follows the active timezone like DRF does."""
+        import zoneinfo
+        from django.utils import timezone
+        from rest_framework.renderers import JSONRenderer
+        from .fast_serializers import fast_screening_serializer
+        from .serializers import ScreeningSerializer
+        queryset = Screening.objects.order_by("id")
+
+        with timezone.override(zoneinfo.ZoneInfo("America/Denver")):
+            regular = JSONRenderer().render(ScreeningSerializer(queryset, many=True).data)
+            fast = JSONRenderer().render(
+                fast_screening_serializer.serialize(queryset.values(*fast_screening_serializer.lookups))
+            )
+
+        self.assertEqual(fast, regular)
+
+
+class QueryPlanTests(TestCase):
+    """
+    Query-count and query-plan regression tests for the hot booking lookups.
+
+    Query plans are checked on SQLite and PostgreSQL. On PostgreSQL sequential
+    scans are disabled for the EXPLAIN so the planner reports whether a usable
+    index exists even on tiny test tables.
+    """
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.user = User.objects.create_user(username="planuser", password="testpass")
+        self.movies = [
+            Movie.objects.create(title=f"Plan Movie {i}", description="", release_date=date(2024, 1, 1), duration=90)
+            for i in range(3)
+        ]
+        self.screenings = [
+            Screening.objects.create(movie=movie, showtime=timezone.now() + timedelta(days=i))
+            for i, movie in enumerate(self.movies)
+        ]
+        self.seats = Seat.objects.bulk_create(Seat(seat_number=f"G{i}") for i in range(1, 6))
+        for screening in self.screenings:
+            for seat in self.seats:
+                Booking.objects.create(screening=screening, seat=seat, user=self.user)
+
+    def assertUsesIndex(self, queryset, *index_names):
+        """Assert the query plan for queryset reads through one of index_names."""
+        from django.db import connection
+        if connection.vendor == "sqlite":
+            plan = queryset.explain()
+        elif connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        else:
+            self.skipTest(f"No query plan checks for {connection.vendor}")
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f"Expected an index scan on one of {index_names}, got:\n{plan}",
+        )
+
+    def test_booking_by_screening_and_seat_plan(self):
+        """Test Booking.filter(screening=..., seat=...) uses the unique constraint's index."""
+        queryset = Booking.objects.filter(screening=self.screenings[0], seat=self.seats[0])
+        self.assertUsesIndex(queryset, "unique_booking_per_screening_seat", "sqlite_autoindex_bookings_booking")
+
+    def test_booking_by_screening_ordered_by_seat_plan(self):
+        """Test Booking.filter(screening=...) ordered by seat uses the unique constraint's index."""
+        queryset = (
+            Booking.objects.filter(screening=self.screenings[0]).order_by("seat").values_list("seat_id", flat=True)
+        )
+        self.assertUsesIndex(queryset, "unique_booking_per_screening_seat", "sqlite_autoindex_bookings_booking")
+
+    def test_upcoming_screenings_plan(self):
+        """Test the next-7-days screening query is a range scan on screening_showtime_idx."""
+        self.assertUsesIndex(Screening.objects.upcoming(), "screening_showtime_idx")
+
+    def test_booking_by_user_plan(self):
+        """Test per-user booking history uses booking_user_date_idx."""
+        queryset = Booking.objects.filter(user=self.user).order_by("-booking_date", "-id")
+        self.assertUsesIndex(queryset, "booking_user_date_idx")
+
+    def test_booking_pagination_plan(self):
+        """Test the booking list ordering uses booking_date_id_idx."""
+        queryset = Booking.objects.order_by("-booking_date", "-id")[:50]
+        self.assertUsesIndex(queryset, "booking_date_id_idx")
+
+    def test_movie_and_seat_ordering_plans(self):
+        """Test movie and seat lists are read in index order."""
+        self.assertUsesIndex(Movie.objects.order_by("title"), "movie_title_idx")
+        self.assertUsesIndex(Seat.objects.order_by("seat_number"), "seat_number_idx")
+
+    def test_api_list_query_counts(self):
+        """Test list endpoints issue one query regardless of row count (no N+1)."""
+        # Movie and seat lists also look up their table's version for the ETag
+        with self.assertNumQueries(2):
+            self.client.get('/api/movies/', HTTP_ACCEPT='application/json')
+        with self.assertNumQueries(2):
+            self.client.get('/api/seats/', HTTP_ACCEPT='application/json')
+        with self.assertNumQueries(1):
+            self.client.get('/api/bookings/', HTTP_ACCEPT='application/json')
+
+    def test_page_query_counts(self):
+        """Test template pages don't issue a query per movie, screening or booking."""
+        # Movies, then every movie's upcoming screenings in one range query
+        with self.assertNumQueries(2):
+            self.client.get('/api/pages/movies/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/pages/history/')
+
+    def test_seat_grid_steady_state_query_count(self):
+        """Test a repeat seat grid view only looks up the screening."""
+        url = f'/api/pages/screenings/{self.screenings[0].pk}/seats/'
+        self.client.get(url)
+
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+
+class RequestMetricsTests(TestCase):
+    """Tests for the request metrics middleware and admin metrics endpoint."""
+
+    def setUp(self):
+        """Set up test data"""
+        from .metrics import registry
+        registry.reset()
+        self.movie = Movie.objects.create(
+            title="Metrics Movie", description="", release_date=date(2024, 1, 1), duration=90
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        from .metrics import percentile
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_disabled_by_default(self):
+        """Test no Server-Timing header is added when metrics are off."""
+        from django.test import override_settings
+        with override_settings(BOOKINGS_METRICS_ENABLED=False):
+            response = Client().get('/api/pages/movies/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_records_view_timings_and_queries(self):
+        """Test requests are recorded per view with query counts and Server-Timing."""
+        from django.test import override_settings
+        from .metrics import registry
+        with override_settings(BOOKINGS_METRICS_ENABLED=True):
+            client = Client()
+            client.get('/api/pages/movies/')
+            response = client.get('/api/movies/', HTTP_ACCEPT='application/json')
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        # The movie list, and the movie table's version for its ETag
+        self.assertIn('2 queries', response['Server-Timing'])
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['movie-list']['count'], 1)
+        self.assertEqual(snapshot['movie-list']['queries']['p50'], 2)
+        self.assertIn('p99', snapshot['movie_list_page']['wall_ms'])
+
+    def test_metrics_endpoint_requires_staff(self):
+        """Test /api/metrics/ is only available to staff users."""
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 302)
+
+        staff = User.objects.create_user(username="staff", password="testpass", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('views', response.json())
+
+
+class BenchmarkCommandTests(TestCase):
+    """Tests for the benchmark management command."""
+
+    def test_benchmark_rejects_empty_runs(self):
+        """Test the benchmark command refuses empty or negative sizes before touching a database."""
+        import io
+        from django.core.management import CommandError, call_command
+        for option, value in (('--movies', '0'), ('--seats', '0'), ('--bookings', '-1'),
+                              ('--requests', '0'), ('--concurrency', '0')):
+            with self.subTest(option=option), self.assertRaises(CommandError):
+                call_command('benchmark', option, value, '--no-asgi', stdout=io.StringIO())
+
+
+class AsyncPageTests(TestCase):
+    """Tests for the async page views served under ASGI."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Async Test Movie",
+            description="A movie for async page testing",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"A{i}") for i in range(1, 4)]
+        self.user = User.objects.create_user(username="asyncuser", password="testpass")
+        self.other = User.objects.create_user(username="otheruser", password="testpass")
+        Booking.objects.create(screening=self.screening, seat=self.seats[0], user=self.user)
+        Booking.objects.create(screening=self.screening, seat=self.seats[1], user=self.other)
+
+    def test_read_pages_are_coroutines(self):
+        """Test the read-heavy pages are native async views."""
+        import asyncio
+        from . import pages
+        for view in (pages.movie_list_page, pages.screening_seat_grid_page, pages.booking_history_page):
+            self.assertTrue(asyncio.iscoroutinefunction(view), view.__name__)
+
+    async def test_seat_grid_page_async(self):
+        """Test the seat grid renders availability through the async client."""
+        response = await self.async_client.get(f'/api/pages/screenings/{self.screening.pk}/seats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Async Test Movie")
+        self.assertEqual(response.context['booked_ids'](), {self.seats[0].id, self.seats[1].id})
+
+    async def test_seat_grid_page_missing_screening(self):
+        """Test an unknown screening returns 404 from the async seat grid."""
+        response = await self.async_client.get('/api/pages/screenings/999999/seats/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_movie_list_page_async(self):
+        """Test the movie list renders through the async client."""
+        response = await self.async_client.get('/api/pages/movies/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Async Test Movie")
+
+    async def test_booking_history_filters_by_user(self):
+        """Test the async history page shows only the logged-in user's bookings."""
+        from asgiref.sync import sync_to_async
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get('/api/pages/history/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([b.user_id for b in response.context['bookings']], [self.user.id])
+
+    async def test_async_availability_matches_sync(self):
+        """Test aget_availability agrees with get_availability, cold and warm."""
+        from asgiref.sync import sync_to_async
+        cold = await availability.aget_availability(self.screening.pk)
+        warm = await availability.aget_availability(self.screening.pk)
+        sync = await sync_to_async(availability.get_availability)(self.screening.pk)
+
+        self.assertEqual(cold.booked_seat_ids(), {self.seats[0].id, self.seats[1].id})
+        self.assertEqual(warm.grid_version, cold.grid_version)
+        self.assertEqual(sync.booked_seat_ids(), cold.booked_seat_ids())
+
+    async def test_metrics_count_queries_of_async_views(self):
+        """Test the metrics middleware sees ORM queries made from async views."""
+        from django.test import override_settings
+        with override_settings(BOOKINGS_METRICS_ENABLED=True):
+            response = await self.async_client.get('/api/pages/movies/')
+
+        self.assertIn('2 queries', response['Server-Timing'])
+
+
+class SeatEventTests(TestCase):
+    """Tests for live seat availability events and the SSE stream."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Events Test Movie",
+            description="A movie for live seat events",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"E{i}") for i in range(1, 4)]
+        self.user = User.objects.create_user(username="eventsuser", password="testpass")
+        self.url = f'/api/pages/screenings/{self.screening.pk}/seats/events/'
+
+    async def test_stream_sends_snapshot_then_deltas(self):
+        """Test the stream opens with booked seats and then pushes committed changes."""
+        import json
+        from asgiref.sync import sync_to_async
+        await Booking.objects.acreate(screening=self.screening, seat=self.seats[0], user=self.user)
+
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content.__aiter__()
+        self.assertEqual(await chunks.__anext__(), b'retry: 3000\n\n')
+        snapshot = (await chunks.__anext__()).decode()
+        self.assertTrue(snapshot.startswith('event: snapshot\n'))
+        self.assertEqual(json.loads(snapshot.split('data: ')[1]), {'booked': [self.seats[0].id], 'held': []})
+
+        def book_second_seat():
+            with self.captureOnCommitCallbacks(execute=True):
+                book_seats(self.screening, [self.seats[1].id], self.user)
+
+        await sync_to_async(book_second_seat)()
+        delta = (await chunks.__anext__()).decode()
+        self.assertTrue(delta.startswith('event: seats\n'))
+        self.assertEqual(json.loads(delta.split('data: ')[1]),
+                         {'status': 'booked', 'seat_ids': [self.seats[1].id]})
+        await chunks.aclose()
+
+    async def test_booking_signals_publish_released_seats(self):
+        """Test deleting a booking publishes a released event once committed."""
+        from asgiref.sync import sync_to_async
+        from . import events
+        booking = await Booking.objects.acreate(screening=self.screening, seat=self.seats[2], user=self.user)
+
+        def delete_booking():
+            with self.captureOnCommitCallbacks(execute=True):
+                booking.delete()
+
+        with events.get_broker().subscribe(events._channel(self.screening.pk)) as subscription:
+            await sync_to_async(delete_booking)()
+            message = await subscription.get(timeout=1)
+        self.assertEqual(message, {'status': 'released', 'seat_ids': [self.seats[2].id]})
+
+    async def test_slow_subscriber_gets_resync(self):
+        """Test a subscriber that falls too far behind is told to resend the snapshot."""
+        import asyncio
+        from . import events
+        broker = events.InProcessBroker()
+        subscription = events.Subscription(broker, 'test', max_pending=2)
+        for i in range(3):
+            subscription.put({'seat_ids': [i]})
+        await asyncio.sleep(0)
+
+        self.assertIs(await subscription.get(timeout=1), events.RESYNC)
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_unknown_screening_returns_404(self):
+        """Test streaming events for a missing screening returns 404."""
+        response = await self.async_client.get('/api/pages/screenings/999999/seats/events/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_sync_server_declines_stream(self):
+        """Test WSGI requests get 204 so EventSource stops reconnecting."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    def test_grid_page_links_event_stream(self):
+        """Test the seat grid page points EventSource at the screening's stream."""
+        response = self.client.get(f'/api/pages/screenings/{self.screening.pk}/seats/')
+        events_url = reverse('screening_seat_events', args=[self.screening.pk])
+        self.assertContains(response, f'data-events-url="{events_url}"')
+        self.assertContains(response, f'data-seat-id="{self.seats[0].id}"')
+
+
+class SeatHoldTests(APITestCase):
+    """Tests for time-limited seat holds, confirmation and the expiry sweeper."""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Hold Test Movie",
+            description="A movie for seat holds",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"H{i}") for i in range(1, 5)]
+        self.user = User.objects.create_user(username="holduser", password="testpass")
+
+    def _hold(self, seat_ids):
+        return self.client.post('/api/holds/', {'screening_id': self.screening.pk, 'seat_ids': seat_ids}, format='json')
+
+    def _expire(self, token):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import SeatHold
+        SeatHold.objects.filter(token=token).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_hold_blocks_booking_and_other_holds(self):
+        """Test held seats are unavailable to SeatViewSet.book, bulk booking and new holds."""
+        response = self._hold([self.seats[0].pk, self.seats[1].pk])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([r['status'] for r in response.data['results']], ['held', 'held'])
+        self.assertIsNotNone(response.data['expires_at'])
+
+        book = self.client.post(f'/api/seats/{self.seats[0].pk}/book/', {'screening_id': self.screening.pk}, format='json')
+        self.assertEqual(book.status_code, status.HTTP_409_CONFLICT)
+        result = book_seats(self.screening, [self.seats[1].pk, self.seats[2].pk], self.user)
+        self.assertEqual([r['status'] for r in result.results], ['conflict', 'booked'])
+
+        again = self._hold([self.seats[0].pk, 999999])
+        self.assertEqual(again.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([r['status'] for r in again.data['results']], ['conflict', 'not_found'])
+
+    def test_hold_blocks_plain_booking_create(self):
+        """Test POST /api/bookings/ can't take a held seat, so the holder can still confirm."""
+        token = self._hold([self.seats[0].pk]).data['token']
+
+        response = self.client.post('/api/bookings/', {'screening_id': self.screening.pk, 'seat_id': self.seats[0].pk},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Booking.objects.exists())
+
+        self.assertEqual(self.client.post(f'/api/holds/{token}/confirm/').status_code, status.HTTP_201_CREATED)
+
+    def test_confirm_converts_hold_to_bookings(self):
+        """Test confirming a hold books its seats for the holder and removes the hold."""
+        from .models import SeatHold
+        token = self._hold([self.seats[0].pk, self.seats[1].pk]).data['token']
+
+        response = self.client.post(f'/api/holds/{token}/confirm/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['bookings']), 2)
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), 2)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.client.get(f'/api/holds/{token}/').status_code, 404)
+        self.assertEqual(self.client.post(f'/api/holds/{token}/confirm/').status_code, 404)
+
+    def test_confirm_is_all_or_nothing(self):
+        """Test a hold whose seat was booked anyway confirms nothing and stays in place."""
+        from .models import SeatHold
+        token = self._hold([self.seats[0].pk, self.seats[1].pk]).data['token']
+        Booking.objects.create(screening=self.screening, seat=self.seats[1], user=self.user)
+
+        response = self.client.post(f'/api/holds/{token}/confirm/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Booking.objects.filter(screening=self.screening).count(), 1)
+        self.assertEqual(SeatHold.objects.filter(token=token).count(), 2)
+
+    def test_expired_hold_frees_seat(self):
+        """Test an expired hold neither blocks booking nor can be confirmed."""
+        token = self._hold([self.seats[0].pk]).data['token']
+        self._expire(token)
+
+        self.assertEqual(self.client.post(f'/api/holds/{token}/confirm/').status_code, 404)
+        rehold = self._hold([self.seats[0].pk])
+        self.assertEqual(rehold.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(rehold.data['token'], token)
+
+    def test_release_hold(self):
+        """Test DELETE /api/holds/<token>/ frees the seats."""
+        token = self._hold([self.seats[0].pk]).data['token']
+
+        self.assertEqual(self.client.delete(f'/api/holds/{token}/').status_code, 204)
+        self.assertEqual(self.client.delete(f'/api/holds/{token}/').status_code, 404)
+        result = book_seats(self.screening, [self.seats[0].pk], self.user)
+        self.assertEqual(len(result.bookings), 1)
+
+    def test_grid_shows_holds_until_they_expire(self):
+        """Test the seat grid marks held seats and frees them on expiry without a write."""
+        import time
+        from unittest import mock
+        with self.captureOnCommitCallbacks(execute=True):
+            self._hold([self.seats[0].pk])
+        url = f'/api/pages/screenings/{self.screening.pk}/seats/'
+
+        response = self.client.get(url)
+        self.assertContains(response, "Seat H1 - On Hold")
+        self.assertEqual(response.context['held_ids'](), {self.seats[0].pk})
+
+        with mock.patch('bookings.availability.time.time', return_value=time.time() + 3600):
+            response = self.client.get(url)
+        self.assertNotContains(response, "Seat H1 - On Hold")
+        self.assertContains(response, 'value="%d"' % self.seats[0].pk)
+
+    def test_sweeper_deletes_expired_holds_in_batches(self):
+        """Test sweep_expired_holds deletes expired rows in chunks and keeps live ones."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import SeatHold
+        from .services import sweep_expired_holds
+        for seat in self.seats[:3]:
+            self._expire(self._hold([seat.pk]).data['token'])
+        live = self._hold([self.seats[3].pk]).data['token']
+
+        with CaptureQueriesContext(connection) as captured:
+            deleted = sweep_expired_holds(batch_size=2)
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(list(SeatHold.objects.values_list('token', flat=True)), [UUID(live)])
+        deletes = [q['sql'] for q in captured if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 2)
+
+    def test_sweep_holds_rejects_bad_batch_size(self):
+        """Test sweep_holds refuses a --batch-size that would never delete anything."""
+        import io
+        from django.core.management import CommandError, call_command
+        for value in ('0', '-1'):
+            with self.assertRaises(CommandError):
+                call_command('sweep_holds', '--batch-size', value, stdout=io.StringIO())
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Stress tests for concurrent bookings of the same seat."""
+
+    THREADS = 200
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.movie = Movie.objects.create(
+            title="Rush Test Movie",
+            description="A movie everyone wants to see",
+            release_date=date(2024, 1, 1),
+            duration=120
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seat = Seat.objects.create(seat_number="A1")
+        # Created up front so the threads don't also race on the guest account
+        User.objects.create_user(username="guest")
+
+    def _race(self, request):
+        """Fire request() from THREADS threads at once; return the status codes."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from django.db import connection
+        barrier = threading.Barrier(self.THREADS)
+
+        def attempt(_):
+            try:
+                barrier.wait()
+                return request().status_code
+            except Exception:
+                return 500
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            return list(pool.map(attempt, range(self.THREADS)))
+
+    def test_one_winner_for_one_seat(self):
+        """Test hundreds of simultaneous book calls give exactly one 201 and no 5xx."""
+        from collections import Counter
+        from rest_framework.test import APIClient
+        url = f'/api/seats/{self.seat.pk}/book/'
+
+        codes = Counter(self._race(
+            lambda: APIClient().post(url, {'screening_id': self.screening.pk}, format='json')
+        ))
+
+        self.assertEqual(codes[201], 1, codes)
+        self.assertEqual(codes[409], self.THREADS - 1, codes)
+        self.assertEqual(Booking.objects.filter(screening=self.screening, seat=self.seat).count(), 1)
+
+    def test_lost_insert_race_is_a_conflict(self):
+        """Test a stale availability check that loses the insert reports 409, not 500."""
+        from unittest import mock
+        from rest_framework.test import APIClient
+        Booking.objects.create(screening=self.screening, seat=self.seat, user=User.objects.get(username="guest"))
+
+        with mock.patch('bookings.services.unavailable_seat_ids', return_value=set()):
+            response = APIClient().post(f'/api/seats/{self.seat.pk}/book/', {'screening_id': self.screening.pk}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_lock_contention_is_retried(self):
+        """Test lock errors are retried with backoff, and reported as 409 once retries run out."""
+        from unittest import mock
+        from django.db import OperationalError
+        from rest_framework.test import APIClient
+        from . import services
+        url = f'/api/seats/{self.seat.pk}/book/'
+        claim = services._claim_seats
+        calls = []
+
+        def flaky(*args):
+            calls.append(args)
+            if len(calls) < 3:
+                raise OperationalError("database is locked")
+            return claim(*args)
+
+        with mock.patch('bookings.services.time.sleep') as sleep:
+            with mock.patch('bookings.services._claim_seats', side_effect=flaky):
+                response = APIClient().post(url, {'screening_id': self.screening.pk}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(calls), 3)
+            self.assertEqual(sleep.call_count, 2)
+
+            with mock.patch('bookings.services._claim_seats', side_effect=OperationalError("database is locked")):
+                response = APIClient().post(url, {'screening_id': self.screening.pk}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+            self.assertEqual(response['Retry-After'], '1')
+
+            with mock.patch('bookings.services._claim_seats', side_effect=OperationalError("no such table")):
+                with self.assertRaises(OperationalError):
+                    APIClient().post(url, {'screening_id': self.screening.pk}, format='json')
+
+
+class GuestUserTests(TransactionTestCase):
+    """Test cases for the cached guest user behind anonymous bookings"""
+
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        guest.invalidate()
+        self.addCleanup(guest.invalidate)
+        self.movie = Movie.objects.create(
+            title="Guest Test Movie",
+            description="Booked anonymously",
+            release_date=date(2024, 1, 1),
+            duration=100
+        )
+        self.screening = Screening.objects.create(movie=self.movie, showtime=timezone.now() + timedelta(days=1))
+        self.seats = [Seat.objects.create(seat_number=f"A{i}") for i in range(1, 3)]
+
+    def test_guest_cached_after_commit(self):
+        """Test the guest is created once and then served without a query."""
+        created = guest.get_guest_user()
+        self.assertEqual(created.username, "guest")
+        with self.assertNumQueries(0):
+            self.assertEqual(guest.get_guest_user(), created)
+
+    def test_guest_resolved_in_transaction_not_cached(self):
+        """Test a guest read or created inside a transaction is not remembered, as it may roll back."""
+        from django.db import transaction
+        with transaction.atomic():
+            guest.get_guest_user()
+        self.assertIsNone(guest._guest)
+
+    def test_anonymous_booking_skips_user_lookup(self):
+        """Test anonymous bookings don't query the user table once the guest is cached."""
+        from django.test.utils import CaptureQueriesContext
+        from django.db import connection
+        resolved = guest.get_guest_user()
+        url = f'/api/seats/{self.seats[0].pk}/book/'
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(url, {'screening_id': self.screening.pk}, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Booking.objects.get().user, resolved)
+        self.assertFalse([q for q in captured if 'auth_user' in q['sql']])
+
+    def test_guest_changes_invalidate(self):
+        """Test renaming or deleting the guest drops it from the cache."""
+        resolved = guest.get_guest_user()
+        resolved.username = "former-guest"
+        resolved.save()
+        self.assertIsNone(guest._guest)
+
+        replacement = guest.get_guest_user()
+        self.assertNotEqual(replacement.pk, resolved.pk)
+        replacement.delete()
+        self.assertIsNone(guest._guest)
+
+    def test_warm_does_not_create_guest(self):
+        """Test warming loads an existing guest but never creates one."""
+        guest.warm()
+        self.assertIsNone(guest._guest)
+        self.assertFalse(User.objects.filter(username="guest").exists())
+
+        existing = User.objects.create_user(username="guest")
+        guest.warm()
+        self.assertEqual(guest._guest, existing)
@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import MovieViewSet, SeatViewSet, BookingViewSet
-from . import pages
+from .views import MovieViewSet, ScreeningViewSet, SeatViewSet, BookingViewSet, SeatHoldViewSet
+from . import events, metrics, pages
 
 router = DefaultRouter()
 router.register(r"movies", MovieViewSet, basename="movie")
+router.register(r"screenings", ScreeningViewSet, basename="screening")
 router.register(r"seats", SeatViewSet, basename="seat")
 router.register(r"bookings", BookingViewSet, basename="booking")
+router.register(r"holds", SeatHoldViewSet, basename="hold")
 
 urlpatterns = [
     # API
@@ -15,5 +17,15 @@ urlpatterns = [
     # Pages (MVT)
     path("pages/movies/", pages.movie_list_page, name="movie_list_page"),
     path("pages/history/", pages.booking_history_page, name="booking_history_page"),
+    path("pages/screenings/<int:screening_id>/seats/", pages.screening_seat_grid_page,
+         name="screening_seat_grid_page"),
+    # Redirects to the movie's next screening
     path("pages/movies/<int:movie_id>/seats/", pages.movie_seat_grid_page, name="movie_seat_grid_page"),
+
+    # Live seat availability for the seat grid page (Server-Sent Events, ASGI only)
+    path("pages/screenings/<int:screening_id>/seats/events/", events.screening_seat_events,
+         name="screening_seat_events"),
+
+    # Request metrics (admin only; enabled by BOOKINGS_METRICS_ENABLED)
+    path("metrics/", metrics.metrics_view, name="bookings_metrics"),
 ]
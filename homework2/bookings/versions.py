@@ -0,0 +1,33 @@
+"""
+Per-table version stamps.
+
+Each stamped table has a TableVersion row whose version is incremented, and
+updated_at set, by the same transaction that changes the table. The stamp is
+the ETag and Last-Modified of the API's list and detail responses, which can
+then answer conditional GETs with one primary-key lookup instead of reading
+and serializing the table. Keeping it in the database rather than the
+per-process cache means every worker sees a change as soon as it commits.
+"""
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TableVersion
+
+MOVIES = "movie"
+SEATS = "seat"
+
+
+def get(table):
+    """Return the table's (version, updated_at), creating its row on first use."""
+    row = TableVersion.objects.filter(table=table).values_list("version", "updated_at").first()
+    if row is None:
+        stamp, _ = TableVersion.objects.get_or_create(table=table)
+        row = (stamp.version, stamp.updated_at)
+    return row
+
+
+def touch(table):
+    """Start a new version; call inside the transaction that changes the table."""
+    changed = TableVersion.objects.filter(table=table).update(version=F("version") + 1, updated_at=timezone.now())
+    if not changed:
+        TableVersion.objects.get_or_create(table=table, defaults={"version": 1})
@@ -1,14 +1,146 @@
-from django.contrib.auth import get_user_model
+import datetime
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
-from .models import Movie, Seat, Booking
-from .serializers import MovieSerializer, SeatSerializer, BookingSerializer
+from . import exports, fast_serializers, imports, versions
+from .guest import resolve_user
+from .models import Movie, Screening, Seat, Booking, SeatHold
+from .pagination import BookingCursorPagination
+from .parsers import CSVParser
+from .renderers import CSVRenderer, NDJSONRenderer
+from .serializers import (
+    MovieSerializer, ScreeningSerializer, SeatSerializer, BookingSerializer, SeatHoldSerializer,
+)
+from .services import SeatContention, book_seats, confirm_hold, hold_seats, release_hold
+
+
+def _contention_response():
+    """409 for a booking that kept losing lock races; the client may simply retry."""
+    return Response({"error": "These seats are being booked by someone else, please try again"},
+                    status=status.HTTP_409_CONFLICT, headers={"Retry-After": "1"})
+
+
+def _import_response(request, run):
+    """
+    Run a bulk import on the request body and report it.
+
+    ?partial=1 imports the valid rows even if others fail. Responds 201 with
+    the counts and per-row errors once anything is written, otherwise 400
+    with the errors.
+    """
+    partial = request.query_params.get("partial") in ("1", "true")
+    result = run(request.data, partial=partial)
+    return Response(result.as_dict(),
+                    status=status.HTTP_201_CREATED if result.written else status.HTTP_400_BAD_REQUEST)
+
+
+def _requested_screening(data):
+    """
+    Resolve the screening a booking or hold request is for.
+
+    Requests name it with screening_id. Older clients sending movie_id are
+    still served while that movie has exactly one screening.
+
+    Returns (screening, None), or (None, 400 response) if it can't be resolved.
+    """
+    screening_id = data.get("screening_id")
+    if screening_id:
+        try:
+            return Screening.objects.get(pk=screening_id), None
+        except (Screening.DoesNotExist, ValueError, TypeError):
+            return None, Response({"error": "Invalid screening_id"}, status=400)
 
-User = get_user_model()
+    movie_id = data.get("movie_id")
+    if not movie_id:
+        return None, Response({"error": "screening_id is required"}, status=400)
+    try:
+        screenings = list(Screening.objects.filter(movie_id=movie_id)[:2])
+    except (ValueError, TypeError):
+        screenings = []
+    if not screenings:
+        return None, Response({"error": "Invalid movie_id"}, status=400)
+    if len(screenings) > 1:
+        return None, Response({"error": "This movie has several screenings; pass screening_id instead"},
+                              status=400)
+    return screenings[0], None
 
-class MovieViewSet(viewsets.ModelViewSet):
+
+class FastListMixin:
+    """
+    Serve list() through a compiled read serializer when BOOKINGS_FAST_SERIALIZERS is on.
+
+    Rows are fetched with values() and turned into dicts by the compiled
+    serializer, producing the same JSON as serializer_class without DRF's
+    per-field dispatch. Requests using ?fields= or ?expand= take the regular path.
+    """
+    fast_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        if (self.fast_serializer is None
+                or not getattr(settings, "BOOKINGS_FAST_SERIALIZERS", False)
+                or "fields" in params or "expand" in params):
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*self.fast_serializer.lookups)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.fast_serializer.serialize(page))
+        return Response(self.fast_serializer.serialize(rows))
+
+
+class ConditionalGetMixin:
+    """
+    Validate list() and retrieve() with the table's version stamp (bookings.versions).
+
+    Responses carry the stamp as ETag and Last-Modified. A request whose
+    If-None-Match or If-Modified-Since still matches is answered 304 after
+    a single primary-key lookup, before the table is read or anything is
+    serialized. Cache-Control lets shared
+    caches (CDN, reverse proxy) keep anonymous JSON responses for
+    BOOKINGS_API_CACHE_MAX_AGE seconds; browsable API pages and responses
+    to signed-in users are private.
+    """
+    version_key = None
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
+
+    def _conditional(self, request, view, *args, **kwargs):
+        version, updated_at = versions.get(self.version_key)
+        last_modified = int(updated_at.timestamp())
+        # The rendered format is part of the tag: JSON and the browsable API differ.
+        etag = f'"{version}.{last_modified}-{request.accepted_renderer.format}"'
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        shared = request.accepted_renderer.format != "api" and not request.user.is_authenticated
+        patch_cache_control(response, public=shared, private=not shared,
+                            max_age=getattr(settings, "BOOKINGS_API_CACHE_MAX_AGE", 0))
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
+class MovieViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Movie Management API
     
@@ -18,106 +150,332 @@ class MovieViewSet(viewsets.ModelViewSet):
     
     On individual movie pages, scroll down for:
     - Delete Movie button
-    - Update Showtime form
+    - Screenings form (lists this movie's screenings, POST adds one)
     """
     queryset = Movie.objects.all().order_by("title")
     serializer_class = MovieSerializer
+    fast_serializer = fast_serializers.fast_movie_serializer
+    version_key = versions.MOVIES
     permission_classes = [permissions.AllowAny]
 
     @action(detail=True, methods=["post"], url_path='delete-movie', url_name='delete-movie')
     def delete_movie(self, request, pk=None):
         """
-        Delete this movie and all associated bookings.
+        Delete this movie and all associated screenings and bookings.
         """
         movie = self.get_object()
         movie_title = movie.title
-        booking_count = Booking.objects.filter(movie=movie).count()
-        movie.delete()
+        # Cached availability for each screening is dropped by the Screening post_delete signal.
+        _, deleted = movie.delete()
+        booking_count = deleted.get(Booking._meta.label, 0)
         return Response({
             "success": True,
             "message": f"Movie '{movie_title}' deleted successfully!",
             "bookings_deleted": booking_count
         }, status=status.HTTP_200_OK)
 
-    @action(detail=True, methods=["post"], url_path='update-showtime', url_name='update-showtime')
-    def update_showtime(self, request, pk=None):
+    @action(detail=False, methods=["post"], url_path="import", url_name="import",
+            parser_classes=[JSONParser, CSVParser])
+    def import_movies(self, request):
         """
-        Update the showtime for this movie.
-        
-        Required field:
-        - showtime: ISO 8601 datetime (e.g., "2025-10-15T19:30:00Z")
+        Import many movies and their screenings at once, as a JSON list or CSV.
+
+        Row fields: title, description, release_date, duration, plus optional
+        showtime and auditorium. Movies are matched on title and release date;
+        repeat a movie with other showtimes to add more screenings.
+        """
+        return _import_response(request, imports.import_movies)
+
+    @action(detail=True, methods=["get", "post"])
+    def screenings(self, request, pk=None):
+        """
+        List this movie's screenings, or add one.
+
+        POST fields:
+        - showtime: ISO 8601 datetime (e.g., "2025-10-15T19:30:00Z"); omit for TBA
+        - auditorium: optional, defaults to "Main"
         """
         movie = self.get_object()
-        showtime = request.data.get("showtime")
-        
-        if not showtime:
-            return Response({
-                "error": "showtime field is required",
-                "example": {"showtime": "2025-10-15T19:30:00Z"}
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        movie.showtime = showtime
-        movie.save()
-        
-        return Response({
-            "success": True,
-            "message": f"Showtime updated for '{movie.title}'",
-            "movie": MovieSerializer(movie).data
-        }, status=status.HTTP_200_OK)
+        if request.method == "GET":
+            screenings = movie.screenings.order_by("showtime", "id")
+            return Response(ScreeningSerializer(screenings, many=True).data)
+
+        data = request.data.copy()
+        data["movie"] = movie.pk
+        serializer = ScreeningSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
+class ScreeningViewSet(FastListMixin, viewsets.ModelViewSet):
+    """
+    Screening API
 
-class SeatViewSet(viewsets.ModelViewSet):
+    The list shows upcoming screenings, soonest first, read with one range
+    query on the showtime index. Optional query parameters:
+    - days: how far ahead to look (default 7, at most MAX_UPCOMING_DAYS)
+    - movie: only this movie's screenings
+    Screenings still to be scheduled (no showtime) are reachable by id and
+    through /api/movies/<id>/screenings/.
+    """
+    queryset = Screening.objects.all().order_by("showtime", "id")
+    serializer_class = ScreeningSerializer
+    fast_serializer = fast_serializers.fast_screening_serializer
+    permission_classes = [permissions.AllowAny]
+
+    MAX_UPCOMING_DAYS = 90
+
+    def get_queryset(self):
+        if self.action != "list":
+            return super().get_queryset()
+        try:
+            days = min(int(self.request.query_params.get("days", 7)), self.MAX_UPCOMING_DAYS)
+        except ValueError:
+            days = 7
+        qs = Screening.objects.upcoming(days=max(days, 0))
+        movie = self.request.query_params.get("movie")
+        if movie and movie.isdigit():
+            qs = qs.filter(movie_id=movie)
+        return qs
+
+
+class SeatViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     Seat Management API
     """
     queryset = Seat.objects.all().order_by("seat_number")
     serializer_class = SeatSerializer
+    fast_serializer = fast_serializers.fast_seat_serializer
+    version_key = versions.SEATS
     permission_classes = [permissions.AllowAny]
 
+    @action(detail=False, methods=["post"], url_path="import", url_name="import",
+            parser_classes=[JSONParser, CSVParser])
+    def import_seats(self, request):
+        """
+        Import a seat layout at once, as a JSON list or CSV of seat_number rows.
+
+        Seat numbers that already exist are skipped.
+        """
+        return _import_response(request, imports.import_seats)
+
     @action(detail=True, methods=["post"])
     def book(self, request, pk=None):
         """
-        Book this seat for a movie.
-        Required: {"movie_id": <movie_id>}
+        Book this seat for a screening.
+        Required: {"screening_id": <screening_id>}
+
+        Responds 201 with the booking, or 409 if the seat is already booked or
+        on hold for the screening. Concurrent requests for the same seat are
+        serialized (see services._claim_seats), so exactly one of them wins.
         """
         seat = self.get_object()
-        movie_id = request.data.get("movie_id")
-        
-        if not movie_id:
-            return Response({"error": "movie_id is required"}, status=400)
+        screening, error = _requested_screening(request.data)
+        if error:
+            return error
 
-        try:
-            movie = Movie.objects.get(pk=movie_id)
-        except Movie.DoesNotExist:
-            return Response({"error": "Invalid movie_id"}, status=400)
+        user = resolve_user(request)
 
-        if Booking.objects.filter(movie=movie, seat=seat).exists():
-            return Response({"error": "Seat already booked for this movie"}, status=400)
-
-        user = request.user if request.user.is_authenticated else None
-        if user is None:
-            user, _ = User.objects.get_or_create(username="guest")
-
-        booking = Booking.objects.create(movie=movie, seat=seat, user=user)
-        return Response(BookingSerializer(booking).data, status=status.HTTP_201_CREATED)
+        try:
+            result = book_seats(screening, [seat.pk], user)
+        except SeatContention:
+            return _contention_response()
+        if not result.bookings:
+            return Response({"error": "Seat already booked or on hold for this screening"},
+                            status=status.HTTP_409_CONFLICT)
+        return Response(BookingSerializer(result.bookings[0]).data, status=status.HTTP_201_CREATED)
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     Booking Management API
+
+    Lists are cursor-paginated newest first; follow the "next" link to page.
+    Optional query parameters:
+    - fields: comma-separated fields to return (e.g. ?fields=id,seat,booking_date)
+    - expand: relations to nest; others come back as ids (e.g. ?expand=seat)
+    - page_size: bookings per page (max 500)
     """
-    queryset = Booking.objects.select_related("movie", "seat", "user").order_by("-booking_date")
+    queryset = Booking.objects.select_related("screening__movie", "seat", "user").order_by("-booking_date", "-id")
     serializer_class = BookingSerializer
+    fast_serializer = fast_serializers.fast_booking_serializer
+    pagination_class = BookingCursorPagination
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
         qs = super().get_queryset()
+        expand = self.request.query_params.get("expand")
+        if expand is not None:
+            # Only join the relations that will actually be nested; the movie
+            # is reached through the screening, so that is always joined.
+            names = expand.split(",")
+            expanded = ["screening__movie" if "movie" in names else "screening"]
+            if "seat" in names:
+                expanded.append("seat")
+            qs = qs.select_related(None).select_related(*expanded)
         if self.request.user.is_authenticated and self.request.query_params.get("user") == "me":
             qs = qs.filter(user=self.request.user)
         return qs
 
-    def perform_create(self, serializer):
-        user = self.request.user if self.request.user.is_authenticated else None
-        if user is None:
-            user, _ = User.objects.get_or_create(username="guest")
-        serializer.save(user=user)
+    def create(self, request, *args, **kwargs):
+        """
+        Book a seat for a screening: {"screening_id", "seat_id"}.
+
+        Goes through services.book_seats like SeatViewSet.book, so a seat that
+        is already booked, or held by someone checking out, gives 409.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        screening, seat = serializer.validated_data["screening"], serializer.validated_data["seat"]
+        try:
+            result = book_seats(screening, [seat.pk], resolve_user(request))
+        except SeatContention:
+            return _contention_response()
+        if not result.bookings:
+            return Response({"error": "Seat already booked or on hold for this screening"},
+                            status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(result.bookings[0]).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk(self, request):
+        """
+        Book several seats for a screening at once.
+        Required: {"screening_id": <screening_id>, "seat_ids": [<seat_id>, ...]}
+
+        Returns the created bookings plus a per-seat status ("booked",
+        "conflict" or "not_found"). Responds 201 if at least one seat was
+        booked, otherwise 409.
+        """
+        seat_ids = request.data.get("seat_ids")
+        screening, error = _requested_screening(request.data)
+        if error:
+            return error
+        if not isinstance(seat_ids, list) or not seat_ids:
+            return Response({"error": "seat_ids must be a non-empty list"}, status=400)
+
+        user = resolve_user(request)
+
+        try:
+            result = book_seats(screening, seat_ids, user)
+        except SeatContention:
+            return _contention_response()
+        return Response({
+            "bookings": self.get_serializer(result.bookings, many=True).data,
+            "results": result.results,
+        }, status=status.HTTP_201_CREATED if result.bookings else status.HTTP_409_CONFLICT)
+
+    @action(detail=False, methods=["get"], url_path="export", url_name="export",
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream bookings, oldest first, for reporting.
+
+        Optional query parameters:
+        - format: "csv" (default) or "ndjson"
+        - since: ISO 8601 date or datetime; only bookings made at or after it
+        """
+        queryset = self.get_queryset()
+        since = request.query_params.get("since")
+        if since:
+            try:
+                since_dt = parse_datetime(since)
+                if since_dt is None:
+                    since_date = parse_date(since)
+                    if since_date is not None:
+                        since_dt = datetime.datetime.combine(since_date, datetime.time.min)
+            except ValueError:
+                # Well formed but impossible, e.g. 2025-02-30
+                since_dt = None
+            if since_dt is None:
+                return Response({"error": "since must be an ISO 8601 date or datetime"}, status=400)
+            if timezone.is_naive(since_dt):
+                since_dt = timezone.make_aware(since_dt)
+            queryset = queryset.filter(booking_date__gte=since_dt)
+
+        encoder = exports.ENCODERS[request.accepted_renderer.format]()
+        rows = exports.export_rows(queryset)
+        if isinstance(request._request, ASGIRequest):
+            content = exports.astream(rows, encoder)
+        else:
+            content = exports.stream(rows, encoder)
+        response = StreamingHttpResponse(content, content_type=encoder.content_type)
+        response["Content-Disposition"] = f'attachment; filename="bookings.{encoder.extension}"'
+        return response
+
+
+class SeatHoldViewSet(viewsets.ViewSet):
+    """
+    Seat Hold API
+
+    Holds reserve seats for a screening for BOOKINGS_HOLD_TTL seconds during
+    checkout. Held seats can't be booked or held by anyone else. The token
+    returned when placing a hold addresses it:
+    - GET /api/holds/<token>/ lists its unexpired seats
+    - POST /api/holds/<token>/confirm/ books them
+    - DELETE /api/holds/<token>/ releases them
+    """
+    permission_classes = [permissions.AllowAny]
+    lookup_field = "token"
+    lookup_value_regex = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+    def create(self, request):
+        """
+        Hold several seats for a screening.
+        Required: {"screening_id": <screening_id>, "seat_ids": [<seat_id>, ...]}
+
+        Returns the hold token and expiry, the holds placed, and a per-seat
+        status ("held", "conflict" or "not_found"). Responds 201 if at least
+        one seat was held, otherwise 409.
+        """
+        seat_ids = request.data.get("seat_ids")
+        screening, error = _requested_screening(request.data)
+        if error:
+            return error
+        if not isinstance(seat_ids, list) or not seat_ids:
+            return Response({"error": "seat_ids must be a non-empty list"}, status=400)
+
+        user = resolve_user(request)
+
+        try:
+            result = hold_seats(screening, seat_ids, user)
+        except SeatContention:
+            return _contention_response()
+        holds = SeatHoldSerializer(result.holds, many=True).data
+        return Response({
+            "token": str(result.token) if result.holds else None,
+            "expires_at": holds[0]["expires_at"] if holds else None,
+            "holds": holds,
+            "results": result.results,
+        }, status=status.HTTP_201_CREATED if result.holds else status.HTTP_409_CONFLICT)
+
+    def retrieve(self, request, token=None):
+        holds = SeatHold.objects.filter(token=token, expires_at__gt=timezone.now()).order_by("seat_id")
+        data = SeatHoldSerializer(holds, many=True).data
+        if not data:
+            return Response({"error": "Hold not found or expired"}, status=404)
+        return Response({"token": token, "holds": data})
+
+    def destroy(self, request, token=None):
+        if not release_hold(token):
+            return Response({"error": "Hold not found or expired"}, status=404)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["post"])
+    def confirm(self, request, token=None):
+        """
+        Book every unexpired seat in this hold, atomically.
+
+        Responds 201 with the bookings, 404 if the hold is unknown or has
+        expired, or 409 if a held seat was booked anyway (nothing is booked).
+        """
+        try:
+            bookings = confirm_hold(token)
+        except IntegrityError:
+            return Response({"error": "Some held seats have already been booked"}, status=409)
+        except SeatContention:
+            return _contention_response()
+        if not bookings:
+            return Response({"error": "Hold not found or expired"}, status=404)
+        return Response({"bookings": BookingSerializer(bookings, many=True).data},
+                        status=status.HTTP_201_CREATED)
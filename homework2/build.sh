@@ -11,3 +11,6 @@ python manage.py collectstatic --no-input
 # Apply any outstanding database migrations
 python manage.py migrate
 
+# Create any seats of the house seat map that don't exist yet
+python manage.py generate_seats
+